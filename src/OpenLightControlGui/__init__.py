@@ -1,5 +1,6 @@
 from . import fixture_model
 from . import model
+from . import output
 from . import utils
 
 # region custom Layouts
@@ -35,6 +36,7 @@ from .components.OutputView import OutputView
 __all__ = [
     "utils",
     "model",
+    "output",
     "fixture_model",
     "FlowLayout",
     "HiddenSpinBox",
@@ -1,19 +1,18 @@
 from PyQt5.QtWidgets import QInputDialog, QWidget, QMainWindow, QTableWidget, QTableWidgetItem, QScrollArea, QStackedLayout, QToolBar, QPushButton, QHeaderView, QHBoxLayout, QVBoxLayout, QLabel, QSizePolicy, QApplication
-from PyQt5.QtGui import QIcon, QColor, QMouseEvent
-from PyQt5.QtCore import QSize, Qt, pyqtSignal, QTimer
+from PyQt5.QtGui import QIcon, QColor, QMouseEvent, QMoveEvent, QResizeEvent, QShowEvent
+from PyQt5.QtCore import QPoint, QSize, Qt, pyqtSignal, QTimer
 
-from OpenLightControlGui import FlowLayout
-
-from typing import Dict, Optional
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Set
 import os
 basepath = os.path.dirname(__file__)
 
 class AbstractDirectoryView(QMainWindow):
     _title: str = ""
     _mainStack: QStackedLayout
-    _mainGrid: FlowLayout
-    _gridWid: QWidget
+    _tileGrid: 'AbstractDirectoryView.TileGrid'
     _mainTable: QTableWidget
+    _tableNums: 'List[int]'
     _scrollArea: QScrollArea
     _mainWid: QWidget
     _items: 'Dict[int, ViewTile]'
@@ -24,6 +23,7 @@ class AbstractDirectoryView(QMainWindow):
     _lightbut: QPushButton
     _viewTileSize: int = 75
     _placeholder: int
+    _batch: bool = False
 
     tile_selected = pyqtSignal(int)
 
@@ -31,21 +31,18 @@ class AbstractDirectoryView(QMainWindow):
         self._placeholder = placeholder
         super().__init__(parent=parent)
         self._items = {}
+        self._tableNums = []
         self._guard_mode = False
 
-        self._mainGrid = FlowLayout(margin=0, spacing=0)
-        self._mainTable = QTableWidget(self._placeholder, 3)
+        self._tileGrid = AbstractDirectoryView.TileGrid(self._placeholder, self._placeholder_tile)
+        self._mainTable = QTableWidget(0, 3)
         self._mainTable.setHorizontalHeaderLabels(["Name", "Color", "Comment"])
         self._mainTable.setStyleSheet("color: #fff")
 
-        self._fill_grid()
-
         self._mainStack = QStackedLayout()
-        self._gridWid = QWidget()
-        self._gridWid.setLayout(self._mainGrid)
         self._scrollArea = QScrollArea()
         self._scrollArea.setWidgetResizable(True)
-        self._scrollArea.setWidget(self._gridWid)
+        self._scrollArea.setWidget(self._tileGrid)
         self._mainStack.addWidget(self._scrollArea)
         self._mainStack.addWidget(self._mainTable)
         self._mainWid = QWidget()
@@ -86,13 +83,11 @@ class AbstractDirectoryView(QMainWindow):
         self._guardbut.setFixedHeight(36)
         self.addToolBar(self._mainToolbar)
 
-    def _fill_grid(self):
-        for i in range(self._placeholder):
-            item = self.ViewTile(i+1)
-            item.selected.connect(self._handle_click)
-            item.right_click.connect(self._handle_right_click)
-            self._mainGrid.addWidget(item)
-            self._mainTable.setRowHidden(i, True)
+    def _placeholder_tile(self, num: int) -> 'ViewTile':
+        item = self.ViewTile(num)
+        item.selected.connect(self._handle_click)
+        item.right_click.connect(self._handle_right_click)
+        return item
     
     def _handle_click(self, num: int):
         if self._guard_mode:
@@ -115,31 +110,38 @@ class AbstractDirectoryView(QMainWindow):
     def setItem(self, pos: int, item: "ViewTile") -> None:
         self._items[pos] = item
         self._add_table_item(item)
-        old_wid: QWidget = self._mainGrid.itemAt(pos-1).widget() # typing: ignore
-        self._mainGrid.removeWidget(old_wid)
-        old_wid.deleteLater()
-        self._mainGrid.insertWidget(pos-1, item)
+        old_wid = self._tileGrid.setTile(pos, item, refresh=not self._batch)
+        if old_wid is not None:
+            old_wid.deleteLater()
         item.selected.connect(self._handle_click)
         item.right_click.connect(self._handle_right_click)
 
+    def _tableRow(self, pos: int) -> int:
+        '''Returns: int - The table row of pos, the table only has rows for occupied positions, sorted by position.'''
+        row = bisect_left(self._tableNums, pos)
+        if row == len(self._tableNums) or self._tableNums[row] != pos:
+            self._tableNums.insert(row, pos)
+            self._mainTable.insertRow(row)
+            self._mainTable.setVerticalHeaderItem(row, QTableWidgetItem(str(pos)))
+        return row
+
     def _add_table_item(self, item: "ViewTile") -> None:
+        row = self._tableRow(item._num)
         wid = QTableWidgetItem(str(item.title))
-        self._mainTable.setItem(item._num-1, 0, wid)
+        self._mainTable.setItem(row, 0, wid)
         col = item.getColor()
         if col is not None:
             colwid = QTableWidgetItem()
             colwid.setBackground(col)
             colwid.setFlags(Qt.ItemIsEnabled) # type: ignore
-            self._mainTable.setItem(item._num-1, 1, colwid)
-        self._mainTable.setRowHidden(item._num-1, False)
+            self._mainTable.setItem(row, 1, colwid)
         self._resize_table()
 
     def _remove_table_item(self, pos: int) -> None:
-        self._mainTable.removeCellWidget(pos-1, 0)
-        self._mainTable.removeCellWidget(pos-1, 1)
-        self._mainTable.removeCellWidget(pos-1, 2)
-        self._mainTable.removeCellWidget(pos-1, 3)
-        self._mainTable.setRowHidden(pos-1, True)
+        row = bisect_left(self._tableNums, pos)
+        if row < len(self._tableNums) and self._tableNums[row] == pos:
+            self._tableNums.pop(row)
+            self._mainTable.removeRow(row)
 
     def isInGuardMode(self) -> bool:
         return self._guard_mode
@@ -148,13 +150,35 @@ class AbstractDirectoryView(QMainWindow):
         self._guard_mode = guard_mode
 
     def removeItem(self, pos: int) -> None:
-        self._mainGrid.removeWidget(self._mainGrid.itemAt(pos-1).widget())
+        wid = self._tileGrid.takeTile(pos)
+        if wid is not None:
+            wid.deleteLater()
         self._remove_table_item(pos)
         del self._items[pos]
 
     def setItems(self, dic: 'Dict[int, ViewTile]') -> None:
-        for pos, item in dic.items():
-            self.setItem(pos, item)
+        '''Sets all items with updates suspended, then lays out the grid and resizes the table columns once.'''
+        self._batch = True
+        self.setUpdatesEnabled(False)
+        try:
+            self._add_table_rows(dic.keys())
+            for pos, item in dic.items():
+                self.setItem(pos, item)
+        finally:
+            self._batch = False
+            self._tileGrid.refresh()
+            self._resize_table()
+            self.setUpdatesEnabled(True)
+
+    def _add_table_rows(self, positions: 'Iterable[int]') -> None:
+        '''Adds the rows of new positions in one go if they all come after the existing ones, see _tableRow.'''
+        new = sorted(set(positions).difference(self._tableNums))
+        if new and (not self._tableNums or new[0] > self._tableNums[-1]):
+            start = len(self._tableNums)
+            self._mainTable.setRowCount(start + len(new))
+            for row, pos in enumerate(new, start):
+                self._mainTable.setVerticalHeaderItem(row, QTableWidgetItem(str(pos)))
+            self._tableNums.extend(new)
 
     def _toggle_guard(self) -> None:
         if self._guardbut.isCheckable():
@@ -189,10 +213,136 @@ class AbstractDirectoryView(QMainWindow):
             self._lightbut.setChecked(True)
 
     def _resize_table(self) -> None:
+        if self._batch:
+            return
         self._mainTable.horizontalHeader().setSectionResizeMode(
             QHeaderView.ResizeToContents)
         self._mainTable.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
 
+    class TileGrid(QWidget):
+        '''
+        Grid of fixed size tiles for positions 1 to count.
+        Only occupied positions have their own tile, empty positions are shown by placeholder tiles, which are only
+        created for the visible part of the grid and recycled while scrolling.
+        Occupied tiles are only added to the grid (and so polished and shown) once they become visible.
+        '''
+        _count: int
+        _tiles: 'Dict[int, AbstractDirectoryView.ViewTile]'
+        _attached: 'Set[int]'
+        _placeholders: 'Dict[int, AbstractDirectoryView.ViewTile]'
+        _spare: 'List[AbstractDirectoryView.ViewTile]'
+        _factory: 'Callable[[int], AbstractDirectoryView.ViewTile]'
+        _spacing: int
+        _columns: int = 1
+
+        def __init__(self, count: int, factory: 'Callable[[int], AbstractDirectoryView.ViewTile]', parent: Optional[QWidget] = None) -> None:
+            super().__init__(parent)
+            self._count = count
+            self._factory = factory
+            self._tiles = {}
+            self._attached = set()
+            self._placeholders = {}
+            self._spare = []
+            self._spacing = max(0, self.style().layoutSpacing(QSizePolicy.PushButton, QSizePolicy.PushButton, Qt.Horizontal))
+            self._resize_grid()
+
+        @property
+        def step(self) -> int:
+            return AbstractDirectoryView._viewTileSize + self._spacing
+
+        def count(self) -> int:
+            return max([self._count] + list(self._tiles.keys()))
+
+        def position(self, num: int) -> QPoint:
+            return QPoint((num - 1) % self._columns * self.step, (num - 1) // self._columns * self.step)
+
+        def tile(self, num: int) -> 'Optional[AbstractDirectoryView.ViewTile]':
+            return self._tiles.get(num)
+
+        def setTile(self, num: int, tile: 'AbstractDirectoryView.ViewTile', refresh: bool = True) -> 'Optional[AbstractDirectoryView.ViewTile]':
+            '''Returns: the tile previously at num, if there was one. Without refresh, `refresh` has to be called later.'''
+            old = self.takeTile(num, refresh=False)
+            self._tiles[num] = tile
+            if refresh:
+                self.refresh()
+            return old
+
+        def takeTile(self, num: int, refresh: bool = True) -> 'Optional[AbstractDirectoryView.ViewTile]':
+            tile = self._tiles.pop(num, None)
+            if tile is not None:
+                if num in self._attached:
+                    self._attached.discard(num)
+                    tile.hide()
+                    tile.setParent(None) # type: ignore
+                if refresh:
+                    self.refresh()
+            return tile
+
+        def refresh(self) -> None:
+            '''Resizes the grid to its tiles and updates the placeholders of the visible area.'''
+            self._resize_grid()
+            self._refresh_visible()
+
+        def _resize_grid(self) -> None:
+            rows = -(-self.count() // self._columns)
+            self.setMinimumHeight(max(0, rows * self.step - self._spacing))
+
+        def _refresh_visible(self) -> None:
+            rect = self.visibleRegion().boundingRect()
+            visible: 'List[int]' = []
+            if not rect.isEmpty():
+                count = self.count()
+                for row in range(rect.top() // self.step, rect.bottom() // self.step + 1):
+                    first = row * self._columns + 1
+                    visible.extend(range(first, min(first + self._columns, count + 1)))
+            wanted = [num for num in visible if not num in self._tiles]
+
+            for num in visible:
+                if num in self._tiles and not num in self._attached:
+                    tile = self._tiles[num]
+                    tile.setParent(self)
+                    tile.move(self.position(num))
+                    tile.show()
+                    self._attached.add(num)
+
+            placeholders = {num: tile for num, tile in self._placeholders.items() if num in wanted}
+            spare = [tile for num, tile in self._placeholders.items() if not num in placeholders] + self._spare
+            for num in wanted:
+                if num in placeholders:
+                    continue
+                if spare:
+                    tile = spare.pop()
+                    tile.setNum(num)
+                else:
+                    tile = self._factory(num)
+                    tile.setParent(self)
+                tile.move(self.position(num))
+                tile.show()
+                placeholders[num] = tile
+            for tile in spare:
+                tile.hide()
+            self._placeholders = placeholders
+            self._spare = spare
+
+        def resizeEvent(self, a0: QResizeEvent) -> None:
+            columns = max(1, (a0.size().width() + self._spacing) // self.step)
+            if columns != self._columns:
+                self._columns = columns
+                for num in self._attached:
+                    self._tiles[num].move(self.position(num))
+                self._resize_grid()
+            self._refresh_visible()
+            super().resizeEvent(a0)
+
+        def moveEvent(self, a0: QMoveEvent) -> None:
+            # a scroll area scrolls by moving its widget
+            self._refresh_visible()
+            super().moveEvent(a0)
+
+        def showEvent(self, a0: QShowEvent) -> None:
+            super().showEvent(a0)
+            QTimer.singleShot(0, self._refresh_visible)
+
     class ViewTile(QPushButton):
         _title: str = ""
         _num: int
@@ -296,6 +446,10 @@ class AbstractDirectoryView(QMainWindow):
                 """)
                 self.setActive(self._active)
 
+        def setNum(self, num: int) -> None:
+            self._num = num
+            self._numLabel.setText(str(num))
+
         def getColor(self) -> Optional[QColor]:
             if self._color:
                 return self._color
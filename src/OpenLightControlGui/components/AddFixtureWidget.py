@@ -1,27 +1,101 @@
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QScrollArea, QDialogButtonBox, QWidget, QLabel, QSpacerItem, QSizePolicy, QPushButton
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QTableView, QDialogButtonBox, QWidget, QLabel, QPushButton, QHeaderView, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
 
-from typing import Dict, Optional
-import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
-from OpenLightControlGui import CollapsibleBox, HiddenSpinBox
-from OpenLightControlGui.fixture_model import Fixture
-from OpenLightControlGui.utils.ofl import get_fixtures
+from OpenLightControlGui.fixture_model import Fixture, FixtureSummary, Mode
+from OpenLightControlGui.utils.ofl import get_fixture_summaries, summarize_fixtures
+from OpenLightControlGui.utils.search import FixtureSearchIndex
 
 class AddFixtureWidget(QDialog):
+
+    class ResultModel(QAbstractTableModel):
+        '''The matching fixture modes as table rows, so the view only ever creates the rows that are visible.'''
+        _index: FixtureSearchIndex
+        _rows: 'List[int]'
+        _fixture_count: 'Dict[str, int]'
+
+        HEADERS = ["Manufacturer", "Fixture", "Count", "Channels"]
+
+        def __init__(self, index: FixtureSearchIndex, fixture_count: 'Dict[str, int]') -> None:
+            super().__init__()
+            self._index = index
+            self._rows = []
+            self._fixture_count = fixture_count
+
+        def setRows(self, rows: 'List[int]') -> None:
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+
+        def setFixtureCount(self, fixture_count: 'Dict[str, int]') -> None:
+            self._fixture_count = fixture_count
+            if self._rows:
+                self.dataChanged.emit(self.index(0, 2), self.index(len(self._rows) - 1, 2))
+
+        def path(self, row: int) -> str:
+            item = self._index.item(self._rows[row])
+            return f"{item.manufacturer}/{item.key}/{item.mode}"
+
+        def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+            return 0 if parent.isValid() else len(self._rows)
+
+        def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+            return 0 if parent.isValid() else len(self.HEADERS)
+
+        def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+            if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+                return self.HEADERS[section]
+            return None
+
+        def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+            if not index.isValid() or not role in (Qt.DisplayRole, Qt.EditRole):
+                return None
+            item = self._index.item(self._rows[index.row()])
+            column = index.column()
+            if column == 0:
+                return item.manufacturerName
+            if column == 1:
+                return f"{item.fixtureName} {item.mode}"
+            if column == 2:
+                count = self._fixture_count.get(self.path(index.row()), 0)
+                return count if count or role == Qt.EditRole else ""
+            return f"{item.channels}ch"
+
+        def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
+            if not index.isValid() or index.column() != 2 or role != Qt.EditRole:
+                return False
+            self._fixture_count[self.path(index.row())] = int(value)
+            self.dataChanged.emit(index, index)
+            return True
+
+        def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+            flags = super().flags(index)
+            if index.isValid() and index.column() == 2:
+                flags |= Qt.ItemIsEditable
+            return flags
+
     _mainLay: QVBoxLayout
     _topBar: QHBoxLayout
     _searchInput: QLineEdit
-    _mainScroll: QScrollArea
-    _fixLay: QVBoxLayout
+    _resultView: QTableView
+    _resultModel: 'AddFixtureWidget.ResultModel'
     _bottomBar: QDialogButtonBox
+    _searchTimer: QTimer
     
-    _fixturedict: 'Dict[str, Dict[str, Fixture]]'
+    _fixturedict: 'Dict[str, Dict[str, FixtureSummary]]'
+    _searchIndex: FixtureSearchIndex
     _fixture_count: 'Dict[str, int]'
     _search: str
+
+    # keystrokes closer together than this are searched as one
+    SEARCH_DELAY = 120
     
-    def __init__(self, fixturedict: 'Dict[str, Dict[str, Fixture]]', parent: Optional[QWidget] = None) -> None:
+    def __init__(self, fixturedict: 'Mapping[str, Mapping[str, Union[Fixture, FixtureSummary]]]', parent: Optional[QWidget] = None) -> None:
         super().__init__(parent=parent)
-        self._fixturedict = fixturedict
+        # the list only needs names and channel counts, lazily loaded libraries are summarized from their index
+        self._fixturedict = summarize_fixtures(fixturedict)
+        self._searchIndex = FixtureSearchIndex(self._fixturedict)
         self._fixture_count = {}
         self._search = ""
         self.setWindowTitle("Add Fixtures")
@@ -35,10 +109,22 @@ class AddFixtureWidget(QDialog):
         self._searchInput.textChanged.connect(self._textchanged) # type: ignore
         self._topBar.addWidget(self._searchInput)
 
-        self._mainScroll = QScrollArea()
+        self._searchTimer = QTimer(self)
+        self._searchTimer.setSingleShot(True)
+        self._searchTimer.setInterval(self.SEARCH_DELAY)
+        self._searchTimer.timeout.connect(self._fill_list) # type: ignore
+
+        self._resultModel = AddFixtureWidget.ResultModel(self._searchIndex, self._fixture_count)
+        self._resultView = QTableView()
+        self._resultView.setModel(self._resultModel)
+        self._resultView.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        self._resultView.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._resultView.verticalHeader().hide()
+        # fixed row heights let the view skip measuring rows that are not visible
+        self._resultView.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self._resultView.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self._fill_list()
-        self._mainScroll.setWidgetResizable(True)
-        self._mainLay.addWidget(self._mainScroll)
+        self._mainLay.addWidget(self._resultView)
 
         self._bottomBar = QDialogButtonBox(
             QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -53,42 +139,25 @@ class AddFixtureWidget(QDialog):
 
     def setFixtureCount(self, fixture_count: 'Dict[str, int]') -> None:
         self._fixture_count = fixture_count
-        self._fill_list()
+        self._resultModel.setFixtureCount(fixture_count)
+
+    def getSelection(self) -> 'List[Tuple[Fixture, Mode, int]]':
+        '''Returns: List[Tuple[Fixture, Mode, int]] - Every chosen mode with its count, only these fixtures get fully loaded.'''
+        selection = []
+        for path, count in self._fixture_count.items():
+            man, key, modeName = path.split("/", 2)
+            summary = self._fixturedict.get(man, {}).get(key)
+            mode = summary.getModeByName(modeName) if summary else None
+            if count and mode:
+                selection.append((summary.fixture, mode.mode, count))
+        return selection
     
     def _textchanged(self, text: str) -> None:
         self._search = text
-        self._fill_list()
+        self._searchTimer.start()
     
     def _fill_list(self) -> None:
-        search_re = re.compile(self._search, re.IGNORECASE)
-        self._fixLay = QVBoxLayout()
-        for man, fixs in self._fixturedict.items():
-            collap = CollapsibleBox(
-                fixs[list(fixs.keys())[0]].manufacturer.name)
-            colllay = QVBoxLayout()
-            for key, fix in fixs.items():
-                for mode in fix.modes:
-                    text = f"{fix.name} {mode.name}"
-                    if search_re.search(text):
-                        linelay = QHBoxLayout()
-                        linelay.addWidget(QLabel(text))
-                        spin = HiddenSpinBox()
-                        if self._fixture_count.get(f"{man}/{fix.key}/{mode.name}"):
-                            spin.setValue(self._fixture_count[f"{man}/{fix.key}/{mode.name}"])
-                        spin.valueChanged.connect(
-                            lambda num, fix=f"{man}/{fix.key}/{mode.name}": self._fixture_count.__setitem__(fix, num))
-                        spin.setMaximumWidth(100)
-                        linelay.addWidget(spin)
-                        linelay.addWidget(QLabel(f"{len(mode.channelKeys)}ch"))
-                        colllay.addLayout(linelay)
-            collap.setContentLayout(colllay)
-            if colllay.count():
-                self._fixLay.addWidget(collap)
-        vspacer = QSpacerItem(0, 0, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
-        self._fixLay.addSpacerItem(vspacer)
-        wid = QWidget()
-        wid.setLayout(self._fixLay)
-        self._mainScroll.setWidget(wid)
+        self._resultModel.setRows(self._searchIndex.search(self._search))
 
 if __name__ == "__main__":
     import os
@@ -99,14 +168,14 @@ if __name__ == "__main__":
 
     basepath = os.path.dirname(__file__)
     ofl = os.path.join(basepath, "../../../../open-fixture-library/fixtures/")
-    fixturesByManu = get_fixtures(ofl)
+    fixturesByManu = get_fixture_summaries(ofl)
 
     window = QPushButton("Add Fixture")
 
     def clicked():
         dlg = AddFixtureWidget(fixturesByManu, window)
         if dlg.exec():
-            print(dlg.getFixtureCount())
+            print(dlg.getSelection())
         else:
             print("Cancel!")
     
@@ -42,8 +42,8 @@ class CommandDirectoryView(AbstractDirectoryView):
         dropdown2.addItems(self._options)
         dropdown2.setCurrentIndex(self._options.index(self._commands[item._num]["action2"]))
         dropdown2.currentIndexChanged.connect(lambda actnum, num=item._num: self.doaction2(actnum, num)) # type: ignore
-        self._mainTable.setCellWidget(item._num-1, 3, dropdown)
-        self._mainTable.setCellWidget(item._num-1, 4, dropdown2)
+        self._mainTable.setCellWidget(self._tableRow(item._num), 3, dropdown)
+        self._mainTable.setCellWidget(self._tableRow(item._num), 4, dropdown2)
         self._dropdowns[item._num] = (dropdown, dropdown2)
         return super()._add_table_item(item)
     
@@ -44,8 +44,8 @@ class CuelistDirectoryView(AbstractDirectoryView):
         if i is not None:
             dropdown2.setValue(i.standardDuration)
         dropdown2.valueChanged.connect(lambda val, num=item._num: self.doduration(val, num)) # type: ignore
-        self._mainTable.setCellWidget(item._num-1, 3, dropdown)
-        self._mainTable.setCellWidget(item._num-1, 4, dropdown2)
+        self._mainTable.setCellWidget(self._tableRow(item._num), 3, dropdown)
+        self._mainTable.setCellWidget(self._tableRow(item._num), 4, dropdown2)
         self._dropdowns[item._num] = (dropdown, dropdown2)
         return super()._add_table_item(item)
 
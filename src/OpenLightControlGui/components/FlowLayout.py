@@ -4,8 +4,10 @@ PyQt5 port of the `layouts/flowlayout
 from Qt5.
 
 """
+from typing import Dict, Iterable, List, Optional, Tuple
+
 from PyQt5.QtCore import pyqtSignal, QPoint, QRect, QSize, Qt
-from PyQt5.QtWidgets import QLayout, QSizePolicy, QSpacerItem, QWidget
+from PyQt5.QtWidgets import QLayout, QLayoutItem, QSizePolicy, QSpacerItem, QWidget
 
 
 class FlowLayout(QLayout):
@@ -16,27 +18,106 @@ class FlowLayout(QLayout):
     but if enough space is lacking, it automatically wraps its children into
     multiple rows.
 
+    Item positions are cached per width. Inserting or removing an item only
+    drops the cached positions from that item on. Qt calls ``invalidate`` on
+    every show, activation and layout request, so it only marks the cache for
+    checking: the next layout compares every cached size hint with the item's
+    current one and recomputes from the first item that changed.
+    ``addWidgets`` and ``insertWidgets`` add many widgets with a single
+    invalidation.
+
+    In this package it holds the tombstones of the (non-virtual) OutputView,
+    directory views lay out their tiles with TileGrid instead.
+
+    ``indexOf`` reads the position of a widget from a map that is only
+    renumbered from the first changed index on, lazily on the next lookup.
+    Appending, removing the last item and looking up widgets are O(1)
+    (amortized); inserting or removing in the middle still moves the items
+    after it, whose positions have to be laid out again anyway.
+
     """
     heightChanged = pyqtSignal(int)
 
+    # cached widths, resizing a window should not fill the cache with every width it passed through
+    MAX_CACHED_WIDTHS = 4
+
+    _item_list: 'List[QLayoutItem]'
+    _widget_index: 'Dict[QWidget, int]'
+    _indexed: int = 0
+    _hints: 'List[Optional[Tuple[QSize, int, int]]]'
+    _geometry: 'Dict[int, Tuple[List[QRect], List[Tuple[int, int, int]]]]'
+    _bulk: bool = False
+    _verify: bool = False
+
     def __init__(self, parent=None, margin=0, spacing=-1):
+        # set up before QLayout.__init__, which already calls invalidate
+        self._item_list = []
+        self._widget_index = {}
+        self._indexed = 0
+        self._hints = []
+        self._geometry = {}
+
         super().__init__(parent)
         if parent is not None:
             self.setContentsMargins(margin, margin, margin, margin)
         self.setSpacing(spacing)
 
-        self._item_list = []
-
     def __del__(self):
-        while self.count():
-            self.takeAt(0)
+        # only the Python side is left to clean up, the C++ layout may already be gone
+        self._item_list.clear()
+        self._widget_index.clear()
+        self._hints.clear()
+        self._geometry.clear()
+
+    def _changed(self, index: int) -> None:
+        """Drops cached positions of the items from index on."""
+        for rects, states in self._geometry.values():
+            del rects[index:]
+            del states[index:]
+        if not self._bulk:
+            QLayout.invalidate(self)
 
     def addItem(self, item):  # pylint: disable=invalid-name
+        index = len(self._item_list)
         self._item_list.append(item)
-    
+        self._hints.append(None)
+        if item.widget() is not None:
+            self._widget_index[item.widget()] = index
+        if self._indexed == index:
+            self._indexed = index + 1
+        self._changed(index)
+
     def insertWidget(self, index: int, w: QWidget) -> None:
-        self.addWidget(w)
-        self._item_list.insert(index, self._item_list.pop(self.indexOf(w)))
+        self.insertWidgets(index, [w])
+
+    def insertWidgets(self, index: int, widgets: 'Iterable[QWidget]') -> None:
+        """Inserts widgets at index, in their order, with one invalidation and one layout pass."""
+        start = len(self._item_list)
+        enabled = self.isEnabled()
+        # every child that is shown activates the layout right away, so showing them here while the layout is
+        # disabled saves a layout pass per widget
+        self.setEnabled(False)
+        self._bulk = True
+        try:
+            for w in widgets:
+                self.addWidget(w)
+                if not (w.isHidden() and w.testAttribute(Qt.WA_WState_ExplicitShowHide)):
+                    w.show()
+        finally:
+            self._bulk = False
+            self.setEnabled(enabled)
+        index = max(0, min(index, start))
+        if start != index:
+            self._item_list[index:] = self._item_list[start:] + self._item_list[index:start]
+            self._hints[index:] = self._hints[start:] + self._hints[index:start]
+            self._indexed = min(self._indexed, index)
+        self._changed(index)
+        if enabled:
+            self.activate()
+
+    def addWidgets(self, widgets: 'Iterable[QWidget]') -> None:
+        """Appends widgets with one invalidation instead of one per widget."""
+        self.insertWidgets(len(self._item_list), widgets)
 
     def addSpacing(self, size):  # pylint: disable=invalid-name
         self.addItem(QSpacerItem(
@@ -50,11 +131,53 @@ class FlowLayout(QLayout):
             return self._item_list[index]
         return None
 
+    def indexOf(self, w: QWidget) -> int:
+        index = self._widget_index.get(w)
+        if index is None:
+            return -1
+        if index >= self._indexed:
+            # positions from the first change on are stale, renumber them once for all following lookups
+            for i in range(self._indexed, len(self._item_list)):
+                widget = self._item_list[i].widget()
+                if widget is not None:
+                    self._widget_index[widget] = i
+            self._indexed = len(self._item_list)
+            index = self._widget_index[w]
+        return index
+
     def takeAt(self, index):  # pylint: disable=invalid-name
         if 0 <= index < len(self._item_list):
-            return self._item_list.pop(index)
+            item = self._item_list.pop(index)
+            self._hints.pop(index)
+            if item.widget() is not None:
+                self._widget_index.pop(item.widget(), None)
+            self._indexed = min(self._indexed, index)
+            self._changed(index)
+            return item
         return None
 
+    def removeWidget(self, w: QWidget) -> None:
+        index = self.indexOf(w)
+        if index >= 0:
+            self.takeAt(index)
+
+    def invalidate(self) -> None:
+        self._verify = True
+        super().invalidate()
+
+    def _verifyHints(self) -> None:
+        """Drops the cached hints of items whose size hint changed, and the positions from the first of them on."""
+        self._verify = False
+        first = len(self._item_list)
+        for index, (item, hint) in enumerate(zip(self._item_list, self._hints)):
+            if hint is not None and item.sizeHint() != hint[0]:
+                self._hints[index] = None
+                first = min(first, index)
+        if first < len(self._item_list):
+            for rects, states in self._geometry.values():
+                del rects[first:]
+                del states[first:]
+
     def expandingDirections(self):  # pylint: disable=invalid-name,no-self-use
         return Qt.Orientations(Qt.Orientation(0))
 
@@ -85,23 +208,23 @@ class FlowLayout(QLayout):
         return size
     
     def clear(self) -> None:
-        for i in reversed(range(self.count())): # type: ignore
-            w: QWidget = self.itemAt(i).widget()
-            self.removeWidget(w)
-            w.setParent(None) # type: ignore
-            w.deleteLater()
+        self._bulk = True
+        try:
+            for i in reversed(range(self.count())): # type: ignore
+                w: QWidget = self.itemAt(i).widget()
+                self.removeWidget(w)
+                w.setParent(None) # type: ignore
+                w.deleteLater()
+        finally:
+            self._bulk = False
+        self._changed(0)
 
-    def _do_layout(self, rect, test_only=False):
-        m = self.contentsMargins()
-        effective_rect = rect.adjusted(+m.left(), +
-                                       m.top(), -m.right(), -m.bottom())
-        x = effective_rect.x()
-        y = effective_rect.y()
-        line_height = 0
-
-        for item in self._item_list:
+    def _hint(self, index: int) -> 'Tuple[QSize, int, int]':
+        """Returns: the size hint and horizontal and vertical spacing of an item."""
+        hint = self._hints[index]
+        if hint is None:
+            item = self._item_list[index]
             wid = item.widget()
-
             space_x = self.spacing()
             space_y = self.spacing()
             if wid is not None:
@@ -109,20 +232,48 @@ class FlowLayout(QLayout):
                     QSizePolicy.PushButton, QSizePolicy.PushButton, Qt.Horizontal)
                 space_y += wid.style().layoutSpacing(
                     QSizePolicy.PushButton, QSizePolicy.PushButton, Qt.Vertical)
+            hint = self._hints[index] = (item.sizeHint(), space_x, space_y)
+        return hint
 
-            next_x = x + item.sizeHint().width() + space_x
-            if next_x - space_x > effective_rect.right() and line_height > 0:
-                x = effective_rect.x()
+    def _positions(self, width: int) -> 'Tuple[List[QRect], int]':
+        """Returns: the geometry of every item relative to the top left corner and the used height, for a width."""
+        if self._verify:
+            self._verifyHints()
+        geometry = self._geometry.get(width)
+        if geometry is None:
+            if len(self._geometry) >= self.MAX_CACHED_WIDTHS:
+                self._geometry.pop(next(iter(self._geometry)))
+            geometry = self._geometry[width] = ([], [])
+        rects, states = geometry
+
+        # resume after the last item still cached
+        x, y, line_height = states[-1] if states else (0, 0, 0)
+        for index in range(len(rects), len(self._item_list)):
+            size, space_x, space_y = self._hint(index)
+            next_x = x + size.width() + space_x
+            if next_x - space_x > width - 1 and line_height > 0:
+                x = 0
                 y = y + line_height + space_y
-                next_x = x + item.sizeHint().width() + space_x
+                next_x = x + size.width() + space_x
                 line_height = 0
 
-            if not test_only:
-                item.setGeometry(QRect(QPoint(x, y), item.sizeHint()))
-
+            rects.append(QRect(QPoint(x, y), size))
             x = next_x
-            line_height = max(line_height, item.sizeHint().height())
+            line_height = max(line_height, size.height())
+            states.append((x, y, line_height))
+        return rects, y + line_height
+
+    def _do_layout(self, rect, test_only=False):
+        m = self.contentsMargins()
+        effective_rect = rect.adjusted(+m.left(), +
+                                       m.top(), -m.right(), -m.bottom())
+        rects, height = self._positions(effective_rect.width())
+
+        if not test_only:
+            origin = effective_rect.topLeft()
+            for item, geometry in zip(self._item_list, rects):
+                item.setGeometry(geometry.translated(origin))
 
-        new_height = y + line_height - rect.y()
+        new_height = effective_rect.y() + height - rect.y()
         self.heightChanged.emit(new_height)
         return new_height
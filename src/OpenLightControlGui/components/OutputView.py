@@ -1,95 +1,263 @@
 from OpenLightControlGui.model import Scene, State, Group, Lamp, LampState
+from OpenLightControlGui.fixture_model import Entity
 from OpenLightControlGui.components.FlowLayout import FlowLayout
 
-from typing import Dict, Optional, List
+from bisect import bisect_left
+from typing import Any, Dict, Optional, List, Tuple
+
+from PyQt5.QtWidgets import QScrollArea, QWidget, QApplication, QVBoxLayout, QListView, QStyledItemDelegate, QStyleOptionViewItem, QStyle
+from PyQt5.QtGui import QColor, QFontMetrics, QPainter, QPaintEvent, QPen
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, QTimer, Qt
+
+_values = Tuple[str, str, str, str, Optional[Tuple[int, int, int]]]
 
-from PyQt5.QtWidgets import QScrollArea, QWidget, QApplication, QVBoxLayout, QLabel
-from PyQt5.QtCore import QTimer
 
 class Tombstone(QWidget):
+    '''Shows the number, intensity, pan, tilt and color of one lamp, painted directly instead of through labels and stylesheets.'''
     lamp: Lamp
     lampstate: LampState
+    _values: 'Optional[_values]' = None
+
+    MARGIN = 5
+    PADDING = 6
 
     def __init__(self, lamp: Lamp, lampstate: LampState) -> None:
         super().__init__()
         self.lamp = lamp
         self.lampstate = lampstate
+        self.refresh()
+
+    def setLampState(self, lampstate: LampState) -> None:
+        self.lampstate = lampstate
+        self.refresh()
+
+    @staticmethod
+    def _color(lamp: Lamp, lampstate: LampState) -> 'Optional[Tuple[int, int, int]]':
+        if not (lamp.capabilities["Color"] and lampstate.Color):
+            return None
+        rgb = []
+        for coltype in ["Red", "Green", "Blue"]:
+            entity = getattr(lampstate.Color, coltype)
+            if not isinstance(entity, Entity):
+                rgb.append(0)
+            elif entity.unit == "col":
+                rgb.append(int(entity.getBaseUnitEntity().number * 255))
+            else:
+                rgb.append(int(entity.getBaseUnitEntity().number))
+        return (rgb[0], rgb[1], rgb[2])
 
-        self.main_lay = QVBoxLayout()
-        self.lamp_num = QLabel()
-        self.lamp_intens = QLabel()
-        self.lamp_pan = QLabel()
-        self.lamp_tilt = QLabel()
-        self.main_lay.addWidget(self.lamp_num)
-        self.main_lay.addWidget(self.lamp_intens)
-        self.main_lay.addWidget(self.lamp_pan)
-        self.main_lay.addWidget(self.lamp_tilt)
+    @staticmethod
+    def readValues(lamp: Lamp, lampstate: LampState) -> '_values':
+        '''Returns: the texts of the four lines and the border color (None for lamps without color) shown for a lamp.'''
+        return (
+            str(lamp.number),
+            str(lampstate.Intensity.Intensity if lampstate.Intensity else "-"),
+            str(lampstate.Position.Pan if lampstate.Position else "-"),
+            str(lampstate.Position.Tilt if lampstate.Position else "-"),
+            Tombstone._color(lamp, lampstate)
+        )
 
-        self.main_wid = QWidget()
-        self.main_wid.setObjectName("tombstone")
-        self.main_wid.setLayout(self.main_lay)
+    @staticmethod
+    def tileSize(metrics: QFontMetrics, texts: 'Tuple[str, ...]' = ()) -> QSize:
+        width = max([metrics.horizontalAdvance(text) for text in texts] + [metrics.horizontalAdvance("000")])
+        inset = 2 * (Tombstone.MARGIN + Tombstone.PADDING)
+        return QSize(width + inset, 4 * metrics.lineSpacing() + inset)
 
-        slay = QVBoxLayout()
-        slay.addWidget(self.main_wid)
-        self.setLayout(slay)
+    @staticmethod
+    def paintValues(qp: QPainter, rect: QRect, values: '_values', textColor: QColor) -> None:
+        '''Paints a tile (border and four lines of text) into rect, shared by Tombstone and the virtual OutputView.'''
+        color = QColor(*values[4]) if values[4] else QColor(Qt.lightGray) # type: ignore
+        margin = Tombstone.MARGIN
+        qp.setPen(QPen(color, 1, Qt.SolidLine)) # type: ignore
+        qp.drawRect(rect.adjusted(margin, margin, -margin - 1, -margin - 1))
 
+        qp.setPen(textColor)
+        inset = margin + Tombstone.PADDING
+        line = qp.fontMetrics().lineSpacing()
+        for i, text in enumerate(values[:4]):
+            qp.drawText(QRect(rect.x() + inset, rect.y() + inset + i * line, rect.width() - 2 * inset, line), Qt.AlignLeft | Qt.AlignVCenter, text) # type: ignore
+
+    def refresh(self) -> None:
+        '''Reads the values of the lamp again and repaints, but only if they changed.'''
+        values = Tombstone.readValues(self.lamp, self.lampstate)
+        if values == self._values:
+            return
+        if self._values is None or values[:4] != self._values[:4]:
+            self.updateGeometry()
+        self._values = values
         self.update()
-    
-    def update(self):
-        self.lamp_num.setText(str(self.lamp.number))
-        self.lamp_intens.setText(str(self.lampstate.Intensity.Intensity if self.lampstate.Intensity else "-"))
-        self.lamp_pan.setText(str(self.lampstate.Position.Pan if self.lampstate.Position else "-"))
-        self.lamp_tilt.setText(str(self.lampstate.Position.Tilt if self.lampstate.Position else "-"))
-        
-        if self.lamp.capabilities["Color"] and self.lampstate.Color:
-            rgb = []
-            for i, coltype in enumerate(["Red", "Green", "Blue"]):
-                if getattr(self.lampstate.Color, coltype).unit == "col":
-                    val = int(getattr(self.lampstate.Color, coltype).getBaseUnitEntity().number * 255)
-                else:
-                    val = int(getattr(self.lampstate.Color, coltype).getBaseUnitEntity().number)
-                rgb.append(val)
-            self.setStyleSheet("#tombstone { border: 1px solid rgb(" + ','.join([str(x) for x in rgb]) + ") }")
-        else:
-            self.setStyleSheet("#tombstone { border: 1px solid lightgrey }")
+
+    def sizeHint(self) -> QSize:
+        return Tombstone.tileSize(self.fontMetrics(), (self._values or ())[:4])
+
+    def minimumSizeHint(self) -> QSize:
+        return self.sizeHint()
+
+    def paintEvent(self, a0: QPaintEvent) -> None:
+        if self._values is None:
+            return
+        qp = QPainter()
+        qp.begin(self)
+        Tombstone.paintValues(qp, self.rect(), self._values, self.palette().color(self.foregroundRole()))
+        qp.end()
+
 
 class OutputView(QWidget):
+    '''
+    Shows a Tombstone for every lamp of the given scenes.
+    Tombstones are created once per lamp and kept in place; `refresh` skips all work while the scenes' versions are unchanged.
+    With `virtual` set, tiles are painted by one list view instead, which only reads and paints the visible lamps
+    and so stays smooth with many thousands of them.
+    '''
+
+    class TileModel(QAbstractListModel):
+        '''The lamps shown by a virtual OutputView, their tile values are read on first paint after every change.'''
+        _lamps: 'List[Tuple[Lamp, LampState]]'
+        _values: 'List[Optional[_values]]'
+
+        def __init__(self) -> None:
+            super().__init__()
+            self._lamps = []
+            self._values = []
+
+        def setLamps(self, lamps: 'List[Tuple[Lamp, LampState]]') -> None:
+            if len(lamps) == len(self._lamps) and all(a is b for (a, _), (b, _) in zip(lamps, self._lamps)):
+                self._lamps = lamps
+                self._values = [None] * len(lamps)
+                if lamps:
+                    self.dataChanged.emit(self.index(0), self.index(len(lamps) - 1), [Qt.UserRole])
+                return
+            self.beginResetModel()
+            self._lamps = lamps
+            self._values = [None] * len(lamps)
+            self.endResetModel()
+
+        def lamp(self, row: int) -> Lamp:
+            return self._lamps[row][0]
+
+        def tileValues(self, row: int) -> '_values':
+            values = self._values[row]
+            if values is None:
+                values = self._values[row] = Tombstone.readValues(*self._lamps[row])
+            return values
+
+        def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+            return 0 if parent.isValid() else len(self._lamps)
+
+        def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+            if not index.isValid():
+                return None
+            if role == Qt.DisplayRole:
+                return str(self._lamps[index.row()][0].number)
+            if role == Qt.UserRole:
+                return self.tileValues(index.row())
+            return None
+
+    class TileDelegate(QStyledItemDelegate):
+        def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+            values = index.data(Qt.UserRole)
+            if values is None:
+                return
+            if option.state & QStyle.State_Selected:
+                painter.fillRect(option.rect, option.palette.highlight())
+            Tombstone.paintValues(painter, option.rect, values, option.palette.color(option.palette.Text))
+
+        def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+            # one size for all tiles, wide enough for a four digit lamp number, so the view never measures every item
+            return Tombstone.tileSize(option.fontMetrics, ("0000",))
+
     scene: 'List[Scene]'
     main_lay: FlowLayout
     stone_dict: Dict[int, Tombstone]
+    _numbers: 'List[int]'
+    _version: 'Optional[Tuple[int, ...]]' = None
+    _model: 'Optional[OutputView.TileModel]' = None
 
-    def __init__(self, scene: 'List[Scene]', parent: Optional[QWidget] = None):
+    def __init__(self, scene: 'List[Scene]', parent: Optional[QWidget] = None, *, virtual: bool = False):
         super(OutputView, self).__init__(parent)
         self.scene = scene
         self.stone_dict = {}
+        self._numbers = []
 
         self.setWindowTitle("OutputView")
 
-        self.main_lay = FlowLayout(margin=10)
-        wid = QWidget()
-        wid.setLayout(self.main_lay)
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setWidget(wid)
         lay = QVBoxLayout()
-        lay.addWidget(scroll)
+        if virtual:
+            self._model = OutputView.TileModel()
+            self.view = QListView()
+            self.view.setViewMode(QListView.IconMode)
+            self.view.setMovement(QListView.Static)
+            self.view.setResizeMode(QListView.Adjust)
+            self.view.setUniformItemSizes(True)
+            self.view.setSelectionMode(QListView.NoSelection)
+            self.view.setItemDelegate(OutputView.TileDelegate(self.view))
+            self.view.setModel(self._model)
+            lay.addWidget(self.view)
+        else:
+            self.main_lay = FlowLayout(margin=10)
+            wid = QWidget()
+            wid.setLayout(self.main_lay)
+            scroll = QScrollArea()
+            scroll.setWidgetResizable(True)
+            scroll.setWidget(wid)
+            lay.addWidget(scroll)
         self.setLayout(lay)
 
         self.timer = QTimer()
-        self.timer.timeout.connect(self.update) # type: ignore
+        self.timer.timeout.connect(self.refresh) # type: ignore
         self.timer.start(100)
-        self.update()
+        self.refresh()
+
+    @property
+    def virtual(self) -> bool:
+        return self._model is not None
 
-    def update(self):
-        self.stone_dict.clear()
-        self.main_lay.clear()
+    def refresh(self) -> None:
+        version = tuple(scene.version for scene in self.scene)
+        if version == self._version:
+            return
+        self._version = version
+
+        lamps: 'Dict[int, Tuple[Lamp, LampState]]' = {}
         for scene in self.scene:
             for name, state in scene.getStates().items():
                 for lamp in state.group.lamps:
-                    self.stone_dict[lamp.number] = Tombstone(lamp, state.state)
-        for _, lamp in sorted(self.stone_dict.items()):
-            self.main_lay.addWidget(lamp)
+                    lamps[lamp.number] = (lamp, state.state)
+
+        if self._model is not None:
+            self._model.setLamps([lamps[number] for number in sorted(lamps.keys())])
+            return
 
+        removed = [number for number in self._numbers if not number in lamps]
+        if removed:
+            for number in removed:
+                stone = self.stone_dict.pop(number)
+                self.main_lay.removeWidget(stone)
+                stone.setParent(None) # type: ignore
+                stone.deleteLater()
+            # rebuilt once per refresh, removing the numbers one by one would be quadratic
+            self._numbers = [number for number in self._numbers if number in lamps]
+
+        new: 'List[int]' = []
+        for number, (lamp, lampstate) in lamps.items():
+            stone = self.stone_dict.get(number)
+            if stone is None:
+                self.stone_dict[number] = Tombstone(lamp, lampstate)
+                new.append(number)
+            else:
+                stone.lamp = lamp
+                stone.setLampState(lampstate)
+
+        new.sort()
+        if new and (not self._numbers or new[0] > self._numbers[-1]):
+            # the common case of a first fill or lamps added at the end goes through one bulk insertion
+            self.main_lay.addWidgets([self.stone_dict[number] for number in new])
+            self._numbers.extend(new)
+        else:
+            for number in new:
+                index = bisect_left(self._numbers, number)
+                self._numbers.insert(index, number)
+                self.main_lay.insertWidget(index, self.stone_dict[number])
 
 if __name__ == '__main__':
     import sys
@@ -97,6 +265,6 @@ if __name__ == '__main__':
 
     scene = Scene()
     scene.addState(State(Group(), LampState()), "Scene")
-    window = OutputView(scene)
+    window = OutputView([scene])
     window.show()
     sys.exit(app.exec_())
@@ -60,7 +60,7 @@ class PalletteDirectoryView(AbstractDirectoryView):
     def _add_table_item(self, item: "ViewTile") -> None:
         wid = QTableWidgetItem(item._getdirIndicator())
         wid.setFlags(Qt.ItemIsEnabled) # type: ignore
-        self._mainTable.setItem(item._num-1, 3, wid)
+        self._mainTable.setItem(self._tableRow(item._num), 3, wid)
         return super()._add_table_item(item)
 
     class ViewTile(AbstractDirectoryView.ViewTile):
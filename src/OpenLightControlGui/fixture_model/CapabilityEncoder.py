@@ -0,0 +1,250 @@
+from .Entity import Entity
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .Capability import Capability
+    from .CoarseChannel import CoarseChannel
+
+
+# LampState attribute -> (capability types, start/end entity) a value of the attribute is encoded with
+ATTRIBUTE_CAPABILITIES: 'dict[str, tuple[tuple[str, ...], str]]' = {
+    "Intensity": (("Intensity",), "brightness"),
+    "Intensity2": (("Intensity",), "brightness"),
+    "Red": (("ColorIntensity",), "brightness"),
+    "Green": (("ColorIntensity",), "brightness"),
+    "Blue": (("ColorIntensity",), "brightness"),
+    "Strobe": (("ShutterStrobe", "StrobeSpeed"), "speed"),
+    "Smoke": (("FogOutput",), "fogOutput"),
+    "Fan": (("Speed",), "speed"),
+    "Pan": (("Pan",), "angle"),
+    "Tilt": (("Tilt",), "angle"),
+    "PosTime": (("PanTiltSpeed",), "duration"),
+    "Slot": (("WheelSlot",), "slotNumber"),
+    "Slot2": (("WheelSlot",), "slotNumber"),
+    "Gobo": (("WheelSlot",), "slotNumber"),
+    "Gobo2": (("WheelSlot",), "slotNumber"),
+    "GoboRot": (("WheelSlotRotation", "WheelRotation"), "speed"),
+    "Gobo2Rot": (("WheelSlotRotation", "WheelRotation"), "speed"),
+    "GoboShake": (("WheelShake",), "shakeSpeed"),
+    "Gobo2Shake": (("WheelShake",), "shakeSpeed"),
+    "Focus": (("Focus",), "distance"),
+    "PrismRot": (("PrismRotation",), "speed"),
+}
+
+# capability type -> (property, value) a capability of that type also has to match for the attribute, e.g. a shutter's
+# pulse or ramp effects have a speed as well but are no strobe
+CAPABILITY_FILTERS: 'dict[str, dict[str, tuple[str, str]]]' = {
+    "Strobe": {"ShutterStrobe": ("shutterEffect", "Strobe")},
+}
+
+
+def _entities(cap: 'Capability', attribute: str) -> 'Optional[list[Entity]]':
+    '''Returns: the start and end entity of a capability used for the attribute, None if it isn't.'''
+    types, prop = ATTRIBUTE_CAPABILITIES[attribute]
+    if not cap.type in types:
+        return None
+    match = CAPABILITY_FILTERS.get(attribute, {}).get(cap.type)
+    if match is not None and getattr(cap, match[0]) != match[1]:
+        return None
+    return getattr(cap, prop)
+
+
+def baseValue(value: 'Union[Entity, float, int]') -> 'tuple[Optional[str], float]':
+    '''Returns: (unit, number) - The value in its base unit, "col" counts as a fraction of 100%. Plain numbers have no unit.'''
+    if not isinstance(value, Entity):
+        return None, float(value)
+    if value.unit == "col":
+        return "%", value.number * 100
+    base = value.getBaseUnitEntity()
+    return base.unit, base.number
+
+
+class CapabilityEncoder():
+    '''
+    Turns values of one attribute into DMX values of one channel.
+    Built once from the channel's capabilities that use the attribute's start/end entity in the given (base) unit:
+    sorted lower bounds for a binary search, start and end numbers to interpolate between, and their DMX ranges in
+    the channel's highest resolution. Value ranges may overlap: a value uses the capability with the greatest lower
+    bound that contains it. Values between or outside of capabilities go to the closest capability bound.
+    The same table sorted by DMX range decodes DMX values back into entities.
+    '''
+    _channel: 'CoarseChannel'
+    _attribute: str
+    _unit: str
+    _lows: 'list[float]'
+    _highs: 'list[float]'
+    _numStarts: 'list[float]'
+    _numEnds: 'list[float]'
+    _dmxStarts: 'list[int]'
+    _dmxEnds: 'list[int]'
+    # per row, the row up to it (in value order) reaching highest, so a value is contained in one of them if in that one
+    _reach: 'list[int]'
+    _dmxOrder: 'list[int]'
+    _dmxSorted: 'list[int]'
+    _arrays: 'Optional[tuple[np.ndarray, ...]]'
+
+    def __init__(self, channel: 'CoarseChannel', attribute: str, unit: str) -> None:
+        self._channel = channel
+        self._attribute = attribute
+        self._unit = unit
+        self._arrays = None
+        rows = []
+        for cap in channel.capabilities:
+            entities = _entities(cap, attribute)
+            if not entities:
+                continue
+            (startUnit, start), (endUnit, end) = baseValue(entities[0]), baseValue(entities[1])
+            if startUnit != unit or endUnit != unit:
+                continue
+            rows.append((min(start, end), max(start, end), start, end, int(cap.dmxRange.start), int(cap.dmxRange.end)))
+        rows.sort(key=lambda row: row[:2])
+        self._lows, self._highs, self._numStarts, self._numEnds, self._dmxStarts, self._dmxEnds = [list(column) for column in zip(*rows)] if rows else ([], [], [], [], [], [])
+        self._reach = []
+        for i, high in enumerate(self._highs):
+            self._reach.append(i if not self._reach or high >= self._highs[self._reach[-1]] else self._reach[-1])
+        # the DMX ranges of a channel's capabilities do not overlap, so sorted starts are an interval index
+        self._dmxOrder = sorted(range(len(rows)), key=lambda i: self._dmxStarts[i])
+        self._dmxSorted = [self._dmxStarts[i] for i in self._dmxOrder]
+
+    @staticmethod
+    def unitsOf(channel: 'CoarseChannel', attribute: str) -> 'list[str]':
+        '''Returns: list[str] - The base units the channel's capabilities use for the attribute, in order of appearance.'''
+        if not attribute in ATTRIBUTE_CAPABILITIES.keys():
+            return []
+        units: 'dict[str, None]' = {}
+        for cap in channel.capabilities:
+            entities = _entities(cap, attribute)
+            if entities:
+                unit = baseValue(entities[0])[0]
+                if unit is not None:
+                    units[unit] = None
+        return list(units.keys())
+
+    def _get_channel(self) -> 'CoarseChannel':
+        return self._channel
+
+    def _get_attribute(self) -> str:
+        return self._attribute
+
+    def _get_unit(self) -> str:
+        return self._unit
+
+    channel: 'CoarseChannel' = property(_get_channel)
+    attribute: str = property(_get_attribute)
+    unit: str = property(_get_unit)
+
+    def __len__(self) -> int:
+        return len(self._lows)
+
+    def __repr__(self) -> str:
+        return f"CapabilityEncoder <{self._channel.name}: {self._attribute} in {self._unit}, {len(self)} capabilities>"
+
+    def _shift(self, resolution: 'Optional[int]') -> int:
+        if resolution is None:
+            return 0
+        self._channel.ensureProperResolution(resolution)
+        return 8 * (self._channel.maxResolution - resolution)
+
+    def _row(self, number: float) -> int:
+        i = bisect_right(self._lows, number) - 1
+        if i < 0:
+            return 0
+        if number <= self._highs[i]:
+            return i
+        # an earlier, wider capability may contain the value, otherwise the one reaching highest is the closest below
+        reach = self._reach[i]
+        if number > self._highs[reach] and i + 1 < len(self._lows) and self._lows[i + 1] - number < number - self._highs[reach]:
+            return i + 1
+        return reach
+
+    def encode(self, value: 'Union[Entity, float, int]', resolution: 'Optional[int]' = None) -> 'Optional[int]':
+        '''Returns: Optional[int] - The DMX value (in the channel's highest resolution by default), None if there is no capability for it.'''
+        unit, number = baseValue(value)
+        if not self._lows or (unit is not None and unit != self._unit):
+            return None
+        i = self._row(number)
+        start, end = self._numStarts[i], self._numEnds[i]
+        fraction = 0.0 if start == end else min(1.0, max(0.0, (number - start) / (end - start)))
+        dmx = self._dmxStarts[i] + round(fraction * (self._dmxEnds[i] - self._dmxStarts[i]))
+        return dmx >> self._shift(resolution)
+
+    def _columns(self) -> 'tuple[np.ndarray, ...]':
+        if self._arrays is None:
+            self._arrays = tuple(np.asarray(column) for column in (self._lows, self._highs, self._numStarts, self._numEnds,
+                                                                    self._dmxStarts, self._dmxEnds, self._dmxOrder, self._dmxSorted, self._reach))
+        return self._arrays
+
+    def encodeMany(self, values: 'Union[Sequence[float], np.ndarray]', resolution: 'Optional[int]' = None) -> 'np.ndarray':
+        '''
+        Returns: np.ndarray - The DMX values of many numbers (in the encoder's unit) at once, e.g. for an effect curve.
+        Without capabilities all values are -1.
+        '''
+        numbers = np.asarray(values, dtype=np.float64)
+        if not self._lows:
+            return np.full(numbers.shape, -1, dtype=np.int64)
+        lows, highs, starts, ends, dmxStarts, dmxEnds, _, _, reaches = self._columns()
+        rows = np.clip(np.searchsorted(lows, numbers, side="right") - 1, 0, len(lows) - 1)
+        following = np.minimum(rows + 1, len(lows) - 1)
+        reach = reaches[rows]
+        below = numbers > highs[rows]
+        closer = (following > rows) & (lows[following] - numbers < numbers - highs[reach])
+        rows = np.where(below & (numbers > highs[reach]) & closer, following, np.where(below, reach, rows))
+        span = ends[rows] - starts[rows]
+        fractions = np.clip(np.divide(numbers - starts[rows], span, out=np.zeros_like(numbers), where=span != 0), 0, 1)
+        dmx = dmxStarts[rows] + np.rint(fractions * (dmxEnds[rows] - dmxStarts[rows])).astype(np.int64)
+        return dmx >> self._shift(resolution)
+
+    def _scale(self, resolution: 'Optional[int]') -> 'tuple[int, int]':
+        # a coarse value is spread over the whole range of the highest resolution, so 255 is the end of the channel
+        if resolution is None:
+            return 1, 1
+        self._channel.ensureProperResolution(resolution)
+        return (1 << 8 * self._channel.maxResolution) - 1, (1 << 8 * resolution) - 1
+
+    def decode(self, dmxValue: int, resolution: 'Optional[int]' = None) -> 'Optional[Entity]':
+        '''Returns: Optional[Entity] - The attribute value of a DMX value (in the channel's highest resolution by default), None if no capability of the table covers it.'''
+        full, part = self._scale(resolution)
+        value = dmxValue * full // part
+        i = bisect_right(self._dmxSorted, value) - 1
+        if i < 0:
+            return None
+        row = self._dmxOrder[i]
+        dmxStart, dmxEnd = self._dmxStarts[row], self._dmxEnds[row]
+        if value > dmxEnd:
+            return None
+        start, end = self._numStarts[row], self._numEnds[row]
+        fraction = 0.0 if dmxStart == dmxEnd else (value - dmxStart) / (dmxEnd - dmxStart)
+        return Entity(start + fraction * (end - start), self._unit)
+
+    def decodeMany(self, dmxValues: 'Union[Sequence[int], np.ndarray]', resolution: 'Optional[int]' = None) -> 'tuple[np.ndarray, np.ndarray]':
+        '''Returns: (numbers, valid) - The attribute values (in the encoder's unit) of many DMX values and which of them a capability covers.'''
+        full, part = self._scale(resolution)
+        values = np.asarray(dmxValues, dtype=np.int64) * full // part
+        if not self._lows:
+            return np.zeros(values.shape), np.zeros(values.shape, dtype=bool)
+        _, _, starts, ends, dmxStarts, dmxEnds, order, dmxSorted, _ = self._columns()
+        index = np.searchsorted(dmxSorted, values, side="right") - 1
+        rows = order[np.maximum(index, 0)]
+        valid = (index >= 0) & (values <= dmxEnds[rows])
+        span = (dmxEnds[rows] - dmxStarts[rows]).astype(np.float64)
+        fractions = np.divide(values - dmxStarts[rows], span, out=np.zeros(values.shape), where=span != 0)
+        return starts[rows] + fractions * (ends[rows] - starts[rows]), valid
+
+    @staticmethod
+    def encodeChannels(channels: 'Iterable[CoarseChannel]', attribute: str, value: 'Union[Entity, float, int]', resolution: 'Optional[int]' = None) -> 'list[Optional[int]]':
+        '''
+        Returns: list[Optional[int]] - The DMX value of one attribute value for every channel, e.g. those of a whole group.
+        Lamps of the same fixture mode share their channels, so every distinct channel is only encoded once.
+        '''
+        results: 'dict[int, Optional[int]]' = {}
+        encoded = []
+        for channel in channels:
+            key = id(channel)
+            if not key in results:
+                results[key] = channel.encode(attribute, value, resolution)
+            encoded.append(results[key])
+        return encoded
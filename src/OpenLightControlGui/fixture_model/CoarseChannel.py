@@ -1,17 +1,21 @@
 from .AbstractChannel import AbstractChannel
 from .Capability import Capability
+from .CapabilityEncoder import CapabilityEncoder, baseValue
 from .Entity import Entity
 from .FineChannel import FineChannel
+from .SlotTable import SLOT_ATTRIBUTES, SlotTable
 from .SwitchingChannel import SwitchingChannel, SwitchingChannelBehavior
 
 from .scale_dmx_value import DmxScaler
 scaleDmxValue = DmxScaler.scaleDmxValue
 
-from typing import TYPE_CHECKING, Any, Literal, Optional
+from typing import TYPE_CHECKING, Any, Literal, Optional, Sequence, Union
 from numbers import Number
 from math import floor
 from itertools import chain
 
+import numpy as np
+
 if TYPE_CHECKING:
     from .Fixture import Fixture
     from .Mode import Mode
@@ -296,3 +300,54 @@ class CoarseChannel(AbstractChannel):
                 self._cache["highlightValuePerResolution"][index] = scaleDmxValue(rawHighlightValue, self.dmxValueResolution, index)
             
         return self._cache["highlightValuePerResolution"][desiredResolution]
+
+    def getEncoders(self, attribute: str) -> 'list[CapabilityEncoder]':
+        '''Returns: list[CapabilityEncoder] - The (cached) encoder tables for a LampState attribute, one per base unit its capabilities use.'''
+        units = self._cache.setdefault("encoderUnits", {})
+        if not attribute in units.keys():
+            units[attribute] = CapabilityEncoder.unitsOf(self, attribute)
+        return [encoder for encoder in (self.getEncoder(attribute, unit) for unit in units[attribute]) if encoder is not None]
+
+    def getEncoder(self, attribute: str, unit: 'Optional[str]' = None) -> 'Optional[CapabilityEncoder]':
+        '''Returns: CapabilityEncoder | None - The (cached) encoder table for a LampState attribute in the given base unit (default: the first one used), None if no capability fits.'''
+        if unit is None:
+            encoders = self.getEncoders(attribute)
+            return encoders[0] if encoders else None
+        encoders = self._cache.setdefault("encoders", {})
+        if not (attribute, unit) in encoders.keys():
+            encoder = CapabilityEncoder(self, attribute, unit)
+            encoders[(attribute, unit)] = encoder if len(encoder) else None
+        return encoders[(attribute, unit)]
+
+    def getSlotTable(self, attribute: str) -> 'Optional[SlotTable]':
+        '''Returns: SlotTable | None - The (cached) DMX values of the channel's wheel slots or prism steps, None if it has none for the attribute.'''
+        if not attribute in SLOT_ATTRIBUTES:
+            return None
+        tables = self._cache.setdefault("slotTables", {})
+        if not attribute in tables.keys():
+            table = SlotTable(self, attribute)
+            tables[attribute] = table if len(table) else None
+        return tables[attribute]
+
+    def encode(self, attribute: str, value: 'Union[Entity, float, int]', resolution: 'Optional[int]' = None) -> 'Optional[int]':
+        '''Returns: int | None - The DMX value of a LampState attribute's value (in the highest resolution by default), None if the channel can't show it.'''
+        encoder = self.getEncoder(attribute, baseValue(value)[0])
+        return encoder.encode(value, resolution) if encoder is not None else None
+
+    def decode(self, attribute: str, dmxValue: int, resolution: 'Optional[int]' = None) -> 'Optional[Entity]':
+        '''Returns: Entity | None - The value of a LampState attribute a DMX value (in the highest resolution by default) stands for, None if it doesn't set the attribute.'''
+        for encoder in self.getEncoders(attribute):
+            entity = encoder.decode(dmxValue, resolution)
+            if entity is not None:
+                return entity
+        return None
+
+    def decodeMany(self, attribute: str, dmxValues: 'Sequence[int]', resolution: 'Optional[int]' = None) -> 'list[Optional[Entity]]':
+        '''Returns: list[Entity | None] - decode for many DMX values, with one vectorized lookup per encoder table.'''
+        decoded: 'list[Optional[Entity]]' = [None] * len(dmxValues)
+        for encoder in self.getEncoders(attribute):
+            numbers, valid = encoder.decodeMany(dmxValues, resolution)
+            for i in np.flatnonzero(valid).tolist():
+                if decoded[i] is None:
+                    decoded[i] = Entity(float(numbers[i]), encoder.unit)
+        return decoded
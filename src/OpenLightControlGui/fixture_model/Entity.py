@@ -1,5 +1,6 @@
 import re
-from typing import Union, Optional, Any, Dict
+from functools import lru_cache
+from typing import Union, Optional, Dict
 
 KEYWORDS = {
     'fast reverse': -100,
@@ -43,6 +44,11 @@ KEYWORDS = {
     'big': 100,
 }
 
+# distinct entity strings kept by the parse cache, fixture files use only a few hundred of them
+PARSE_CACHE_SIZE = 4096
+
+_ENTITY_PATTERN = re.compile(r"^([\d.-]+)(.*)$")
+
 unitConversions: 'Dict[str, Dict[str, Union[str, float]]]' = {
     'ms': {
         'baseUnit': 's',
@@ -62,17 +68,22 @@ unitConversions: 'Dict[str, Dict[str, Union[str, float]]]' = {
 class Entity():
     '''
     A physical entity with numerical value and unit information.
+    Entities from `createFromEntityString` are shared and frozen: changing their number raises a TypeError and
+    `+=` returns a new Entity instead of changing them in place. `copy()` gives a mutable Entity.
     '''
+    __slots__ = ("_number", "_unit", "_keyword", "_base", "_frozen")
     _number: 'Union[float, int]'
     _unit: str
     _keyword: 'Optional[str]'
-    _cache: 'Dict[str, Any]'
+    _base: 'Optional[Entity]'
+    _frozen: bool
 
     def __init__(self, number: 'Union[float, int]', unit: str, keyword: Optional[str] = None) -> None:
         self._number = number
         self._unit = unit
         self._keyword = keyword
-        self._cache = {}
+        self._base = None
+        self._frozen = False
 
     @property
     def number(self) -> 'Union[float, int]':
@@ -80,7 +91,10 @@ class Entity():
     
     @number.setter
     def number(self, number: 'Union[float, int]') -> None:
+        if self._frozen:
+            raise TypeError(f"Entity {self} is shared and can't be changed, change a copy of it instead")
         self._number = number
+        self._base = None
 
     @property
     def unit(self) -> str:
@@ -90,19 +104,27 @@ class Entity():
     def keyword(self) -> Optional[str]:
         return self._keyword or None
 
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
 
     def copy(self) -> 'Entity':
         return Entity(self.number, self.unit, self.keyword)
 
+    def _freeze(self) -> 'Entity':
+        self._frozen = True
+        return self
+
     def getBaseUnitEntity(self) -> 'Entity':
         '''returns <Entity> An entity of the same value, but scaled to the base unit. Returns the entity itself if it is already in the base unit.'''
-        if not 'baseUnitEntity' in self._cache.keys():
+        if self._base is None:
             if self.unit in unitConversions.keys():
                 baseUnit, factor = unitConversions[self.unit].values()
-                self._cache["baseUnitEntity"] = Entity(self.number * factor, baseUnit, self.keyword) # type: ignore
+                self._base = Entity(self.number * factor, baseUnit, self.keyword) # type: ignore
+                self._base._frozen = self._frozen
             else:
-                self._cache["baseUnitEntity"] = self
-        return self._cache["baseUnitEntity"]
+                self._base = self
+        return self._base
 
     def __add__(self, o: 'Union[Entity, float, int]') -> 'Entity':
         if not isinstance(o, (Entity, float, int)):
@@ -112,6 +134,8 @@ class Entity():
         return new
     
     def __iadd__(self, o: 'Union[Entity, float, int]') -> 'Entity':
+        if self._frozen:
+            return self + o
         if isinstance(o, Entity):
             if self.unit != o.unit:
                 raise TypeError(f"Can't add Entity of type {self.unit} and {o.unit}")
@@ -144,14 +168,20 @@ class Entity():
 
     @classmethod
     def createFromEntityString(cls, entityString: str) -> 'Entity':
-        if entityString in KEYWORDS.keys():
-            return Entity(KEYWORDS[entityString], "%", entityString)
-
-        try:
-            temp = re.compile("^([\d.-]+)(.*)$").match(entityString)
-            if temp is None:
-                raise ValueError()
-            numberString, unitString = temp.groups()
-            return Entity(float(numberString), unitString)
-        except:
-            raise ValueError(f"'{entityString}'' is not a vaild entity string.")
+        '''Returns a shared, frozen Entity, equal strings give the same instance (see PARSE_CACHE_SIZE).'''
+        return _parse(entityString)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(entityString: str) -> Entity:
+    if entityString in KEYWORDS.keys():
+        return Entity(KEYWORDS[entityString], "%", entityString)._freeze()
+
+    match = _ENTITY_PATTERN.match(entityString)
+    try:
+        if match is None:
+            raise ValueError()
+        numberString, unitString = match.groups()
+        return Entity(float(numberString), unitString)._freeze()
+    except ValueError:
+        raise ValueError(f"'{entityString}'' is not a vaild entity string.")
@@ -0,0 +1,133 @@
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from .Fixture import Fixture
+    from .Manufacturer import Manufacturer
+    from .Mode import Mode
+
+
+class ModeSummary():
+    '''Name and channel count of a fixture's mode, as stored in the fixture index.'''
+    _jsonObject: 'dict[str, Any]'
+    _fixture: 'FixtureSummary'
+
+    def __init__(self, jsonObject: 'dict[str, Any]', fixture: 'FixtureSummary') -> None:
+        self._jsonObject = jsonObject
+        self._fixture = fixture
+
+    def __str__(self) -> str:
+        return f"ModeSummary <{self.name}>"
+
+    def __format__(self, format_spec: str) -> str:
+        return self.__str__()
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _get_fixture(self) -> 'FixtureSummary':
+        return self._fixture
+
+    def _get_name(self) -> str:
+        return self._jsonObject["name"]
+
+    def _get_shortName(self) -> str:
+        return self._jsonObject.get("shortName", self.name)
+
+    def _get_channelCount(self) -> int:
+        return self._jsonObject["channels"]
+
+    def _get_mode(self) -> 'Mode':
+        '''The real Mode, loading the fixture if necessary.'''
+        return next(mode for mode in self._fixture.fixture.modes if mode.name == self.name)
+
+    fixture: 'FixtureSummary' = property(_get_fixture)
+    name: str = property(_get_name)
+    shortName: str = property(_get_shortName)
+    channelCount: int = property(_get_channelCount)
+    mode: 'Mode' = property(_get_mode)
+
+
+class FixtureSummary():
+    '''
+    A lightweight stand-in for a Fixture, built from the fixture index.
+    The full fixture definition is only loaded on first access of `fixture`, e.g. when the fixture is patched.
+    '''
+    _manufacturer: 'Manufacturer'
+    _key: str
+    _jsonObject: 'dict[str, Any]'
+    _loader: 'Callable[[], Fixture]'
+    _fixture: 'Optional[Fixture]'
+    _cache: 'dict[str, Any]'
+
+    def __init__(self, manufacturer: 'Manufacturer', key: str, jsonObject: 'dict[str, Any]', loader: 'Callable[[], Fixture]') -> None:
+        self._manufacturer = manufacturer
+        self._key = key
+        self._jsonObject = jsonObject
+        self._loader = loader
+        self._fixture = None
+        self._cache = {}
+
+    @classmethod
+    def fromFixture(cls, fixture: 'Fixture') -> 'FixtureSummary':
+        summary = cls(fixture.manufacturer, fixture.key, FixtureSummary.summarize(fixture), lambda: fixture)
+        summary._fixture = fixture
+        return summary
+
+    @staticmethod
+    def summarize(fixture: 'Fixture') -> 'dict[str, Any]':
+        '''Returns: dict - The index entry of a fixture: name, categories and every mode with its channel count.'''
+        return {
+            "name": fixture.name,
+            "shortName": fixture.shortName,
+            "categories": fixture.categories,
+            "modes": [{"name": mode.name, "shortName": mode.shortName, "channels": len(mode.channelKeys)} for mode in fixture.modes]
+        }
+
+    def __str__(self) -> str:
+        return f"FixtureSummary <{self.name}>"
+
+    def __format__(self, format_spec: str) -> str:
+        return self.__str__()
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _get_manufacturer(self) -> 'Manufacturer':
+        return self._manufacturer
+
+    def _get_key(self) -> str:
+        return self._key
+
+    def _get_name(self) -> str:
+        return self._jsonObject["name"]
+
+    def _get_shortName(self) -> str:
+        return self._jsonObject.get("shortName", self.name)
+
+    def _get_categories(self) -> 'list[str]':
+        return self._jsonObject.get("categories", ["Other"])
+
+    def _get_modes(self) -> 'list[ModeSummary]':
+        if not "modes" in self._cache.keys():
+            self._cache["modes"] = [ModeSummary(jsonMode, self) for jsonMode in self._jsonObject.get("modes", [])]
+        return self._cache["modes"]
+
+    def _get_isLoaded(self) -> bool:
+        return self._fixture is not None
+
+    def _get_fixture(self) -> 'Fixture':
+        if self._fixture is None:
+            self._fixture = self._loader()
+        return self._fixture
+
+    def getModeByName(self, modeName: str) -> 'Optional[ModeSummary]':
+        return next((mode for mode in self.modes if mode.name == modeName), None)
+
+    manufacturer: 'Manufacturer' = property(_get_manufacturer)
+    key: str = property(_get_key)
+    name: str = property(_get_name)
+    shortName: str = property(_get_shortName)
+    categories: 'list[str]' = property(_get_categories)
+    modes: 'list[ModeSummary]' = property(_get_modes)
+    isLoaded: bool = property(_get_isLoaded)
+    fixture: 'Fixture' = property(_get_fixture)
@@ -0,0 +1,140 @@
+from .Entity import Entity
+from .WheelSlot import WheelSlot
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .CoarseChannel import CoarseChannel
+
+
+# LampState attributes that select a discrete step of a channel instead of a continuous value
+SLOT_ATTRIBUTES = ("Gobo", "Gobo2", "Slot", "Slot2", "Prism")
+
+
+class SlotTable():
+    '''
+    The DMX values of the discrete steps of one channel, e.g. wheel slots or prism on/off, by every key a step can
+    be referred to with: slot number, slot name (case-insensitive, with and without the type prefix), resource key
+    and slot type, and "on"/"off" (or a number above/equal to 0) for prisms.
+    Built once from the channel's capabilities, so looking up a beam value never scans capabilities or wheels.
+    Decoding maps a DMX value back to the step's name ("on"/"off" for prisms), which get accepts again.
+    '''
+    _channel: 'CoarseChannel'
+    _attribute: str
+    _values: 'dict[Union[str, float], int]'
+    # the DMX ranges (highest resolution) of every step by start, with the name a decoded value gets
+    _starts: 'list[int]'
+    _ends: 'list[int]'
+    _names: 'list[str]'
+
+    def __init__(self, channel: 'CoarseChannel', attribute: str) -> None:
+        self._channel = channel
+        self._attribute = attribute
+        self._values = {}
+        steps: 'list[tuple[int, int, str]]' = []
+        for cap in channel.capabilities:
+            dmx = int(cap.dmxRange.start)
+            name = None
+            if cap.type == "WheelSlot" and cap.slotNumber and cap.slotNumber[0].number == cap.slotNumber[1].number:
+                if len(cap.wheels) != 1 or cap.wheels[0] is None:
+                    continue
+                slot = cap.wheelSlot[0]
+                self._add(cap.slotNumber[0].number, dmx)
+                for key in self._slotKeys(slot):
+                    self._add(key, dmx)
+                name = self._slotName(slot)
+                if attribute == "Prism":
+                    name = "off" if slot.type == "Open" else "on"
+                    self._add(name, dmx)
+                    if slot.facets is not None:
+                        self._add(float(slot.facets), dmx)
+            elif attribute == "Prism" and cap.type == "Prism":
+                name = "on"
+                self._add(name, dmx)
+            elif attribute == "Prism" and cap.type == "NoFunction":
+                name = "off"
+                self._add(name, dmx)
+            if name is not None:
+                steps.append((dmx, int(cap.dmxRange.end), name))
+        steps.sort(key=lambda step: step[0])
+        self._starts, self._ends, self._names = [list(column) for column in zip(*steps)] if steps else ([], [], [])
+
+    def _add(self, key: 'Union[str, float]', dmx: int) -> None:
+        # the first capability wins, later ones (e.g. shaking the same slot) keep their own DMX range
+        self._values.setdefault(key.lower() if isinstance(key, str) else float(key), dmx)
+
+    @staticmethod
+    def _slotKeys(slot: WheelSlot) -> 'list[str]':
+        keys = [slot.type]
+        if slot.name:
+            keys.append(slot.name)
+        if slot.rawName:
+            keys.append(slot.rawName)
+        if slot.resource is not None:
+            keys.append(getattr(slot.resource, "key", slot.resource))
+        return keys
+
+    @staticmethod
+    def _slotName(slot: WheelSlot) -> str:
+        '''The name a decoded slot gets: the fixture's own name for it (e.g. "Star"), else the generated one (e.g. "Gobo dots").'''
+        return slot.rawName or slot.name
+
+    def _get_channel(self) -> 'CoarseChannel':
+        return self._channel
+
+    def _get_attribute(self) -> str:
+        return self._attribute
+
+    def _get_keys(self) -> 'list[Union[str, float]]':
+        return list(self._values.keys())
+
+    channel: 'CoarseChannel' = property(_get_channel)
+    attribute: str = property(_get_attribute)
+    keys: 'list[Union[str, float]]' = property(_get_keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"SlotTable <{self._channel.name}: {self._attribute}, {len(self)} keys>"
+
+    def get(self, value: 'Union[Entity, str, float, int]', resolution: 'Optional[int]' = None) -> 'Optional[int]':
+        '''Returns: Optional[int] - The DMX value (in the channel's highest resolution by default) of a slot key, None if the channel has no such step.'''
+        if isinstance(value, Entity):
+            value = value.keyword if value.keyword else value.number
+        if isinstance(value, str):
+            dmx = self._values.get(value.lower())
+        else:
+            dmx = self._values.get(float(value))
+            if dmx is None and self._attribute == "Prism":
+                dmx = self._values.get("on" if value > 0 else "off")
+        if dmx is None or resolution is None:
+            return dmx
+        self._channel.ensureProperResolution(resolution)
+        return dmx >> 8 * (self._channel.maxResolution - resolution)
+
+    def _shift(self, resolution: 'Optional[int]') -> int:
+        if resolution is None:
+            return 0
+        self._channel.ensureProperResolution(resolution)
+        return 8 * (self._channel.maxResolution - resolution)
+
+    def decode(self, dmxValue: int, resolution: 'Optional[int]' = None) -> 'Optional[str]':
+        '''Returns: Optional[str] - The name of the step a DMX value (in the channel's highest resolution by default) selects, None outside of all steps.'''
+        dmxValue <<= self._shift(resolution)
+        i = bisect_right(self._starts, dmxValue) - 1
+        if i < 0 or dmxValue > self._ends[i]:
+            return None
+        return self._names[i]
+
+    def decodeMany(self, dmxValues: 'Union[Sequence[int], np.ndarray]', resolution: 'Optional[int]' = None) -> 'list[Optional[str]]':
+        '''Returns: list[Optional[str]] - decode for many DMX values, with one vectorized lookup.'''
+        dmxValues = np.left_shift(np.asarray(dmxValues, dtype=np.int64), self._shift(resolution))
+        if not self._starts:
+            return [None] * len(dmxValues)
+        rows = np.searchsorted(self._starts, dmxValues, side="right") - 1
+        valid = (rows >= 0) & (dmxValues <= np.asarray(self._ends)[np.maximum(rows, 0)])
+        return [self._names[row] if ok else None for row, ok in zip(rows.tolist(), valid.tolist())]
@@ -150,8 +150,7 @@ class WheelSlot():
         if not "name" in self._cache.keys():
             nameFunction = namePerType[self.type] if self.type in namePerType.keys(
             ) else namePerType["Default"]
-            name = nameFunction(
-                self, None if self.isSplitSlot else self._jsonObject.get("name"))
+            name = nameFunction(self, self.rawName)
 
             if name == None:
                 typeName = re.sub(
@@ -163,6 +162,10 @@ class WheelSlot():
 
         return self._cache["name"]
 
+    def _get_rawName(self) -> 'Optional[str]':
+        '''The name given in the fixture definition, None for unnamed and split slots (unlike name, nothing is generated).'''
+        return None if self.isSplitSlot else self._jsonObject.get("name")
+
     def _get_colors(self) -> 'Optional[list[str]]':
         if not "colors" in self._cache.keys():
             fixedColors = {
@@ -218,6 +221,7 @@ class WheelSlot():
     nthOfType: int = property(_get_nthOfType)
     resource: 'Optional[Union[Resource, str]]' = property(_get_resource)
     name: str = property(_get_name)
+    rawName: 'Optional[str]' = property(_get_rawName)
     colors: 'Optional[list[str]]' = property(_get_colors)
     colorTemperature: 'Optional[Entity]' = property(_get_colorTemperature)
     facets: 'Optional[Number]' = property(_get_facets)
@@ -1,9 +1,11 @@
 from .AbstractChannel import AbstractChannel
 from .Capability import Capability
+from .CapabilityEncoder import CapabilityEncoder
 from .CoarseChannel import CoarseChannel
 from .Entity import Entity
 from .FineChannel import FineChannel
 from .Fixture import Fixture
+from .FixtureSummary import FixtureSummary, ModeSummary
 from .Manufacturer import Manufacturer
 from .Matrix import Matrix
 from .Meta import Meta
@@ -12,6 +14,7 @@ from .NullChannel import NullChannel
 from .Physical import Physical
 from .Range import Range
 from .Resource import Resource
+from .SlotTable import SlotTable
 from .SwitchingChannel import SwitchingChannel
 from .TemplateChannel import TemplateChannel
 from .Wheel import Wheel
@@ -48,5 +51,5 @@ def getAllFixtures(ofl: str) -> 'dict[str, list[Fixture]]':
     return fixturesByManu
 
 
-__all__ = ["AbstractChannel", "Capability", "CoarseChannel", "Entity", "FineChannel", "Fixture", "Manufacturer", "Matrix",
-           "Meta", "Mode", "NullChannel", "Physical", "Range", "Resource", "SwitchingChannel", "TemplateChannel", "Wheel", "WheelSlot", "DmxScaler"]
+__all__ = ["AbstractChannel", "Capability", "CapabilityEncoder", "CoarseChannel", "Entity", "FineChannel", "Fixture", "FixtureSummary", "Manufacturer", "Matrix",
+           "Meta", "Mode", "ModeSummary", "NullChannel", "Physical", "Range", "Resource", "SlotTable", "SwitchingChannel", "TemplateChannel", "Wheel", "WheelSlot", "DmxScaler"]
@@ -1,5 +1,6 @@
 
 class Address():
+    '''A DMX start address, immutable so it can be used in sets and as a key (e.g. by Patch).'''
     _universe: int
     _address: int
 
@@ -11,18 +12,11 @@ class Address():
     def universe(self) -> int:
         return self._universe
 
-    @universe.setter
-    def universe(self, universe: int) -> None:
-        self._universe = universe
-
     @property
     def address(self) -> int:
         return self._address
 
-    @address.setter
-    def address(self, address: int) -> None:
-        self._address = address
-    
+
     def __lt__(self, o: object) -> bool:
         if not isinstance(o, Address):
             return NotImplemented
@@ -33,6 +27,9 @@ class Address():
             return NotImplemented
         return self.universe == o.universe and self.address == o.address
 
+    def __hash__(self) -> int:
+        return hash((self._universe, self._address))
+
     def __str__(self) -> str:
         return f"{self.universe}:{self.address}"
     
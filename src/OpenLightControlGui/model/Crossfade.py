@@ -0,0 +1,98 @@
+from typing import TYPE_CHECKING, Dict, Iterable, Literal
+
+import numpy as np
+
+from OpenLightControlGui.model.UniverseBuffer import UniverseBuffer, UNIVERSE_SIZE
+
+if TYPE_CHECKING:
+    from OpenLightControlGui.model.Lamp import Lamp
+
+_curve = Literal["linear", "scurve", "snap"]
+
+
+class Crossfade():
+    '''
+    A fade between two UniverseBuffers, prepared once so that every step is one array interpolation.
+    Only slots that differ take part, 16 bit channels fade as one value and channels that cannot crossfade snap at the start.
+    '''
+    LINEAR = 0
+    SCURVE = 1
+    SNAP = 2
+    CURVES: 'Dict[str, int]' = {"linear": LINEAR, "scurve": SCURVE, "snap": SNAP}
+
+    _base: UniverseBuffer
+    _index: 'np.ndarray'
+    _start: 'np.ndarray'
+    _delta: 'np.ndarray'
+    _curve: 'np.ndarray'
+    _coarse: 'np.ndarray'
+    _fine: 'np.ndarray'
+    _start16: 'np.ndarray'
+    _delta16: 'np.ndarray'
+    _curve16: 'np.ndarray'
+
+    def __init__(self, start: UniverseBuffer, end: UniverseBuffer, lamps: 'Iterable[Lamp]' = (), curve: '_curve' = "linear") -> None:
+        if curve not in Crossfade.CURVES:
+            raise ValueError(f"unknown fade curve {curve}, expected one of {', '.join(Crossfade.CURVES.keys())}")
+        self._base = start.copy()
+        own, other = self._base._align(end)
+        self._base._touched[own] |= end._touched[other]
+        startdata = self._base.data.reshape(-1)
+        enddata = np.zeros_like(self._base.data)
+        enddata[own] = end._data[other]
+        enddata = enddata.reshape(-1)
+
+        plans = [lamp.patchPlan for lamp in {id(lamp): lamp for lamp in lamps}.values()]
+        curves = np.full(len(startdata), Crossfade.CURVES[curve], dtype=np.uint8)
+        snap = self._flatIndex([plan.snap.universes for plan in plans], [plan.snap.slots for plan in plans])
+        curves[snap] = Crossfade.SNAP
+
+        coarse = self._flatIndex([plan.finePairs[0] for plan in plans], [plan.finePairs[1] for plan in plans])
+        fine = self._flatIndex([plan.finePairs[0] for plan in plans], [plan.finePairs[2] for plan in plans])
+        paired = np.zeros(len(startdata), dtype=bool)
+        paired[coarse] = True
+        paired[fine] = True
+        start16 = startdata[coarse].astype(np.int64) << 8 | startdata[fine]
+        end16 = enddata[coarse].astype(np.int64) << 8 | enddata[fine]
+        changed = start16 != end16
+        self._coarse = coarse[changed]
+        self._fine = fine[changed]
+        self._start16 = start16[changed].astype(np.float64)
+        self._delta16 = end16[changed] - self._start16
+        self._curve16 = curves[self._coarse]
+
+        self._index = np.flatnonzero((startdata != enddata) & ~paired)
+        self._start = startdata[self._index].astype(np.float64)
+        self._delta = enddata[self._index] - self._start
+        self._curve = curves[self._index]
+
+    def _flatIndex(self, universes: 'Iterable[np.ndarray]', slots: 'Iterable[np.ndarray]') -> 'np.ndarray':
+        '''Returns: np.ndarray - Indices into the flattened base buffer, leaving out universes that are in neither buffer.'''
+        universes = np.concatenate([np.zeros(0, dtype=np.int64)] + list(universes))
+        slots = np.concatenate([np.zeros(0, dtype=np.int64)] + list(slots))
+        known = np.isin(universes, self._base.universes)
+        rows = self._base.rowsOf(universes[known])
+        return rows * UNIVERSE_SIZE + slots[known]
+
+    @staticmethod
+    def weights(ti: float) -> 'np.ndarray':
+        '''Returns: np.ndarray - The progress of every curve at ti, indexed by curve.'''
+        return np.array([ti, ti * ti * (3 - 2 * ti), 1.0 if ti > 0 else 0.0])
+
+    def at(self, ti: float) -> UniverseBuffer:
+        '''Returns: UniverseBuffer - The fade at ti between 0 (start) and 1 (end).'''
+        weights = Crossfade.weights(max(0.0, min(1.0, ti)))
+        result = self._base.copy()
+        data = result.data.reshape(-1)
+        data[self._index] = np.rint(self._start + self._delta * weights[self._curve]).astype(np.uint8)
+        values = np.rint(self._start16 + self._delta16 * weights[self._curve16]).astype(np.int64)
+        data[self._coarse] = values >> 8
+        data[self._fine] = values & 0xff
+        return result
+
+    def __len__(self) -> int:
+        '''The number of channels taking part in the fade.'''
+        return len(self._index) + len(self._coarse)
+
+    def __repr__(self) -> str:
+        return f"Crossfade({len(self)} channels in {self._base.universes})"
@@ -1,5 +1,9 @@
-from typing import Dict, Iterable, List, Union, Optional
+from typing import Dict, Iterable, List, Tuple, Union, Optional
+from OpenLightControlGui.model.Lamp import Lamp
+from OpenLightControlGui.model.MergeEngine import MergeEngine
 from OpenLightControlGui.model.State import State
+from OpenLightControlGui.model.UniverseBuffer import UniverseBuffer
+from OpenLightControlGui.model.VersionedDict import nextVersion
 
 class Cue():
     _states: 'List[State]'
@@ -7,9 +11,13 @@ class Cue():
     _num: 'Optional[int]' = None
     _duration: int = 0
     _fadein: 'Optional[int]' = None
+    _version: int = 0
+    _rendered: 'Optional[Tuple[Tuple[int, float, str], UniverseBuffer]]' = None
+    _mergeEngine: MergeEngine
 
     def __init__(self, states: 'Union[State, Iterable[State]]', name: 'Optional[str]' = None, num: 'Optional[int]' = None) -> None:
         self._states = []
+        self._mergeEngine = MergeEngine()
         if isinstance(states, Iterable):
             for state in states:
                 self.addState(state)
@@ -22,10 +30,12 @@ class Cue():
     
     def addState(self, state: State) -> None:
         self._states.append(state)
+        self._version = nextVersion()
     
     def removeState(self, state: State) -> None:
         if state in self._states:
             self._states.pop(self._states.index(state))
+            self._version = nextVersion()
 
     @property
     def states(self) -> 'List[State]':
@@ -34,6 +44,10 @@ class Cue():
     def getStates(self) -> 'List[State]':
         return self.states
 
+    @property
+    def lamps(self) -> 'List[Lamp]':
+        return [lamp for state in self._states for lamp in state.group.getLamps()]
+
     @property
     def name(self) -> 'Optional[str]':
         return self._name
@@ -66,6 +80,15 @@ class Cue():
     def fade(self, ms: int) -> None:
         self._fadein = ms
 
+    @property
+    def version(self) -> int:
+        return max([self._version] + [state.version for state in self._states])
+
+    @property
+    def stamp(self) -> int:
+        '''The LTP timestamp, see State.stamp.'''
+        return max([self._version] + [state.stamp for state in self._states])
+
     def __repr__(self) -> str:
         if self.name:
             return self.name
@@ -74,20 +97,18 @@ class Cue():
         return f"Cue of {self.states}"
 
     def getDmxState(self, faderval: float = 1, fadertype: str = "Intensity") -> 'Dict[int, List[int]]':
-        def combine_universes(base: 'Dict[int, List[int]]', adding: 'Dict[int, List[int]]'):
-            for num, universe in adding.items():
-                if not base.get(num):
-                    base[num] = universe
-                else:
-                    for i, channel in enumerate(universe):
-                        base[num][i] = max(base[num][i], channel)
-
-        universes: 'Dict[int, List[int]]' = {}
+        return self.getDmxBuffer(faderval, fadertype).toDict()
 
+    def getDmxBuffer(self, faderval: float = 1, fadertype: str = "Intensity") -> UniverseBuffer:
+        '''The result is cached until the version changes, so it must not be modified.'''
+        key = (self.version, faderval, fadertype)
+        if self._rendered is not None and self._rendered[0] == key:
+            return self._rendered[1]
         if fadertype != "Intensity":
             print("!WARNING!: fadertype not yet supported")
 
-        for state in self.states:
-            combine_universes(universes, state.getDmxState(faderval))
+        self._mergeEngine.setLamps(self.lamps)
+        universes = self._mergeEngine.merge([state.getDmxBuffer(faderval) for state in self.states], [state.stamp for state in self.states])
 
+        self._rendered = (key, universes)
         return universes
@@ -1,10 +1,20 @@
 from typing import Dict, Iterable, Iterator, List, Optional
+import threading
 import time
 
+from OpenLightControlGui.model.Crossfade import Crossfade, _curve
 from OpenLightControlGui.model.Cue import Cue
+from OpenLightControlGui.model.Lamp import Lamp
+from OpenLightControlGui.model.UniverseBuffer import UniverseBuffer
+from OpenLightControlGui.model.VersionedDict import nextVersion
 from PyQt5.QtCore import QTimer, QObject, pyqtSignal
 
 class Cuelist(QObject):
+    '''
+    Plays its cues one after another with crossfades.
+    The output engine reads the output from its own thread, which also advances a running fade. All fade and output
+    state is guarded by one lock, so the GUI thread (go, the fader) and the engine never step the same fade at once.
+    '''
     _cues: 'List[Cue]'
     _name: str
     _currCue: int = 0
@@ -14,23 +24,29 @@ class Cuelist(QObject):
     _fadetimer: QTimer
     _fadestart: int = 0
     _fadetime: int = 0
+    _fading: bool = False
+    _crossfade: 'Optional[Crossfade]' = None
+    _fadeCurve: '_curve' = "linear"
     _cuetimer: QTimer
 
     currentCueChanged = pyqtSignal(int)
 
-    _lastdmxstate: 'Dict[int, List[int]]'
-    _nextdmxstate: 'Dict[int, List[int]]'
-    _dmxstate: 'Dict[int, List[int]]'
+    _lastdmxstate: UniverseBuffer
+    _nextdmxstate: UniverseBuffer
+    _dmxstate: UniverseBuffer
+    _version: int = 0
 
     _faderval: float = 1.0
     _paused: bool = False
+    _lock: 'threading.RLock'
 
     def __init__(self, cues: 'Iterable[Cue]', name: 'Optional[str]' = None) -> None:
         super().__init__()
+        self._lock = threading.RLock()
         self._cues = []
-        self._lastdmxstate = {}
-        self._nextdmxstate = {}
-        self._dmxstate = {}
+        self._lastdmxstate = UniverseBuffer()
+        self._nextdmxstate = UniverseBuffer()
+        self._dmxstate = UniverseBuffer()
         for i, cue in enumerate(cues):
             self.addCue(cue, i)
         if name:
@@ -51,6 +67,10 @@ class Cuelist(QObject):
     def getCue(self, num: int) -> Optional[Cue]:
         return self._cues[num] if num < len(self._cues) else None
 
+    @property
+    def lamps(self) -> 'List[Lamp]':
+        return [lamp for cue in self._cues for lamp in cue.lamps]
+
     def _recalc(self):
         for i, cue in enumerate(self._cues):
             if not cue.name:
@@ -84,6 +104,17 @@ class Cuelist(QObject):
     def standardDuration(self, ms: int) -> None:
         self._standardDuration = ms
     
+    @property
+    def fadeCurve(self) -> '_curve':
+        '''The curve of all crossfading channels, channels that cannot crossfade always snap.'''
+        return self._fadeCurve
+
+    @fadeCurve.setter
+    def fadeCurve(self, curve: '_curve') -> None:
+        if curve not in Crossfade.CURVES:
+            raise ValueError(f"unknown fade curve {curve}, expected one of {', '.join(Crossfade.CURVES.keys())}")
+        self._fadeCurve = curve
+
     @property
     def faderval(self) -> float:
         return self._faderval
@@ -91,7 +122,7 @@ class Cuelist(QObject):
     @faderval.setter
     def faderval(self, val: float) -> None:
         self._faderval = val
-        self._dmxstate = self._cues[self.currCue].getDmxState(faderval=self._faderval)
+        self._setDmxState(self._cues[self.currCue].getDmxBuffer(faderval=self._faderval))
 
     def back(self):
         try:
@@ -141,14 +172,25 @@ class Cuelist(QObject):
                 self._cuetimer.timeout.connect(self.go) # type: ignore
             self._cuetimer.start(fadetime +  duration)
         if fadetime == 0:
-            self._nextdmxstate = {}
-            self._dmxstate = nextcue.getDmxState(faderval=self._faderval)
+            # a running fade would overwrite the snapped cue on its next step, also from the output engine thread
+            self._stopFade()
+            with self._lock:
+                self._nextdmxstate = UniverseBuffer()
+                self._setDmxState(nextcue.getDmxBuffer(faderval=self._faderval))
         else:
-            self._fadetime = fadetime
-            self._lastdmxstate = curcue.getDmxState(faderval=self._faderval)
-            self._nextdmxstate = nextcue.getDmxState(faderval=self._faderval)
+            self._stopFade()
+            lastdmxstate = curcue.getDmxBuffer(faderval=self._faderval)
+            nextdmxstate = nextcue.getDmxBuffer(faderval=self._faderval)
+            crossfade = Crossfade(lastdmxstate, nextdmxstate, curcue.lamps + nextcue.lamps, self._fadeCurve)
+            # the whole fade is swapped in at once, the engine thread never sees a half set up one
+            with self._lock:
+                self._fadetime = fadetime
+                self._lastdmxstate = lastdmxstate
+                self._nextdmxstate = nextdmxstate
+                self._crossfade = crossfade
+                self._fadestart = time.time_ns() // 1000000
+                self._fading = True
             self._fadetimer.timeout.connect(self._fade) # type: ignore
-            self._fadestart = time.time_ns() // 1000000
             self._fadetimer.start(10)
         self._currCue = num
         self.currentCueChanged.emit(self.currCue)
@@ -162,36 +204,70 @@ class Cuelist(QObject):
 
     def stop(self):
         self._cuetimer.stop()
+        self._stopFade()
+        self._setDmxState(UniverseBuffer())
+
+    def _stopFade(self):
+        with self._lock:
+            self._fading = False
         self._fadetimer.stop()
-        self._dmxstate = {}
+        try:
+            self._fadetimer.timeout.disconnect(self._fade)
+        except:
+            pass
 
     def _fade(self):
-        def fadeval(ti: float, f: int = 0, t: int = 0) -> int:
-            return int(f * (1-ti) + t * ti)
-        
-        x = (time.time_ns() // 1000000 - self._fadestart)
-        ti = x / self._fadetime
-        if x > self._fadetime:
-            ti = 1
-            self._fadetimer.stop()
-            self._fadetimer.timeout.disconnect(self._fade)
-        
-        uni_num = list(set([*self._lastdmxstate.keys(), *self._nextdmxstate.keys()]))
-        unis = {}
-        for uni in uni_num:
-            if not unis.get(uni):
-                unis[uni] = [0]*512
-            l = self._lastdmxstate.get(uni, [0]*512)
-            n = self._nextdmxstate.get(uni, [0]*512)
-            for i in range(len(l)):
-                unis[uni][i] = fadeval(ti, l[i], n[i]) if l[i] or n[i] else 0
-        self._dmxstate = unis
+        self._updateFade()
+        if not self._fading:
+            self._stopFade()
+
+    def _updateFade(self):
+        # may also be called from the output engine thread, so it must not touch the timers
+        with self._lock:
+            if not self._fading or self._crossfade is None:
+                return
+            x = (time.time_ns() // 1000000 - self._fadestart)
+            ti = x / self._fadetime
+            if x > self._fadetime:
+                ti = 1
+                self._fading = False
+
+            state = self._crossfade.at(ti)
+            if state != self._dmxstate:
+                self._setDmxState(state)
+
+    def _setDmxState(self, state: UniverseBuffer) -> None:
+        with self._lock:
+            self._dmxstate = state
+            self._version = nextVersion()
+
+    @property
+    def version(self) -> int:
+        '''Changes whenever the output of the cuelist changes, advancing a running fade first.'''
+        with self._lock:
+            if self._fading:
+                self._updateFade()
+            return self._version
+
+    @property
+    def stamp(self) -> int:
+        '''The LTP timestamp, the output of a cuelist only changes by going to a cue or fading.'''
+        return self.version
 
     def getDmxState(self) -> 'Dict[int, List[int]]':
-        return self._dmxstate
+        return self.getDmxBuffer().toDict()
+
+    def getDmxBuffer(self) -> UniverseBuffer:
+        with self._lock:
+            if self._fading:
+                self._updateFade()
+            return self._dmxstate
 
     def isRunning(self) -> bool:
-        return self.getDmxState() != {}
+        return self._fading or bool(self.getDmxBuffer())
+
+    def isFading(self) -> bool:
+        return self._fading
 
     def isPaused(self) -> bool:
         return self._paused
@@ -0,0 +1,120 @@
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from OpenLightControlGui.fixture_model.CoarseChannel import CoarseChannel
+from OpenLightControlGui.fixture_model.Entity import Entity
+from OpenLightControlGui.fixture_model.SlotTable import SlotTable
+from OpenLightControlGui.model.Cue import Cue
+from OpenLightControlGui.model.Lamp import Lamp
+from OpenLightControlGui.model.LampState import LampState
+from OpenLightControlGui.model.State import State
+from OpenLightControlGui.model.UniverseBuffer import UniverseBuffer
+
+CATEGORY_STATES = {
+    "Intensity": LampState.IntensityState,
+    "Position": LampState.PositionState,
+    "Color": LampState.ColorState,
+    "Beam": LampState.BeamState,
+    "Maintenance": LampState.MaintenanceState,
+}
+
+
+class DmxDecoder():
+    '''
+    Turns DMX frames back into a LampState per lamp, e.g. to record incoming DMX or the output of a running cuelist
+    into cues, or to show what every lamp does from the raw bytes.
+    Lamps of the same mode are decoded together: one index into the frame gathers their bytes of an attribute and one
+    vectorized lookup in the channel's capability table (CoarseChannel.decodeMany) turns them into values.
+    Wheel slots and prism steps are decoded through the channel's SlotTable into the names rendering accepts, e.g.
+    "Star" or "on", other values of such channels (e.g. wheel rotation) through the capability tables.
+    Only slots that are touched in the frame are decoded.
+    '''
+
+    class Batch():
+        '''One attribute of all lamps of one mode, with the (universe, slot) of every byte per lamp.'''
+        category: str
+        attribute: str
+        channel: CoarseChannel
+        table: 'Optional[SlotTable]'
+        resolution: int
+        lamps: 'List[Lamp]'
+        universes: 'np.ndarray'
+        slots: 'np.ndarray'
+        shifts: 'np.ndarray'
+
+        def __init__(self, category: str, attribute: str, channel: CoarseChannel, lamps: 'List[Lamp]') -> None:
+            self.category = category
+            self.attribute = attribute
+            self.channel = channel
+            self.table = channel.getSlotTable(attribute)
+            self.lamps = lamps
+            targets = [lamp.patchPlan.targets[(category, attribute)] for lamp in lamps]
+            # targets list the bytes of the first address first, the decoder reads that one
+            self.resolution = int(targets[0].resolutions[0])
+            self.universes = np.stack([target.universes[:self.resolution] for target in targets])
+            self.slots = np.stack([target.slots[:self.resolution] for target in targets])
+            self.shifts = targets[0].shifts[:self.resolution]
+
+        def decode(self, buffer: UniverseBuffer) -> 'List[Tuple[Lamp, Union[Entity, str]]]':
+            present = np.isin(self.universes, buffer.universes).all(axis=1)
+            if not present.any():
+                return []
+            lamps = np.flatnonzero(present)
+            rows = buffer.rowsOf(self.universes[lamps].ravel()).reshape(len(lamps), self.resolution)
+            slots = self.slots[lamps]
+            touched = buffer.touched[rows, slots].all(axis=1)
+            lamps, rows, slots = lamps[touched], rows[touched], slots[touched]
+            values = np.left_shift(buffer.data[rows, slots].astype(np.int64), self.shifts).sum(axis=1)
+            decoded: 'List[Optional[Union[Entity, str]]]' = self.channel.decodeMany(self.attribute, values.tolist(), self.resolution) # type: ignore
+            if self.table is not None:
+                names = self.table.decodeMany(values, self.resolution)
+                decoded = [entity if name is None else name for name, entity in zip(names, decoded)]
+            return [(self.lamps[lamp], value) for lamp, value in zip(lamps.tolist(), decoded) if value is not None]
+
+    _lamps: 'Iterable[Lamp]'
+    _batches: 'List[DmxDecoder.Batch]'
+    _key: 'Optional[Tuple[int, Tuple[int, ...]]]' = None
+
+    def __init__(self, lamps: 'Iterable[Lamp]' = ()) -> None:
+        self._batches = []
+        self.setLamps(lamps)
+
+    def setLamps(self, lamps: 'Iterable[Lamp]') -> None:
+        '''The lamps to decode, a Patch is read again whenever its lamps change.'''
+        self._lamps = lamps
+        self._key = None
+
+    def _build(self) -> None:
+        lamps = [lamp for lamp in dict.fromkeys(self._lamps) if lamp.hasAddress]
+        key = (Lamp.patchVersion, tuple(id(lamp) for lamp in lamps))
+        if key == self._key:
+            return
+        self._key = key
+        byMode: 'Dict[int, List[Lamp]]' = {}
+        for lamp in lamps:
+            byMode.setdefault(id(lamp.mode), []).append(lamp)
+        self._batches = []
+        for group in byMode.values():
+            first = group[0]
+            for (category, attribute), channels in first.patchPlan.channels.items():
+                channel = first.channels[channels[min(channels.keys())]]
+                if category in CATEGORY_STATES and isinstance(channel, CoarseChannel) and (channel.getEncoders(attribute) or channel.getSlotTable(attribute)):
+                    self._batches.append(DmxDecoder.Batch(category, attribute, channel, group))
+
+    def decode(self, buffer: UniverseBuffer) -> 'Dict[Lamp, LampState]':
+        '''Returns: Dict[Lamp, LampState] - The attribute values of every lamp with at least one decodable (touched) attribute.'''
+        self._build()
+        values: 'Dict[Lamp, Dict[str, Dict[str, Union[Entity, str]]]]' = {}
+        for batch in self._batches:
+            for lamp, value in batch.decode(buffer):
+                values.setdefault(lamp, {}).setdefault(batch.category, {})[batch.attribute] = value
+        return {lamp: LampState(**{category: CATEGORY_STATES[category](vals) for category, vals in categories.items()}) # type: ignore
+                for lamp, categories in values.items()}
+
+    def record(self, buffer: UniverseBuffer, name: 'Optional[str]' = None, num: 'Optional[int]' = None) -> Cue:
+        '''Returns: Cue - A new cue with one State per decoded lamp.'''
+        return Cue([State(lamp, state) for lamp, state in self.decode(buffer).items()], name, num)
+
+    def __repr__(self) -> str:
+        return f"DmxDecoder({len(self._batches)} batches)"
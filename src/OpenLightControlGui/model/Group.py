@@ -1,11 +1,17 @@
-from typing import Iterable, List, Optional, Union
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+import weakref
 
 from OpenLightControlGui.model.Lamp import Lamp
+from OpenLightControlGui.model.VersionedDict import nextVersion
 
 class Group():
     _lamps: 'List[Union[Lamp, Group]]'
-    _removed_lamps: 'List[Lamp]'
+    _removed_lamps: 'Set[Lamp]'
     _name: str
+    # changes with this group and every nested group, which pass their changes up to the groups containing them
+    _version: int = 0
+    _parents: 'weakref.WeakValueDictionary[int, Group]'
+    _flat: 'Optional[Tuple[int, List[Lamp], Set[Lamp]]]' = None
 
     def __init__(self, lamps: 'Optional[Union[Lamp, Group, Iterable[Union[Lamp, Group]]]]' = None, *, name: str = None) -> None:
         if not name:
@@ -13,47 +19,78 @@ class Group():
         else:
             self._name = name
         self._lamps = []
-        self._removed_lamps = []
+        self._removed_lamps = set()
+        self._parents = weakref.WeakValueDictionary()
         if lamps:
-            if isinstance(lamps, Iterable):
+            if isinstance(lamps, (Lamp, Group)):
+                self.addItem(lamps)
+            else:
                 for lamp in lamps:
                     self.addItem(lamp)
-            else:
-                self.addItem(lamps)
 
     def addItem(self, item: 'Union[Lamp, Group]') -> None:
+        '''Adds a lamp or nested group. A lamp excluded from a nested group by removeItem is included there again, next to the new direct item.'''
         self._lamps.append(item)
+        if isinstance(item, Lamp):
+            self._removed_lamps.discard(item)
+        else:
+            item._parents[id(self)] = self
+        self._changed()
+
+    def _changed(self) -> None:
+        self._version = nextVersion()
+        for parent in list(self._parents.values()):
+            parent._changed()
 
     def addItems(self, items: 'Iterable[Union[Lamp, Group]]') -> None:
         for item in items:
             self.addItem(item)
 
     def removeItem(self, item: 'Union[Lamp, Group]') -> None:
+        '''Removes a direct item, or excludes a nested lamp. Lamps are matched by identity, not by address and mode.'''
         if item in self._lamps:
-            self._lamps.pop(self._lamps.index(item))
+            removed = self._lamps.pop(self._lamps.index(item))
+            if isinstance(removed, Group) and not any(other is removed for other in self._lamps):
+                removed._parents.pop(id(self), None)
+            self._changed()
         elif isinstance(item, Group):
             self.removeItems(item.lamps)
         elif isinstance(item, Lamp):
             if not item in self._removed_lamps:
-                self._removed_lamps.append(item)
+                self._removed_lamps.add(item)
+                self._changed()
 
     def removeItems(self, items: 'Iterable[Union[Lamp, Group]]') -> None:
         for item in items:
             self.removeItem(item)
 
-    @property
-    def lamps(self) -> 'List[Lamp]':
-        ret_list = []
+    def _flatten(self) -> 'Tuple[int, List[Lamp], Set[Lamp]]':
+        '''Returns: the version and the lamps of this and all nested groups, as list and set, cached until any of their versions changes.'''
+        version = self.version
+        if self._flat is not None and self._flat[0] == version:
+            return self._flat
+        ret_list: 'List[Lamp]' = []
         for item in self._lamps:
             if isinstance(item, Group):
-                ret_list.extend(item.lamps)
+                ret_list.extend(item._flatten()[1])
             else:
                 ret_list.append(item)
-        return [item for item in ret_list if not item in self._removed_lamps]
+        if self._removed_lamps:
+            ret_list = [item for item in ret_list if not item in self._removed_lamps]
+        self._flat = (version, ret_list, set(ret_list))
+        return self._flat
+
+    @property
+    def lamps(self) -> 'List[Lamp]':
+        return list(self._flatten()[1])
 
     def getLamps(self) -> 'List[Lamp]':
         return self.lamps
 
+    @property
+    def version(self) -> int:
+        return self._version
+
     @property
     def name(self) -> str:
         return self._name
@@ -73,8 +110,14 @@ class Group():
             return NotImplemented
         return self.lamps == o.lamps
 
+    def __iter__(self) -> 'Iterator[Lamp]':
+        return iter(self._flatten()[1])
+
+    def __contains__(self, lamp: object) -> bool:
+        return lamp in self._flatten()[2]
+
     def __len__(self) -> int:
-        return len(self.lamps)
+        return len(self._flatten()[1])
     
     def __bool__(self) -> bool:
         return len(self) > 0
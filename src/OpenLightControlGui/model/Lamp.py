@@ -1,16 +1,26 @@
-from typing import Any, Dict, List, Literal, Optional, Iterable,  Union
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Iterable,  Union
 from numbers import Number
 
 from OpenLightControlGui.model.Address import Address
+from OpenLightControlGui.model.PatchPlan import PatchPlan
+from OpenLightControlGui.model.VersionedDict import nextVersion
 from OpenLightControlGui.fixture_model import Fixture, Mode, AbstractChannel, CoarseChannel, FineChannel
 
+if TYPE_CHECKING:
+    from OpenLightControlGui.model.Patch import Patch
+
 _cap_types = Literal["Intensity", "Position", "Color", "Beam", "Maintenance"]
 
 class Lamp():
+    '''A patched fixture. Lamps compare and hash by identity, a Patch keeps their numbers and DMX slots unique.'''
     _address: 'List[Address]'
     _mode: Mode
     _number: Number
     _cache: 'Dict[str, Any]'
+    # the Patch this lamp is registered in, which has to approve and index every change of number, mode and address
+    _patch: 'Optional[Patch]' = None
+    # changes whenever any lamp is repatched, so renders depending on patch plans know to recompute
+    patchVersion: int = 0
 
     def __init__(self, number: Number, mode: Mode, address: Optional[Union[Address, Iterable[Address]]] = None) -> None:
         self._cache = {}
@@ -23,19 +33,30 @@ class Lamp():
                 self._address = [a for a in address]
         else:
             self._address = []
+        Lamp.patchVersion = nextVersion()
 
     @property
     def number(self) -> Number:
         return self._number
 
     @number.setter
-    def number(self, number = Number):
+    def number(self, number: Number):
+        if self._patch is not None:
+            self._patch._repatch(self, number, self._address, self.dmxRange)
         self._number = number
 
     @property
     def mode(self) -> Mode:
         return self._mode
 
+    @mode.setter
+    def mode(self, mode: Mode) -> None:
+        if self._patch is not None:
+            self._patch._repatch(self, self._number, self._address, len(mode.channels))
+        self._mode = mode
+        self._cache = {}
+        Lamp.patchVersion = nextVersion()
+
     @property
     def fixture(self) -> Fixture:
         return self.mode.fixture
@@ -51,17 +72,25 @@ class Lamp():
     @address.setter
     def address(self, address: 'Union[Address, Iterable[Address]]') -> None:
         if not isinstance(address, Iterable):
-            self._address = [address]
+            addresses = [address]
         else:
-            self._address = [a for a in address]
+            addresses = [a for a in address]
+        if self._patch is not None:
+            self._patch._repatch(self, self._number, addresses, self.dmxRange)
+        self._address = addresses
+        self._cache.pop("patchPlan", None)
+        Lamp.patchVersion = nextVersion()
 
     def add_address(self, address: 'Union[Address, Iterable[Address]]') -> None:
-        if not self.address:
-            self._address = []
         if not isinstance(address, Iterable):
-            self._address.append(address)
+            addresses = self._address + [address]
         else:
-            self._address.extend(address)
+            addresses = self._address + list(address)
+        if self._patch is not None:
+            self._patch._repatch(self, self._number, addresses, self.dmxRange)
+        self._address = addresses
+        self._cache.pop("patchPlan", None)
+        Lamp.patchVersion = nextVersion()
     
     @property
     def hasAddress(self) -> bool:
@@ -94,6 +123,15 @@ class Lamp():
                                 if not capabilities['Color']:
                                     capabilities['Color'] = {}
                                 capabilities['Color'][str(cap.color)] = channelnum # type: ignore
+                    if channel.type in ("Pan", "Tilt"):
+                        if not capabilities['Position']:
+                            capabilities['Position'] = {}
+                        capabilities['Position'][channel.type] = channelnum # type: ignore
+                    if channel.type in ("Gobo", "Prism", "Focus"):
+                        if not capabilities['Beam']:
+                            capabilities['Beam'] = {}
+                        beam = "Gobo2" if channel.type == "Gobo" and "Gobo" in capabilities['Beam'] else channel.type # type: ignore
+                        capabilities['Beam'].setdefault(beam, channelnum) # type: ignore
                 elif isinstance(channel, FineChannel):
                     if channel.coarseChannel.type == "Intensity":
                         if isinstance(capabilities["Intensity"], int):
@@ -109,15 +147,31 @@ class Lamp():
                                 capabilities['Color'][str(cap.color)] = { 1: capabilities['Color'][str(cap.color)], channel.resolution: channelnum } # type: ignore
                             elif isinstance(capabilities['Color'][str(cap.color)], dict):  # type: ignore
                                 capabilities['Color'][str(cap.color)][channel.resolution] = channelnum  # type: ignore
+                    if channel.coarseChannel.type in ("Pan", "Tilt") and capabilities['Position']:
+                        axis = channel.coarseChannel.type
+                        if isinstance(capabilities['Position'].get(axis), int): # type: ignore
+                            capabilities['Position'][axis] = { 1: capabilities['Position'][axis], channel.resolution: channelnum } # type: ignore
+                        elif isinstance(capabilities['Position'].get(axis), dict): # type: ignore
+                            capabilities['Position'][axis][channel.resolution] = channelnum # type: ignore
+                    if channel.coarseChannel.type in ("Gobo", "Prism", "Focus") and capabilities['Beam']:
+                        coarse = channel.coarseChannel
+                        beam = next((name for name, channels in capabilities['Beam'].items() # type: ignore
+                                     if self.channels[channels if isinstance(channels, int) else channels[1]] is coarse), None)
+                        if isinstance(capabilities['Beam'].get(beam), int): # type: ignore
+                            capabilities['Beam'][beam] = { 1: capabilities['Beam'][beam], channel.resolution: channelnum } # type: ignore
+                        elif isinstance(capabilities['Beam'].get(beam), dict): # type: ignore
+                            capabilities['Beam'][beam][channel.resolution] = channelnum # type: ignore
             
             self._cache["capabilities"] = capabilities
 
         return self._cache["capabilities"]
 
-    def __eq__(self, o: object) -> bool:
-        if not isinstance(o, Lamp):
-            return NotImplemented
-        return self.address == o.address and self.mode == o.mode
+    @property
+    def patchPlan(self) -> PatchPlan:
+        if not "patchPlan" in self._cache.keys():
+            self._cache["patchPlan"] = PatchPlan(self)
+
+        return self._cache["patchPlan"]
 
     def __len__(self) -> int:
         return self.dmxRange
@@ -1,339 +1,371 @@
 from OpenLightControlGui.model.Effect import Effect
+from OpenLightControlGui.model.VersionedDict import latestVersion, nextVersion
 from OpenLightControlGui.fixture_model import Entity
 
-from typing import Dict, Iterable, Literal, Optional, Union, get_type_hints
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Union, get_args
+
+
+_value = Union[Entity, str, bool]
+
+
+class _Vals(dict):
+    '''The values of a BaseState as a dict, which writes every change through to the state.'''
+    __slots__ = ("_state",)
+
+    def __init__(self, state: 'LampState.BaseState') -> None:
+        super().__init__(state.items())
+        self._state = state
+
+    def __setitem__(self, key: str, val: '_value') -> None:
+        super().__setitem__(key, val)
+        self._state[key] = val
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._state[key] = None
+
+    def update(self, *args: Any, **kwargs: '_value') -> None:
+        changes = dict(*args, **kwargs)
+        super().update(changes)
+        self._state._update(changes.items())
+
+    def setdefault(self, key: str, default: 'Optional[_value]' = None) -> 'Optional[_value]':
+        if not key in self:
+            self[key] = default # type: ignore
+        return self[key]
+
+    def pop(self, key: str, *default: Any) -> Any:
+        val = super().pop(key, *default)
+        self._state[key] = None
+        return val
+
+    def popitem(self) -> 'Tuple[str, _value]':
+        key, val = super().popitem()
+        self._state[key] = None
+        return key, val
+
+    def clear(self) -> None:
+        self._state._update([(key, None) for key in self])
+        super().clear()
 
 
 class LampState():
-    class BaseState():
-        vals: 'Dict[str, Union[Entity, str, bool]]'
-        additive: bool = False
+    __slots__ = ("_Intensity", "_Position", "_Color", "_Beam", "_Effect_", "_Maintenance", "_layers", "_merged", "_checked", "_version")
 
-        def __init__(self, vals: 'Optional[Dict[str, Union[Entity, str, bool]]]' = None, *, additive: bool = False) -> None:
-            self.vals = {}
+    class BaseState():
+        '''
+        The values of one category of attributes.
+        Every key of the category's `types` has a fixed slot in one immutable tuple, all other keys go to a dict that
+        is only created when needed. Copies share that tuple and the entities (which are replaced, never modified
+        in place), so copying allocates next to nothing and a change only builds a new tuple.
+        '''
+        __slots__ = ("_values", "_extra", "_version", "additive")
+        KEYS: 'Tuple[str, ...]' = ()
+        _INDEX: 'Dict[str, int]' = {}
+        _EMPTY: 'Tuple[Optional[_value], ...]' = ()
+
+        _values: 'Tuple[Optional[_value], ...]'
+        _extra: 'Optional[Dict[str, _value]]'
+        _version: int
+        additive: bool
+
+        def __init_subclass__(cls, **kwargs: Any) -> None:
+            super().__init_subclass__(**kwargs)
+            types = cls.__dict__.get("types")
+            if types is None:
+                return
+            cls.KEYS = get_args(types)
+            cls._INDEX = {key: i for i, key in enumerate(cls.KEYS)}
+            cls._EMPTY = (None,) * len(cls.KEYS)
+            for i, key in enumerate(cls.KEYS):
+                setattr(cls, key, property(lambda self, i=i: self._values[i], lambda self, val, i=i: self._set(i, val)))
+
+        def __init__(self, vals: 'Optional[Dict[str, _value]]' = None, *, additive: bool = False) -> None:
+            self._values = self._EMPTY
+            self._extra = None
+            self._version = nextVersion()
+            self.additive = additive
             if vals:
-                for k, v in vals.items():
-                    if isinstance(v, Entity):
-                        self.vals[k] = v.copy()
-                    else:
-                        self.vals[k] = v
-            if additive:
-                self.additive = additive
-
-        def copy(self) -> 'LampState.BaseState':
-            new: 'Dict[str, Union[Entity, str, bool]]' = {}
-            for k, v in self.vals.items():
-                if isinstance(v, Entity):
-                    new[k] = v.copy()
+                self._update(vals.items())
+
+        def _set(self, index: int, val: 'Optional[_value]') -> None:
+            values = list(self._values)
+            values[index] = val
+            self._values = tuple(values)
+            self._version = nextVersion()
+
+        def _update(self, items: 'Iterable[Tuple[str, Optional[_value]]]') -> None:
+            '''Sets all items at once, None removes a key.'''
+            values = list(self._values)
+            extra = dict(self._extra) if self._extra else {}
+            for key, val in items:
+                index = self._INDEX.get(key)
+                if index is not None:
+                    values[index] = val
+                elif val is None:
+                    extra.pop(key, None)
                 else:
-                    new[k] = v
-            return LampState.BaseState(new)
+                    extra[key] = val
+            self._values = tuple(values)
+            self._extra = extra or None
+            self._version = nextVersion()
+
+        def items(self) -> 'Iterator[Tuple[str, _value]]':
+            for key, val in zip(self.KEYS, self._values):
+                if val is not None:
+                    yield key, val
+            if self._extra:
+                yield from self._extra.items()
 
-        def __getitem__(self, typ: str) -> Optional[Union[Entity, str, bool]]:
-            return self.vals.get(typ)
+        @property
+        def vals(self) -> 'Dict[str, _value]':
+            '''A dict of all set values, built on access. Changes to it are written through to this state.'''
+            return _Vals(self)
+
+        @vals.setter
+        def vals(self, vals: 'Dict[str, _value]') -> None:
+            self._values = self._EMPTY
+            self._extra = None
+            self._update(vals.items())
+
+        @property
+        def version(self) -> int:
+            '''Changes whenever a value is set or removed (entities are expected to be replaced, not modified in place).'''
+            return self._version
+
+        def copy(self) -> 'LampState.BaseState':
+            new = object.__new__(type(self))
+            new._values = self._values
+            new._extra = dict(self._extra) if self._extra else None
+            new._version = nextVersion()
+            new.additive = self.additive
+            return new
+
+        def __getitem__(self, typ: str) -> 'Optional[_value]':
+            index = self._INDEX.get(typ)
+            if index is not None:
+                return self._values[index]
+            return self._extra.get(typ) if self._extra else None
+
+        def __setitem__(self, typ: str, val: 'Optional[_value]') -> None:
+            index = self._INDEX.get(typ)
+            if index is not None:
+                self._set(index, val)
+            else:
+                self._update([(typ, val)])
 
-        def __setitem__(self, typ: str, val: Union[Entity, str]) -> None:
-            self.vals[typ] = val
-        
         def __eq__(self, o: object) -> bool:
             if not isinstance(o, LampState.BaseState):
                 return NotImplemented
-            return self.vals == o.vals
+            if type(self) is type(o):
+                return self._values == o._values and (self._extra or None) == (o._extra or None)
+            return dict(self.items()) == dict(o.items())
+
+        def _combine(self, o: 'LampState.BaseState', add: bool) -> None:
+            if add and not o.additive and type(o) is type(self) and not o._extra:
+                # the common merge of two states of the same category is one pass over both tuples
+                self._values = tuple(old if val is None else val for old, val in zip(self._values, o._values))
+                self._version = nextVersion()
+                return
+            changes: 'List[Tuple[str, Optional[_value]]]' = []
+            for key, val in o.items():
+                old = self[key]
+                if o.additive and isinstance(old, Entity) and isinstance(val, Entity):
+                    if old.unit != val.unit:
+                        raise TypeError(f"Can't combine Entity of type {old.unit} and {val.unit}")
+                    changes.append((key, old + (val.number if add else -val.number)))
+                else:
+                    changes.append((key, val if add else None))
+            if changes:
+                self._update(changes)
 
         def __add__(self, o: 'Union[LampState.BaseState, Iterable[LampState.BaseState]]') -> 'LampState.BaseState':
             s = self.copy()
+            s += o
+            return s
+
+        def __iadd__(self, o: 'Union[LampState.BaseState, Iterable[LampState.BaseState]]') -> 'LampState.BaseState':
             if isinstance(o, LampState.BaseState):
-                s += o
+                self._combine(o, True)
             elif isinstance(o, Iterable):
                 for state in o:
-                    s += state
+                    self += state
+            return self
+
+        def __sub__(self, o: 'Union[LampState.BaseState, Iterable[LampState.BaseState]]') -> 'LampState.BaseState':
+            s = self.copy()
+            s -= o
             return s
 
-        def __iadd__(self, o: 'Union[LampState.BaseState, Iterable[LampState.BaseState]]') -> 'LampState.BaseState':
+        def __isub__(self, o: 'Union[LampState.BaseState, Iterable[LampState.BaseState]]') -> 'LampState.BaseState':
+            '''Removes the keys set in o, additive states are subtracted instead.'''
             if isinstance(o, LampState.BaseState):
-                for key, val in o.vals.items():
-                    if o.additive and self.vals.get(key) is not None and isinstance(self.vals[key], Entity) and isinstance(o.vals[key], Entity):
-                        self.vals[key] += o.vals[key] # type: ignore
-                    else:
-                        self.vals[key] = val
+                self._combine(o, False)
             elif isinstance(o, Iterable):
                 for state in o:
-                    self += state
+                    self -= state
             return self
 
         def __str__(self) -> str:
-            return f"{self.__class__.__name__} {', '.join(self.vals.keys())}"
+            return f"{self.__class__.__name__} {', '.join(key for key, _ in self.items())}"
 
         def __repr__(self) -> str:
-            return f"{self.__class__.__name__}({repr(self.vals)}, additive={self.additive})"
+            return f"{self.__class__.__name__}({repr(dict(self.items()))}, additive={self.additive})"
 
         def __bool__(self) -> bool:
-            return bool(self.vals)
+            return bool(self._extra) or any(val is not None for val in self._values)
 
     class IntensityState(BaseState):
+        __slots__ = ()
         types = Literal["Intensity", "Intensity2", "Smoke", "Fan", "Strobe"]
 
-        def copy(self) -> 'LampState.IntensityState':
-            return LampState.IntensityState(self.vals.copy())
-
-        @property
-        def Intensity(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Intensity", None)
-
-        @Intensity.setter
-        def Intensity(self, val: Entity) -> None:
-            self.vals["Intensity"] = val
-
-        @property
-        def Intensity2(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Intensity2", None)
-
-        @Intensity2.setter
-        def Intensity2(self, val: Entity) -> None:
-            self.vals["Intensity2"] = val
-
-        @property
-        def Smoke(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Smoke", None)
-
-        @Smoke.setter
-        def Smoke(self, val: Entity) -> None:
-            self.vals["Smoke"] = val
-
-        @property
-        def Fan(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Fan", None)
-
-        @Fan.setter
-        def Fan(self, val: Entity) -> None:
-            self.vals["Fan"] = val
-
-        @property
-        def Strobe(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Strobe", None)
-
-        @Strobe.setter
-        def Strobe(self, val: Entity) -> None:
-            self.vals["Strobe"] = val
-
     class PositionState(BaseState):
+        __slots__ = ()
         types = Literal["Pan", "Tilt", "PosTime"]
 
-        def copy(self) -> 'LampState.PositionState':
-            return LampState.PositionState(self.vals.copy())
-
-        @property
-        def Pan(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Pan", None)
-
-        @Pan.setter
-        def Pan(self, val: Entity) -> None:
-            self.vals["Pan"] = val
-
-        @property
-        def Tilt(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Tilt", None)
-
-        @Tilt.setter
-        def Tilt(self, val: Entity) -> None:
-            self.vals["Tilt"] = val
-
-        @property
-        def PosTime(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("PosTime", None)
-
-        @PosTime.setter
-        def PosTime(self, val: Entity) -> None:
-            self.vals["PosTime"] = val
-
     class ColorState(BaseState):
+        __slots__ = ()
         types = Literal["Hue", "Saturation", "Red",
                         "Green", "Blue", "Slot", "Slot2", "ColorFx"]
 
-        def copy(self) -> 'LampState.ColorState':
-            return LampState.ColorState(self.vals.copy())
-
-        @property
-        def Hue(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Hue", None)
-
-        @Hue.setter
-        def Hue(self, val: Entity) -> None:
-            self.vals["Hue"] = val
-
-        @property
-        def Saturation(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Saturation", None)
-
-        @Saturation.setter
-        def Saturation(self, val: Entity) -> None:
-            self.vals["Saturation"] = val
-
-        @property
-        def Red(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Red", None)
-
-        @Red.setter
-        def Red(self, val: Entity) -> None:
-            self.vals["Red"] = val
-
-        @property
-        def Green(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Green", None)
-
-        @Green.setter
-        def Green(self, val: Entity) -> None:
-            self.vals["Green"] = val
-
-        @property
-        def Blue(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Blue", None)
-
-        @Blue.setter
-        def Blue(self, val: Entity) -> None:
-            self.vals["Blue"] = val
-
-        @property
-        def Slot(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Slot", None)
-
-        @Slot.setter
-        def Slot(self, val: Entity) -> None:
-            self.vals["Slot"] = val
-
-        @property
-        def Slot2(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Slot2", None)
-
-        @Slot2.setter
-        def Slot2(self, val: Entity) -> None:
-            self.vals["Slot2"] = val
-
-        @property
-        def ColorFx(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("ColorFx", None)
-
-        @ColorFx.setter
-        def ColorFx(self, val: Union[Entity, str]) -> None:
-            self.vals["ColorFx"] = val
-
     class BeamState(BaseState):
+        __slots__ = ()
         types = Literal["Gobo", "GoboRot", "GoboShake", "Gobo2", "Gobo2Rot",
                         "Gobo2Shake", "Focus", "Prism", "PrismRot", "PrismShake"]
 
-        def copy(self) -> 'LampState.BeamState':
-            return LampState.BeamState(self.vals.copy())
-
-        @property
-        def Gobo(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Gobo", None)
-
-        @Gobo.setter
-        def Gobo(self, val: Entity) -> None:
-            self.vals["Gobo"] = val
-
-        @property
-        def GoboRot(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("GoboRot", None)
-
-        @GoboRot.setter
-        def GoboRot(self, val: Entity) -> None:
-            self.vals["GoboRot"] = val
-
-        @property
-        def GoboShake(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("GoboShake", None)
-
-        @GoboShake.setter
-        def GoboShake(self, val: Entity) -> None:
-            self.vals["GoboShake"] = val
-
-        @property
-        def Gobo2(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Gobo2", None)
-
-        @Gobo2.setter
-        def Gobo2(self, val: Entity) -> None:
-            self.vals["Gobo2"] = val
-
-        @property
-        def Gobo2Rot(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Gobo2Ro2", None)
-
-        @Gobo2Rot.setter
-        def Gobo2Rot(self, val: Entity) -> None:
-            self.vals["Gobo2Rot"] = val
-
-        @property
-        def Gobo2Shake(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Gobo2Shake", None)
-
-        @Gobo2Shake.setter
-        def Gobo2Shake(self, val: Entity) -> None:
-            self.vals["Gobo2Shake"] = val
-
-        @property
-        def Focus(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Focus", None)
-
-        @Focus.setter
-        def Focus(self, val: Entity) -> None:
-            self.vals["Focus"] = val
-
-        @property
-        def Prism(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("Prism", None)
-
-        @Prism.setter
-        def Prism(self, val: Entity) -> None:
-            self.vals["Prism"] = val
-
-        @property
-        def PrismRot(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("PrismRot", None)
-
-        @PrismRot.setter
-        def PrismRot(self, val: Entity) -> None:
-            self.vals["PrismRot"] = val
-
-        @property
-        def PrismShake(self) -> 'Optional[Union[str, Entity, bool]]':
-            return self.vals.get("PrismShake", None)
-
-        @PrismShake.setter
-        def PrismShake(self, val: Entity) -> None:
-            self.vals["PrismShake"] = val
-
     class MaintenanceState(BaseState):
-        def copy(self) -> 'LampState.MaintenanceState':
-            return LampState.MaintenanceState(self.vals.copy())
-        
+        __slots__ = ()
+
         def set_val(self, typ: str, val: bool = True) -> None:
-            self.vals[typ] = val
+            self[typ] = val
         
         def get_val(self) -> str:
-            return list(self.vals.keys())[0]
-
-    Intensity: Optional[IntensityState]
-    Position: Optional[PositionState]
-    Color: Optional[ColorState]
-    Beam: Optional[BeamState]
-    Effect_: 'Optional[Iterable[Effect]]'
-    Maintenance: Optional[MaintenanceState]
-
-    def __init__(self, Intensity: Optional[IntensityState] = None, Position: Optional[PositionState] = None, Color: Optional[ColorState] = None, Beam: Optional[BeamState] = None, Effect_: 'Optional[Iterable[Effect]]' = None, Maintenance: Optional[MaintenanceState] = None) -> None:
-        self.Intensity = Intensity
-        self.Position = Position
-        self.Color = Color
-        self.Beam = Beam
-        self.Effect_ = []
-        if Effect_:
-            for i in Effect_:
-                self.Effect_.append(i)
-        self.Maintenance = Maintenance
+            return next(key for key, _ in self.items())
+
+    CATEGORIES = ("Intensity", "Position", "Color", "Beam", "Maintenance")
+
+    _Intensity: 'Optional[LampState.IntensityState]'
+    _Position: 'Optional[LampState.PositionState]'
+    _Color: 'Optional[LampState.ColorState]'
+    _Beam: 'Optional[LampState.BeamState]'
+    _Effect_: 'List[Effect]'
+    _Maintenance: 'Optional[LampState.MaintenanceState]'
+    _layers: 'Tuple[LampState, ...]'
+    _merged: 'Optional[Tuple[int, Dict[str, Tuple[Optional[LampState.BaseState], int]]]]'
+    _checked: 'Tuple[int, int]'
+    _version: int
+
+    def __init__(self, Intensity: 'Optional[IntensityState]' = None, Position: 'Optional[PositionState]' = None, Color: 'Optional[ColorState]' = None, Beam: 'Optional[BeamState]' = None, Effect_: 'Optional[Iterable[Effect]]' = None, Maintenance: 'Optional[MaintenanceState]' = None, *, layers: 'Iterable[LampState]' = ()) -> None:
+        self._Intensity = Intensity
+        self._Position = Position
+        self._Color = Color
+        self._Beam = Beam
+        self._Effect_ = list(Effect_) if Effect_ else []
+        self._Maintenance = Maintenance
+        self._layers = ()
+        self._merged = None
+        self._checked = (0, 0)
+        self._version = nextVersion()
+        for layer in layers:
+            self.addLayer(layer)
+
+    def _own(self, name: str) -> 'Optional[LampState.BaseState]':
+        return getattr(self, "_" + name)
+
+    def _get(self, name: str) -> 'Optional[LampState.BaseState]':
+        if not self._layers:
+            return self._own(name)
+        return self._resolve()[name][0]
+
+    def _set(self, name: str, state: 'Optional[LampState.BaseState]') -> None:
+        self._adoptEdits()
+        setattr(self, "_" + name, state)
+        self._version = nextVersion()
+
+    def _adoptEdits(self) -> None:
+        '''Merged categories changed in place become values of this state, copy on write of the whole category.'''
+        if self._merged is None:
+            return
+        edited = [(name, view) for name, (view, version) in self._merged[1].items() if view is not None and view.version != version]
+        if edited:
+            for name, view in edited:
+                setattr(self, "_" + name, view)
+            self._merged = None
+
+    def _resolve(self) -> 'Dict[str, Tuple[Optional[LampState.BaseState], int]]':
+        version = self.version
+        if self._merged is not None and self._merged[0] == version:
+            return self._merged[1]
+        views: 'Dict[str, Tuple[Optional[LampState.BaseState], int]]' = {}
+        for name in LampState.CATEGORIES:
+            own = self._own(name)
+            below = [state for state in (layer._get(name) for layer in self._layers) if state]
+            view = own
+            if below:
+                # the copy shares the values of the lowest layer, the others are merged on top of it
+                view = below[0].copy()
+                for state in below[1:] + ([own] if own else []):
+                    view += state
+            views[name] = (view, view.version if view is not None else 0)
+        self._merged = (version, views)
+        return views
+
+    @property
+    def layers(self) -> 'Tuple[LampState, ...]':
+        '''The states below the own values of this one, later layers win. Their changes show up here without copying.'''
+        return self._layers
+
+    def addLayer(self, layer: 'LampState') -> None:
+        if layer is self or layer._reaches(self):
+            raise ValueError("A LampState can not be layered on itself")
+        self._adoptEdits()
+        self._layers = self._layers + (layer,)
+        self._version = nextVersion()
+
+    def removeLayer(self, layer: 'LampState') -> None:
+        if not any(state is layer for state in self._layers):
+            return
+        self._adoptEdits()
+        self._layers = tuple(state for state in self._layers if state is not layer)
+        self._version = nextVersion()
+
+    def _reaches(self, target: 'LampState') -> bool:
+        return any(layer is target or layer._reaches(target) for layer in self._layers)
+
+    Intensity: 'Optional[IntensityState]' = property(lambda self: self._get("Intensity"), lambda self, state: self._set("Intensity", state))
+    Position: 'Optional[PositionState]' = property(lambda self: self._get("Position"), lambda self, state: self._set("Position", state))
+    Color: 'Optional[ColorState]' = property(lambda self: self._get("Color"), lambda self, state: self._set("Color", state))
+    Beam: 'Optional[BeamState]' = property(lambda self: self._get("Beam"), lambda self, state: self._set("Beam", state))
+    Maintenance: 'Optional[MaintenanceState]' = property(lambda self: self._get("Maintenance"), lambda self, state: self._set("Maintenance", state))
+
+    @property
+    def Effect_(self) -> 'List[Effect]':
+        if not self._layers:
+            return self._Effect_
+        return [effect for layer in self._layers for effect in layer.Effect_] + self._Effect_
+
+    @Effect_.setter
+    def Effect_(self, effects: 'Iterable[Effect]') -> None:
+        self._Effect_ = list(effects)
+        self._version = nextVersion()
+
+    @property
+    def version(self) -> int:
+        latest = latestVersion()
+        if self._checked[0] == latest:
+            # no version was handed out since the last check, so nothing below can have changed
+            return self._checked[1]
+        self._adoptEdits()
+        version = max([self._version] + [state.version for state in (self._Intensity, self._Position, self._Color, self._Beam, self._Maintenance) if state is not None]
+                      + [layer.version for layer in self._layers])
+        self._checked = (latest, version)
+        return version
 
     def copy(self) -> 'LampState':
-        return LampState(self.Intensity, self.Position, self.Color, self.Beam, self.Effect_)
+        '''The own values are copied (which shares them until either side changes), the layers are shared.'''
+        self._adoptEdits()
+        own = [state.copy() if state is not None else None for state in (self._Intensity, self._Position, self._Color, self._Beam)]
+        return LampState(*own, self._Effect_, self._Maintenance.copy() if self._Maintenance is not None else None, layers=self._layers)
 
     def __add__(self, o: 'Union[LampState, Iterable[LampState]]') -> 'LampState':
         s = self.copy()
@@ -346,11 +378,14 @@ class LampState():
 
     def __iadd__(self, o: 'Union[LampState, Iterable[LampState]]') -> 'LampState':
         if isinstance(o, LampState):
+            # only the own values are merged, so the layers below stay shared and their later changes still show up
+            self._adoptEdits()
             for typ in ["Intensity", "Position", "Color", "Beam", "Effect_"]:
-                if getattr(self, typ) and getattr(o, typ):
-                    setattr(self, typ, getattr(self, typ) + getattr(o, typ))
-                elif not getattr(self, typ) and getattr(o, typ):
-                    setattr(self, typ, getattr(o, typ))
+                own = self._Effect_ if typ == "Effect_" else self._own(typ)
+                if own and getattr(o, typ):
+                    setattr(self, typ, own + getattr(o, typ))
+                elif not own and getattr(o, typ):
+                    setattr(self, typ, getattr(o, typ).copy())
         elif isinstance(o, Iterable):
             for state in o:
                 self += state
@@ -367,11 +402,11 @@ class LampState():
 
     def __isub__(self, o: 'Union[LampState, Iterable[LampState]]') -> 'LampState':
         if isinstance(o, LampState):
-            for typ in ["Intensity", "Position", "Color", "Beam", "Effect_"]:
+            for typ in ["Intensity", "Position", "Color", "Beam"]:
                 if getattr(self, typ) and getattr(o, typ):
                     setattr(self, typ, getattr(self, typ) - getattr(o, typ))
-                elif not getattr(self, typ) and getattr(o, typ):
-                    setattr(self, typ, getattr(o, typ))
+            if self.Effect_ and o.Effect_:
+                self.Effect_ = [effect for effect in self.Effect_ if not effect in o.Effect_]
         elif isinstance(o, Iterable):
             for state in o:
                 self -= state
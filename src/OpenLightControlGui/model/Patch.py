@@ -0,0 +1,290 @@
+from bisect import bisect_left, bisect_right, insort
+from numbers import Number
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from OpenLightControlGui.model.Address import Address
+from OpenLightControlGui.model.Lamp import Lamp
+from OpenLightControlGui.model.UniverseBuffer import UNIVERSE_SIZE
+
+_range = Tuple[int, int, int]
+
+
+class Patch():
+    '''
+    Registry of the patched lamps, by fixture number and by the DMX ranges (per universe) they occupy.
+    A lamp belongs to at most one Patch, which it asks before every change of its number, mode or address;
+    a change that would give two lamps the same number or overlapping ranges raises a ValueError and is not applied.
+    '''
+
+    class Universe():
+        '''
+        The occupied ranges of one universe as sorted, non-overlapping [start, end) intervals.
+        A segment tree over the slots keeps the longest free run (and the free runs at both ends) of every node, so
+        the next gap of any size is found by walking down from the root instead of scanning all ranges.
+        '''
+        _starts: 'List[int]'
+        _ends: 'List[int]'
+        _lamps: 'List[Lamp]'
+        _prefix: 'List[int]'
+        _suffix: 'List[int]'
+        _best: 'List[int]'
+        _pending: 'List[Optional[bool]]'
+
+        def __init__(self) -> None:
+            self._starts = []
+            self._ends = []
+            self._lamps = []
+            # every node starts free, the root covers [0, UNIVERSE_SIZE)
+            self._prefix = [0] * (4 * UNIVERSE_SIZE)
+            self._suffix = [0] * (4 * UNIVERSE_SIZE)
+            self._best = [0] * (4 * UNIVERSE_SIZE)
+            self._pending = [None] * (4 * UNIVERSE_SIZE)
+            self._fill(1, 0, UNIVERSE_SIZE, True)
+
+        def _fill(self, node: int, lo: int, hi: int, free: bool) -> None:
+            length = hi - lo if free else 0
+            self._prefix[node] = self._suffix[node] = self._best[node] = length
+            self._pending[node] = free
+
+        def _push(self, node: int, lo: int, mid: int, hi: int) -> None:
+            free = self._pending[node]
+            if free is not None and hi - lo > 1:
+                self._fill(2 * node, lo, mid, free)
+                self._fill(2 * node + 1, mid, hi, free)
+            self._pending[node] = None
+
+        def _assign(self, node: int, lo: int, hi: int, start: int, end: int, free: bool) -> None:
+            if end <= lo or hi <= start:
+                return
+            if start <= lo and hi <= end:
+                self._fill(node, lo, hi, free)
+                return
+            mid = (lo + hi) // 2
+            self._push(node, lo, mid, hi)
+            left, right = 2 * node, 2 * node + 1
+            self._assign(left, lo, mid, start, end, free)
+            self._assign(right, mid, hi, start, end, free)
+            self._prefix[node] = self._prefix[left] + (self._prefix[right] if self._prefix[left] == mid - lo else 0)
+            self._suffix[node] = self._suffix[right] + (self._suffix[left] if self._suffix[right] == hi - mid else 0)
+            self._best[node] = max(self._best[left], self._best[right], self._suffix[left] + self._prefix[right])
+
+        def _find(self, node: int, lo: int, hi: int, start: int, count: int, run: int) -> 'Tuple[Optional[int], int]':
+            '''Returns: (gap, run) - The first gap of count slots from start on within the node, else the free run reaching its end.'''
+            if hi <= start:
+                return None, 0
+            if start <= lo:
+                if run + self._prefix[node] >= count:
+                    return lo - run, 0
+                if self._best[node] < count:
+                    return None, run + hi - lo if self._prefix[node] == hi - lo else self._suffix[node]
+            mid = (lo + hi) // 2
+            self._push(node, lo, mid, hi)
+            gap, run = self._find(2 * node, lo, mid, start, count, run)
+            if gap is not None:
+                return gap, 0
+            return self._find(2 * node + 1, mid, hi, start, count, run)
+
+        def add(self, start: int, end: int, lamp: Lamp) -> None:
+            '''Adds a range, which has to be free.'''
+            i = bisect_left(self._starts, start)
+            self._starts.insert(i, start)
+            self._ends.insert(i, end)
+            self._lamps.insert(i, lamp)
+            self._assign(1, 0, UNIVERSE_SIZE, start, end, False)
+
+        def remove(self, start: int, lamp: Lamp) -> None:
+            i = bisect_left(self._starts, start)
+            if i < len(self._starts) and self._starts[i] == start and self._lamps[i] is lamp:
+                self._assign(1, 0, UNIVERSE_SIZE, start, self._ends[i], True)
+                del self._starts[i]
+                del self._ends[i]
+                del self._lamps[i]
+
+        def at(self, slot: int) -> 'Optional[Lamp]':
+            i = bisect_right(self._starts, slot) - 1
+            if i >= 0 and slot < self._ends[i]:
+                return self._lamps[i]
+            return None
+
+        def overlapping(self, start: int, end: int) -> 'List[Lamp]':
+            '''Returns: List[Lamp] - The lamps of all ranges overlapping [start, end), in address order.'''
+            # ends are sorted as well, since the ranges do not overlap
+            i = bisect_right(self._ends, start)
+            found = []
+            while i < len(self._starts) and self._starts[i] < end:
+                found.append(self._lamps[i])
+                i += 1
+            return found
+
+        def nextGap(self, count: int, start: int = 0) -> 'Optional[int]':
+            '''Returns: Optional[int] - The first slot from start on with count free slots after it, None if there is no such gap.'''
+            if count <= 0 or start >= UNIVERSE_SIZE:
+                return None
+            return self._find(1, 0, UNIVERSE_SIZE, max(start, 0), count, 0)[0]
+
+        def __len__(self) -> int:
+            return len(self._starts)
+
+        def __repr__(self) -> str:
+            return f"Patch.Universe({list(zip(self._starts, self._ends))})"
+
+    _byNumber: 'Dict[Number, Lamp]'
+    _universes: 'Dict[int, Patch.Universe]'
+    _entries: 'Dict[Lamp, Tuple[Number, List[_range]]]'
+
+    def __init__(self, lamps: 'Optional[Iterable[Lamp]]' = None) -> None:
+        self._byNumber = {}
+        self._universes = {}
+        self._entries = {}
+        if lamps:
+            for lamp in lamps:
+                self.addLamp(lamp)
+
+    @staticmethod
+    def rangesOf(addresses: 'Union[Address, Iterable[Address]]', channelCount: int) -> 'List[_range]':
+        '''Returns: List[(universe, start, end)] - The ranges occupied by a lamp with channelCount channels at the given addresses.'''
+        if isinstance(addresses, Address):
+            addresses = [addresses]
+        ranges = [(address.universe, address.address, address.address + channelCount) for address in addresses]
+        for universe, start, end in ranges:
+            if start < 0 or end > UNIVERSE_SIZE:
+                raise ValueError(f"{channelCount} channels at {Address(universe, start)} do not fit into a universe")
+        ranges.sort()
+        for (u1, _, end), (u2, start, _) in zip(ranges, ranges[1:]):
+            if u1 == u2 and start < end:
+                raise ValueError(f"The addresses {Address(u1, start)} and the one before overlap")
+        return ranges
+
+    def _check(self, lamp: Lamp, number: Number, ranges: 'List[_range]') -> None:
+        other = self._byNumber.get(number)
+        if other is not None and other is not lamp:
+            raise ValueError(f"Fixture number {number} is already used by {other}")
+        for universe, start, end in ranges:
+            index = self._universes.get(universe)
+            if index is not None:
+                for other in index.overlapping(start, end):
+                    if other is not lamp:
+                        raise ValueError(f"Address {Address(universe, start)} is already used by {other}")
+
+    def _index(self, lamp: Lamp, number: Number, ranges: 'List[_range]') -> None:
+        self._entries[lamp] = (number, ranges)
+        self._byNumber[number] = lamp
+        for universe, start, end in ranges:
+            index = self._universes.get(universe)
+            if index is None:
+                index = self._universes[universe] = Patch.Universe()
+            index.add(start, end, lamp)
+
+    def _unindex(self, lamp: Lamp) -> None:
+        number, ranges = self._entries.pop(lamp)
+        del self._byNumber[number]
+        for universe, start, _ in ranges:
+            self._universes[universe].remove(start, lamp)
+
+    def _repatch(self, lamp: Lamp, number: Number, addresses: 'Iterable[Address]', channelCount: int) -> None:
+        '''Called by a lamp before it changes, raises ValueError if the change conflicts with another lamp.'''
+        ranges = Patch.rangesOf(addresses, channelCount)
+        self._check(lamp, number, ranges)
+        self._unindex(lamp)
+        self._index(lamp, number, ranges)
+
+    def addLamp(self, lamp: Lamp) -> None:
+        if lamp in self._entries:
+            return
+        if lamp._patch is not None:
+            raise ValueError(f"{lamp} is already part of another patch")
+        ranges = Patch.rangesOf(lamp.address, lamp.dmxRange)
+        self._check(lamp, lamp.number, ranges)
+        self._index(lamp, lamp.number, ranges)
+        lamp._patch = self
+
+    def addLamps(self, lamps: 'Iterable[Lamp]') -> None:
+        for lamp in lamps:
+            self.addLamp(lamp)
+
+    def removeLamp(self, lamp: Lamp) -> None:
+        if lamp in self._entries:
+            self._unindex(lamp)
+            lamp._patch = None
+
+    def getLamp(self, number: Number) -> 'Optional[Lamp]':
+        return self._byNumber.get(number)
+
+    def lampAt(self, universe: int, address: int) -> 'Optional[Lamp]':
+        '''Returns: Optional[Lamp] - The lamp occupying that slot, not only lamps starting there.'''
+        index = self._universes.get(universe)
+        return index.at(address) if index is not None else None
+
+    def conflicts(self, addresses: 'Union[Address, Iterable[Address]]', channelCount: int, ignore: 'Optional[Lamp]' = None) -> 'List[Lamp]':
+        '''Returns: List[Lamp] - The lamps (other than ignore) occupying any slot of a lamp with channelCount channels at addresses.'''
+        found: 'Dict[Lamp, None]' = {}
+        for universe, start, end in Patch.rangesOf(addresses, channelCount):
+            index = self._universes.get(universe)
+            if index is not None:
+                found.update((lamp, None) for lamp in index.overlapping(start, end) if lamp is not ignore)
+        return list(found.keys())
+
+    def isFree(self, addresses: 'Union[Address, Iterable[Address]]', channelCount: int) -> bool:
+        return not self.conflicts(addresses, channelCount)
+
+    def nextFree(self, channelCount: int, start: 'Optional[Address]' = None) -> Address:
+        '''Returns: Address - The first address from start (default 0:0) on with channelCount free channels.'''
+        if not 0 < channelCount <= UNIVERSE_SIZE:
+            raise ValueError(f"{channelCount} channels do not fit into a universe")
+        universe, address = (start.universe, start.address) if start is not None else (0, 0)
+        while True:
+            index = self._universes.get(universe)
+            if index is not None:
+                gap = index.nextGap(channelCount, address)
+            else:
+                gap = address if UNIVERSE_SIZE - address >= channelCount else None
+            if gap is not None:
+                return Address(universe, gap)
+            universe, address = universe + 1, 0
+
+    def autoPatch(self, lamps: 'Iterable[Lamp]', start: 'Optional[Address]' = None) -> None:
+        '''
+        Gives every lamp the next free address after the previous one, starting at start (default 0:0), and adds it.
+        Lamps already in this patch are moved, nothing is changed if the lamps' numbers conflict or a lamp does not fit
+        into a universe.
+        '''
+        lamps = list(lamps)
+        numbers: 'Dict[Number, Lamp]' = {}
+        for lamp in lamps:
+            if lamp._patch is not None and lamp._patch is not self:
+                raise ValueError(f"{lamp} is already part of another patch")
+            if not 0 < lamp.dmxRange <= UNIVERSE_SIZE:
+                raise ValueError(f"{lamp} with {lamp.dmxRange} channels does not fit into a universe")
+            other = numbers.setdefault(lamp.number, lamp)
+            if other is lamp:
+                other = self._byNumber.get(lamp.number, lamp)
+            if other is not lamp:
+                raise ValueError(f"Fixture number {lamp.number} is already used by {other}")
+
+        # the lamps free their current ranges first, so they can be patched anew in the given order
+        for lamp in lamps:
+            if lamp in self._entries:
+                self._unindex(lamp)
+                self._index(lamp, lamp.number, [])
+        cursor = start
+        for lamp in lamps:
+            address = self.nextFree(lamp.dmxRange, cursor)
+            lamp.address = address
+            self.addLamp(lamp)
+            cursor = Address(address.universe, address.address + lamp.dmxRange)
+
+    @property
+    def lamps(self) -> 'List[Lamp]':
+        return list(self._entries.keys())
+
+    def __contains__(self, lamp: object) -> bool:
+        return lamp in self._entries
+
+    def __iter__(self) -> 'Iterator[Lamp]':
+        return iter(self._entries.keys())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"Patch of {len(self._entries)} lamps"
@@ -0,0 +1,241 @@
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from OpenLightControlGui.fixture_model.CapabilityEncoder import CapabilityEncoder, baseValue
+from OpenLightControlGui.fixture_model.CoarseChannel import CoarseChannel
+from OpenLightControlGui.fixture_model.Entity import Entity
+from OpenLightControlGui.fixture_model.FineChannel import FineChannel
+from OpenLightControlGui.fixture_model.SlotTable import SlotTable
+from OpenLightControlGui.model.UniverseBuffer import UniverseBuffer
+
+if TYPE_CHECKING:
+    from OpenLightControlGui.model.Lamp import Lamp
+
+_attribute = Tuple[str, str]
+
+# categories whose values are physical units (angles, distances) or wheel slots mapped through the channel's capabilities instead of fractions
+ENCODED_CATEGORIES = ("Position", "Beam")
+
+
+class PatchPlan():
+    '''
+    The absolute DMX targets of one Lamp, compiled once from Lamp.capabilities and Lamp.address.
+    Every attribute maps to flat arrays with one entry per (address, byte), so rendering is a single scatter.
+    Attributes in physical units (pan/tilt angles, focus) also keep the capability encoder of their channel, wheel
+    slots and prism steps its slot table. Both are built once per fixture mode and shared by all its lamps.
+    '''
+
+    class Target():
+        universes: 'np.ndarray'
+        slots: 'np.ndarray'
+        resolutions: 'np.ndarray'
+        shifts: 'np.ndarray'
+
+        def __init__(self, universes: 'Iterable[int]', slots: 'Iterable[int]', resolutions: 'Iterable[int]', shifts: 'Iterable[int]') -> None:
+            self.universes = np.asarray(universes, dtype=np.int64)
+            self.slots = np.asarray(slots, dtype=np.int64)
+            self.resolutions = np.asarray(resolutions, dtype=np.int64)
+            self.shifts = np.asarray(shifts, dtype=np.int64)
+
+        @classmethod
+        def concatenate(cls, targets: 'Iterable[PatchPlan.Target]') -> 'PatchPlan.Target':
+            targets = list(targets)
+            if len(targets) == 1:
+                return targets[0]
+            if not targets:
+                return cls([], [], [], [])
+            return cls(
+                np.concatenate([t.universes for t in targets]),
+                np.concatenate([t.slots for t in targets]),
+                np.concatenate([t.resolutions for t in targets]),
+                np.concatenate([t.shifts for t in targets]))
+
+        def encode(self, fractions: 'Union[float, np.ndarray]') -> 'np.ndarray':
+            '''Returns: np.ndarray - The DMX byte of every target for the given value(s) between 0 and 1.'''
+            fractions = np.clip(fractions, 0, 1)
+            full = np.floor(fractions * (np.left_shift(1, 8 * self.resolutions) - 1)).astype(np.int64)
+            return np.right_shift(full, self.shifts) & 0xff
+
+        def render(self, buffer: UniverseBuffer, fractions: 'Union[float, np.ndarray]') -> None:
+            buffer.scatter(self.universes, self.slots, self.encode(fractions))
+
+        def renderDmx(self, buffer: UniverseBuffer, values: 'Union[int, np.ndarray]') -> None:
+            '''Writes DMX value(s) in the target's resolution, split into their coarse and fine bytes.'''
+            buffer.scatter(self.universes, self.slots, np.right_shift(values, self.shifts) & 0xff)
+
+        def __len__(self) -> int:
+            return len(self.slots)
+
+    _targets: 'Dict[_attribute, PatchPlan.Target]'
+    _channels: 'Dict[_attribute, Dict[int, int]]'
+    _encoders: 'Dict[_attribute, Tuple[CapabilityEncoder, int]]'
+    _tables: 'Dict[_attribute, Tuple[SlotTable, int]]'
+    _universes: 'List[int]'
+    _snap: 'PatchPlan.Target'
+    _htp: 'PatchPlan.Target'
+    _finePairs: 'Tuple[np.ndarray, np.ndarray, np.ndarray]'
+
+    def __init__(self, lamp: 'Lamp') -> None:
+        self._targets = {}
+        self._channels = {}
+        self._encoders = {}
+        self._tables = {}
+        self._universes = list(dict.fromkeys(address.universe for address in lamp.address))
+        self._addChannels(lamp)
+        for category, cap in lamp.capabilities.items():
+            if isinstance(cap, (int, dict)) and category == "Intensity":
+                self._add(lamp, (category, category), cap)
+            elif isinstance(cap, dict):
+                for attribute, channels in cap.items():
+                    if isinstance(channels, (int, dict)):
+                        self._add(lamp, (category, str(attribute)), channels)
+
+    def _add(self, lamp: 'Lamp', attribute: '_attribute', channels: 'Union[int, Dict[int, int]]') -> None:
+        if isinstance(channels, int):
+            channels = {1: channels}
+        self._channels[attribute] = channels
+        resolution = max(channels.keys())
+        universes, slots, shifts = [], [], []
+        for address in lamp.address:
+            for res, channel in channels.items():
+                universes.append(address.universe)
+                slots.append(address.address + channel)
+                shifts.append(8 * (resolution - res))
+        self._targets[attribute] = PatchPlan.Target(universes, slots, [resolution] * len(slots), shifts)
+        channel = lamp.channels[channels[min(channels.keys())]]
+        if attribute[0] in ENCODED_CATEGORIES and isinstance(channel, CoarseChannel):
+            encoder = channel.getEncoder(attribute[1])
+            if encoder is not None:
+                self._encoders[attribute] = (encoder, resolution)
+            table = channel.getSlotTable(attribute[1])
+            if table is not None:
+                self._tables[attribute] = (table, resolution)
+
+    def _addChannels(self, lamp: 'Lamp') -> None:
+        channels = lamp.channels
+        coarseIndex = {channel.key: channelnum for channelnum, channel in enumerate(channels) if isinstance(channel, CoarseChannel)}
+        snap: 'List[int]' = []
+        htp: 'List[int]' = []
+        pairs: 'List[Tuple[int, int]]' = []
+        for channelnum, channel in enumerate(channels):
+            if isinstance(channel, CoarseChannel):
+                if not channel.canCrossfade:
+                    snap.append(channelnum)
+                if channel.precedence == "HTP":
+                    htp.append(channelnum)
+            elif isinstance(channel, FineChannel):
+                coarse = channel.coarseChannel
+                if coarse.precedence == "HTP":
+                    htp.append(channelnum)
+                if not coarse.canCrossfade:
+                    snap.append(channelnum)
+                elif channel.resolution == 2 and coarse.key in coarseIndex:
+                    pairs.append((coarseIndex[coarse.key], channelnum))
+        self._snap = self._slots(lamp, snap)
+        self._htp = self._slots(lamp, htp)
+        self._finePairs = (
+            np.array([address.universe for address in lamp.address for _ in pairs], dtype=np.int64),
+            np.array([address.address + coarse for address in lamp.address for coarse, _ in pairs], dtype=np.int64),
+            np.array([address.address + fine for address in lamp.address for _, fine in pairs], dtype=np.int64))
+
+    @staticmethod
+    def _slots(lamp: 'Lamp', channels: 'List[int]') -> 'PatchPlan.Target':
+        return PatchPlan.Target(
+            [address.universe for address in lamp.address for _ in channels],
+            [address.address + channelnum for address in lamp.address for channelnum in channels],
+            [1] * len(channels) * len(lamp.address), [0] * len(channels) * len(lamp.address))
+
+    @property
+    def targets(self) -> 'Dict[_attribute, PatchPlan.Target]':
+        return self._targets
+
+    @property
+    def channels(self) -> 'Dict[_attribute, Dict[int, int]]':
+        '''The channel numbers (within the mode) of every attribute by resolution, 1 is the coarse channel.'''
+        return self._channels
+
+    @property
+    def universes(self) -> 'List[int]':
+        return self._universes
+
+    @property
+    def snap(self) -> 'PatchPlan.Target':
+        '''The slots of all channels that cannot crossfade and have to snap to their new value.'''
+        return self._snap
+
+    @property
+    def htp(self) -> 'PatchPlan.Target':
+        '''The slots of all channels with HTP precedence, everything else is LTP.'''
+        return self._htp
+
+    @property
+    def finePairs(self) -> 'Tuple[np.ndarray, np.ndarray, np.ndarray]':
+        '''Returns: (universes, coarse slots, fine slots) of all 16 bit channels.'''
+        return self._finePairs
+
+    def getTarget(self, category: str, attribute: str) -> 'Optional[PatchPlan.Target]':
+        return self._targets.get((category, attribute))
+
+    def getEncoder(self, category: str, attribute: str) -> 'Optional[Tuple[CapabilityEncoder, int]]':
+        '''Returns: (encoder, resolution) - The capability encoder of an attribute in physical units and the resolution it is patched with.'''
+        return self._encoders.get((category, attribute))
+
+    def getSlotTable(self, category: str, attribute: str) -> 'Optional[Tuple[SlotTable, int]]':
+        '''Returns: (table, resolution) - The slot table of a wheel slot or prism attribute and the resolution it is patched with.'''
+        return self._tables.get((category, attribute))
+
+    @staticmethod
+    def renderEncoded(buffer: UniverseBuffer, plans: 'Iterable[PatchPlan]', attribute: '_attribute', values: 'Union[Entity, str, float, Iterable[float], np.ndarray]') -> None:
+        '''
+        Renders an attribute in physical units (e.g. pan/tilt in degrees) or a wheel slot/prism step for many lamps at
+        once: one value for all of them or one number per plan, e.g. from an effect. Lamps of the same mode share
+        their encoder tables, so every mode is encoded once (one vectorized lookup for per-plan numbers).
+        Single values are looked up in the slot table first, e.g. gobo names or slot numbers. Plans that can't show
+        the value are skipped.
+        '''
+        plans = list(plans)
+        single = isinstance(values, (Entity, str, int, float))
+        groups: 'Dict[Tuple[int, int, int], Tuple[Optional[SlotTable], Optional[CapabilityEncoder], int, List[int]]]' = {}
+        for i, plan in enumerate(plans):
+            table, encoded = plan._tables.get(attribute), plan._encoders.get(attribute)
+            if encoded is None and (table is None or not single):
+                continue
+            resolution = encoded[1] if encoded is not None else table[1] # type: ignore
+            encoder = encoded[0] if encoded is not None else None
+            slots = table[0] if table is not None and single else None
+            groups.setdefault((id(slots), id(encoder), resolution), (slots, encoder, resolution, []))[3].append(i)
+        if not groups:
+            return
+        dmx = np.full(len(plans), -1, dtype=np.int64)
+        if single:
+            number = None if isinstance(values, str) else baseValue(values)[1] # type: ignore
+            for slots, encoder, resolution, indices in groups.values():
+                value = slots.get(values, resolution) if slots is not None else None # type: ignore
+                if value is None and encoder is not None and number is not None:
+                    value = encoder.encode(values, resolution) # type: ignore
+                if value is not None:
+                    dmx[indices] = value
+        else:
+            numbers = np.broadcast_to(np.asarray(values, dtype=np.float64), (len(plans),))
+            for _, encoder, resolution, indices in groups.values():
+                dmx[indices] = encoder.encodeMany(numbers[indices], resolution) # type: ignore
+        rendered = [i for _, _, _, indices in groups.values() for i in indices if dmx[i] >= 0]
+        if not rendered:
+            return
+        targets = [plans[i]._targets[attribute] for i in rendered]
+        target = PatchPlan.Target.concatenate(targets)
+        target.renderDmx(buffer, np.repeat(dmx[rendered], [len(t) for t in targets]))
+
+    @staticmethod
+    def fraction(entity: Entity) -> float:
+        '''Returns: float - The entity as a fraction between 0 and 1 ("%" and "col" are relative, anything else is a raw 8 bit DMX value).'''
+        number = entity.getBaseUnitEntity().number
+        if entity.unit == "%":
+            number = number / 100
+        elif entity.unit != "col":
+            number = number / 255
+        return max(0.0, min(1.0, number))
+
+    def __repr__(self) -> str:
+        return f"PatchPlan({', '.join('/'.join(key) for key in self._targets.keys())})"
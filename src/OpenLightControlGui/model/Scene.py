@@ -1,21 +1,28 @@
+from OpenLightControlGui.model.Lamp import Lamp
+from OpenLightControlGui.model.MergeEngine import MergeEngine
 from OpenLightControlGui.model.State import State
 from OpenLightControlGui.model.Cuelist import Cuelist
+from OpenLightControlGui.model.UniverseBuffer import UniverseBuffer
+from OpenLightControlGui.model.VersionedDict import VersionedDict
 
-from typing import Dict, List, Optional, Union, Iterable
+from typing import Dict, List, Optional, Tuple, Union, Iterable
 
 class Scene():
     _states: 'Dict[str, State]'
     _cuelists: 'Dict[str, Cuelist]'
+    _rendered: 'Optional[Tuple[Tuple[int, float, str], UniverseBuffer]]' = None
+    _mergeEngine: MergeEngine
     
     def __init__(self, states: 'Optional[Union[State, Iterable[State]]]' = None, cuelists: 'Optional[Union[Cuelist, Iterable[Cuelist]]]' = None) -> None:
-        self._states = {}
+        self._mergeEngine = MergeEngine()
+        self._states = VersionedDict()
         if states:
             if isinstance(states, Iterable):
                 for i, item in enumerate(states):
                     self._states[str(i)] = item
             else:
                 self._states["0"] = states
-        self._cuelists = {}
+        self._cuelists = VersionedDict()
         if cuelists:
             if isinstance(cuelists, Cuelist):
                 self._cuelists["0"] = cuelists
@@ -34,6 +41,10 @@ class Scene():
     
     def getCuelists(self) -> 'Dict[str, Cuelist]':
         return self._cuelists
+
+    @property
+    def lamps(self) -> 'List[Lamp]':
+        return [lamp for state in self._states.values() for lamp in state.group.getLamps()] + [lamp for cuelist in self._cuelists.values() for lamp in cuelist.lamps]
     
     def addState(self, state: State, name: Optional[str] = None):
         if not name:
@@ -59,27 +70,37 @@ class Scene():
         except KeyError:
             pass
     
+    @property
+    def version(self) -> int:
+        return max([self._states.version, self._cuelists.version]
+                   + [state.version for state in self._states.values()]
+                   + [cuelist.version for cuelist in self._cuelists.values()])
+
+    @property
+    def stamp(self) -> int:
+        '''The LTP timestamp, see State.stamp.'''
+        return max([self._states.version, self._cuelists.version]
+                   + [state.stamp for state in self._states.values()]
+                   + [cuelist.stamp for cuelist in self._cuelists.values()])
+
     def __repr__(self) -> str:
         return f"Scene of {self._states} and {self._cuelists}"
     
     def getDmxState(self, faderval: float = 1, fadertype: str = "Intensity") -> 'Dict[int, List[int]]':
-        def combine_universes(base: 'Dict[int, List[int]]', adding: 'Dict[int, List[int]]'):
-            for num, universe in adding.items():
-                if not base.get(num):
-                    base[num] = universe
-                else:
-                    for i, channel in enumerate(universe):
-                        base[num][i] = channel #max(base[num][i], 
-
-        universes: 'Dict[int, List[int]]' = {}
+        return self.getDmxBuffer(faderval, fadertype).toDict()
 
+    def getDmxBuffer(self, faderval: float = 1, fadertype: str = "Intensity") -> UniverseBuffer:
+        '''The result is cached until the version changes, so it must not be modified.'''
+        key = (self.version, faderval, fadertype)
+        if self._rendered is not None and self._rendered[0] == key:
+            return self._rendered[1]
         if fadertype != "Intensity":
             print("!WARNING!: fadertype not yet supported")
-        
-        for state in self._states.values():
-            combine_universes(universes, state.getDmxState(faderval))
 
-        for cuelist in self._cuelists.values():
-            combine_universes(universes, cuelist.getDmxState())
-        
+        sources = list(self._states.values()) + list(self._cuelists.values())
+        buffers = [state.getDmxBuffer(faderval) for state in self._states.values()] + [cuelist.getDmxBuffer() for cuelist in self._cuelists.values()]
+        self._mergeEngine.setLamps(self.lamps)
+        universes = self._mergeEngine.merge(buffers, [source.stamp for source in sources])
+
+        self._rendered = (key, universes)
         return universes
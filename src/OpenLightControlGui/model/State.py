@@ -1,22 +1,27 @@
-from typing import Dict, Iterable, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from OpenLightControlGui.fixture_model.Entity import Entity
 
 from OpenLightControlGui.model.Lamp import Lamp
+from OpenLightControlGui.model.PatchPlan import PatchPlan
 from OpenLightControlGui.model.Group import Group
 from OpenLightControlGui.model.LampState import LampState
+from OpenLightControlGui.model.UniverseBuffer import UniverseBuffer
+from OpenLightControlGui.model.VersionedDict import nextVersion
 
 class State():
     _group: 'Group'
     _state: 'LampState'
+    _version: int = 0
+    _rendered: 'Optional[Tuple[Tuple[int, float], UniverseBuffer]]' = None
 
     def __init__(self, groups: 'Optional[Union[Lamp, Iterable[Lamp], Group, Iterable[Group]]]' = None, state: 'Optional[Union[LampState, Iterable[LampState]]]' = None) -> None:
         self._group = Group()
         if groups:
-            if isinstance(groups, Iterable):
+            if isinstance(groups, (Lamp, Group)):
+                self.addItem(groups)
+            else:
                 for item in groups:
                     self.addItem(item)
-            else:
-                self.addItem(groups)
         
         self._state = LampState()
         if state:
@@ -30,7 +35,8 @@ class State():
         self.addGroup(Group(lamp))
     
     def removeLamp(self, lamp: Lamp) -> None:
-        if self._group.includes(lamp):
+        '''Removes the lamp itself (by identity) wherever it is in the group, e.g. nested through addLamp.'''
+        if lamp in self._group:
             self._group -= lamp
 
     def addGroup(self, group: Group) -> None:
@@ -46,12 +52,13 @@ class State():
     @group.setter
     def group(self, group: 'Group'):
         self._group = group
+        self._version = nextVersion()
 
     def getGroup(self) -> 'Group':
         return self.group
 
     def setGroup(self, group: 'Group'):
-        self._group = group
+        self.group = group
 
     def addItem(self, item: Union[Lamp, Group]) -> None:
         if isinstance(item, Lamp):
@@ -68,13 +75,14 @@ class State():
             self.removeLamp(item)
     
     def addState(self, state: LampState) -> None:
-        if self._state:
-            self._state += state
-        else:
-            self._state = state
+        '''Adds state as a layer, so later changes of it (e.g. of a palette) show up here without copying.'''
+        self._state.addLayer(state)
     
     def removeState(self, state: LampState) -> None:
-        self._state -= state
+        if any(layer is state for layer in self._state.layers):
+            self._state.removeLayer(state)
+        else:
+            self._state -= state
 
     @property
     def state(self) -> LampState:
@@ -83,6 +91,7 @@ class State():
     @state.setter
     def state(self, state: LampState) -> None:
         self._state = state
+        self._version = nextVersion()
 
     def getState(self) -> LampState:
         return self.state
@@ -90,70 +99,67 @@ class State():
     def setState(self, state: LampState) -> None:
         self.state = state
 
+    @property
+    def version(self) -> int:
+        return max(self._version, self._group.version, self._state.version, Lamp.patchVersion)
+
+    @property
+    def stamp(self) -> int:
+        '''The LTP timestamp: changes only with the state's own values and lamps, repatching any lamp leaves it untouched.'''
+        return max(self._version, self._group.version, self._state.version)
+
     def __repr__(self) -> str:
         return f"State of {self.group}"
 
     def getDmxState(self, faderval: float = 1) -> 'Dict[int, List[int]]':
-        universes: 'Dict[int, List[int]]' = {}
-        for lamp in self.group.getLamps():
-            for address in lamp.address:
-                if not address.universe in universes.keys():
-                    universes[address.universe] = [0]*512
-            cap = lamp.capabilities
-            if self.state:
-                if self.state.Intensity:
-                    if self.state.Intensity.Intensity:
-                        if isinstance(self.state.Intensity.Intensity, Entity):
-                            if isinstance(cap['Intensity'], int):
-                                for address in lamp.address:
-                                    if self.state.Intensity.Intensity.unit == "%":
-                                        val = self.state.Intensity.Intensity.getBaseUnitEntity().number / 100 * 255
-                                    else:
-                                        val = self.state.Intensity.Intensity.getBaseUnitEntity().number
-                                    universes[address.universe][address.address + cap['Intensity']] = int(val * faderval) # type: ignore
-                            elif isinstance(cap['Intensity'], dict):
-                                val = self.state.Intensity.Intensity.getBaseUnitEntity().number
-                                ls = sorted(cap['Intensity'].items(), reverse=True) # type: ignore
-                                for address in lamp.address:
-                                    if self.state.Intensity.Intensity.unit == "%":
-                                        val = val / 100
-                                        val = int(val * faderval * (2**(8*ls[0][0])-1)).to_bytes(ls[0][0], "big") # type: ignore
-                                        for res, num in cap['Intensity'].items():
-                                            universes[address.universe][address.address + num] = val[res-1] # type: ignore
-                                    else:
-                                        val = int(val * faderval * (2**(8*ls[0][0])-1)).to_bytes(ls[0][0], "big") # type: ignore
-                                        for res, num in cap['Intensity'].items():
-                                            universes[address.universe][address.address + num] = val[res-1] # type: ignore
-
-                if self.state.Position:
-                    pass
-                if self.state.Color:
-                    if isinstance(cap['Color'], dict):
-                        for coltype in ["Red", "Green", "Blue"]:
-                            if coltype in cap['Color'].keys() and isinstance(getattr(self.state.Color, coltype), Entity):
-                                if isinstance(cap['Color'][coltype], int):
-                                    for address in lamp.address:
-                                        if getattr(self.state.Color, coltype).unit == "col":
-                                            val = int(getattr(self.state.Color, coltype).getBaseUnitEntity().number * 255)
-                                        else:
-                                            val = int(getattr(self.state.Color, coltype).getBaseUnitEntity().number)
-                                        universes[address.universe][address.address + cap['Color'][coltype]] = val  # type: ignore
-                                elif isinstance(cap['Color'][coltype], dict):
-                                    val = getattr(self.state.Color, coltype).getBaseUnitEntity().number
-                                    ls = sorted(cap['Color'][coltype].items(), reverse=True) # type: ignore
-                                    for address in lamp.address:
-                                        if getattr(self.state.Color, coltype).unit == "col":
-                                            val = int(val * (2**(8*ls[0][0])-1)).to_bytes(ls[0][0], "big") # type: ignore
-                                            for res, num in cap['Color'][coltype].items(): # type: ignore
-                                                universes[address.universe][address.address + num] = val[res-1] # type: ignore
-                                        else:
-                                            val = int(val).to_bytes(ls[0][0], "big") # type: ignore
-                                            for res, num in cap['Color'][coltype].items(): # type: ignore
-                                                universes[address.universe][address.address + num] = val[res-1] # type: ignore
-
-                if self.state.Beam:
-                    pass
-                if self.state.Maintenance:
-                    pass
-        
+        return self.getDmxBuffer(faderval).toDict()
+
+    def _attributeValues(self, faderval: float = 1) -> 'Dict[Tuple[str, str], float]':
+        values: 'Dict[Tuple[str, str], float]' = {}
+        if self.state.Intensity and isinstance(self.state.Intensity.Intensity, Entity):
+            values[("Intensity", "Intensity")] = PatchPlan.fraction(self.state.Intensity.Intensity) * faderval
+        if self.state.Color:
+            for coltype in ["Red", "Green", "Blue"]:
+                if isinstance(getattr(self.state.Color, coltype), Entity):
+                    values[("Color", coltype)] = PatchPlan.fraction(getattr(self.state.Color, coltype))
+        if self.state.Position:
+            for axis in ["Pan", "Tilt"]:
+                entity = getattr(self.state.Position, axis)
+                if isinstance(entity, Entity) and entity.unit in ("%", "col", ""):
+                    values[("Position", axis)] = PatchPlan.fraction(entity)
+        return values
+
+    def _encodedValues(self) -> 'Dict[Tuple[str, str], Union[Entity, str]]':
+        '''Returns: the position values in physical units (angles) and the beam values (wheel slots, prism, focus), rendered through the capabilities of every mode.'''
+        values: 'Dict[Tuple[str, str], Union[Entity, str]]' = {}
+        if self.state.Position:
+            for axis in ["Pan", "Tilt"]:
+                entity = getattr(self.state.Position, axis)
+                if isinstance(entity, Entity) and not entity.unit in ("%", "col", ""):
+                    values[("Position", axis)] = entity
+        if self.state.Beam:
+            for beamtype in ["Gobo", "Gobo2", "Prism", "Focus"]:
+                value = getattr(self.state.Beam, beamtype)
+                if isinstance(value, (Entity, str)):
+                    values[("Beam", beamtype)] = value
+        return values
+
+    def getDmxBuffer(self, faderval: float = 1) -> UniverseBuffer:
+        '''The result is cached until the version changes, so it must not be modified.'''
+        key = (self.version, faderval)
+        if self._rendered is not None and self._rendered[0] == key:
+            return self._rendered[1]
+        universes = UniverseBuffer()
+        plans = [lamp.patchPlan for lamp in self.group.getLamps()]
+        for plan in plans:
+            universes.addUniverses(plan.universes)
+        if self.state:
+            for attribute, value in self._attributeValues(faderval).items():
+                targets = [plan.targets[attribute] for plan in plans if attribute in plan.targets]
+                if targets:
+                    PatchPlan.Target.concatenate(targets).render(universes, value)
+            for attribute, entity in self._encodedValues().items():
+                PatchPlan.renderEncoded(universes, plans, attribute, entity)
+
+        self._rendered = (key, universes)
         return universes
@@ -0,0 +1,193 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+UNIVERSE_SIZE = 512
+
+
+class UniverseBuffer():
+    '''
+    DMX output of any number of universes, stored as one contiguous ``universes x 512`` uint8 array.
+    Rows returned by `getUniverse`/`__getitem__` are views and stay valid until a new universe is added.
+    Alongside the values a mask of touched slots is kept, i.e. slots a source actually set, which LTP merging relies on.
+    '''
+    _rows: 'Dict[int, int]'
+    _data: 'np.ndarray'
+    _touched: 'np.ndarray'
+
+    def __init__(self, universes: 'Optional[Dict[int, Iterable[int]]]' = None) -> None:
+        self._rows = {}
+        self._data = np.zeros((0, UNIVERSE_SIZE), dtype=np.uint8)
+        self._touched = np.zeros((0, UNIVERSE_SIZE), dtype=bool)
+        if universes:
+            for num, values in universes.items():
+                values = np.asarray(list(values), dtype=np.uint8)
+                self.addUniverse(num)[:len(values)] = values
+                self._touched[self._rows[num], :len(values)] = True
+
+    @classmethod
+    def fromDict(cls, universes: 'Dict[int, Iterable[int]]') -> 'UniverseBuffer':
+        return cls(universes)
+
+    def toDict(self) -> 'Dict[int, List[int]]':
+        '''Returns: Dict[int, List[int]] - The universes in the list based format used before UniverseBuffer existed.'''
+        data = self.data
+        return {num: data[row].tolist() for num, row in self._rows.items()}
+
+    def _grow(self, count: int) -> None:
+        if count > len(self._data):
+            data = np.zeros((max(count, 2 * len(self._data), 4), UNIVERSE_SIZE), dtype=np.uint8)
+            data[:len(self._rows)] = self._data[:len(self._rows)]
+            self._data = data
+            touched = np.zeros(data.shape, dtype=bool)
+            touched[:len(self._rows)] = self._touched[:len(self._rows)]
+            self._touched = touched
+
+    def addUniverse(self, num: int) -> 'np.ndarray':
+        row = self._rows.get(num)
+        if row is None:
+            row = len(self._rows)
+            self._grow(row + 1)
+            self._rows[num] = row
+        return self._data[row]
+
+    def addUniverses(self, nums: 'Iterable[int]') -> None:
+        new = [num for num in dict.fromkeys(nums) if num not in self._rows]
+        if new:
+            self._grow(len(self._rows) + len(new))
+            for num in new:
+                self._rows[num] = len(self._rows)
+
+    def getUniverse(self, num: int) -> 'Optional[np.ndarray]':
+        row = self._rows.get(num)
+        if row is None:
+            return None
+        return self._data[row]
+
+    def rowsOf(self, nums: 'Iterable[int]') -> 'np.ndarray':
+        '''Returns: np.ndarray - The row indices of the given universes, adding missing universes.'''
+        nums = np.asarray(nums, dtype=np.int64)
+        if len(nums) == 0:
+            return nums
+        unique, inverse = np.unique(nums, return_inverse=True)
+        self.addUniverses(unique.tolist())
+        rows = np.fromiter((self._rows[num] for num in unique.tolist()), dtype=np.int64, count=len(unique))
+        return rows[inverse]
+
+    def scatter(self, universes: 'Iterable[int]', slots: 'Iterable[int]', values: 'Iterable[int]') -> None:
+        '''Writes values to the given (universe, slot) pairs in one vectorized assignment.'''
+        rows = self.rowsOf(universes)
+        if len(rows):
+            slots = np.asarray(slots, dtype=np.int64)
+            self._data[rows, slots] = np.clip(np.asarray(values), 0, 255)
+            self._touched[rows, slots] = True
+
+    def touch(self, num: int, slots: 'Optional[Iterable[int]]' = None) -> None:
+        '''Marks slots (or the whole universe) as touched after writing to a row view directly.'''
+        self.addUniverse(num)
+        row = self._rows[num]
+        if slots is None:
+            self._touched[row] = True
+        else:
+            self._touched[row, np.asarray(list(slots), dtype=np.int64)] = True
+
+    @property
+    def universes(self) -> 'List[int]':
+        return list(self._rows.keys())
+
+    @property
+    def data(self) -> 'np.ndarray':
+        '''The used part of the underlying array, one row per universe in the order of `universes`.'''
+        return self._data[:len(self._rows)]
+
+    @property
+    def touched(self) -> 'np.ndarray':
+        '''The touched mask of the used part of the array, shaped like `data`.'''
+        return self._touched[:len(self._rows)]
+
+    def copy(self) -> 'UniverseBuffer':
+        new = UniverseBuffer()
+        new._rows = self._rows.copy()
+        new._data = self.data.copy()
+        new._touched = self.touched.copy()
+        return new
+
+    def _align(self, o: 'UniverseBuffer') -> 'Tuple[np.ndarray, np.ndarray]':
+        '''Returns: (rows in self, rows in o) for all universes of o, adding them to self where missing.'''
+        nums = list(o._rows.keys())
+        return self.rowsOf(nums), np.fromiter(o._rows.values(), dtype=np.int64, count=len(nums))
+
+    def mergeHTP(self, o: 'UniverseBuffer') -> 'UniverseBuffer':
+        own, other = self._align(o)
+        self._data[own] = np.maximum(self._data[own], o._data[other])
+        self._touched[own] |= o._touched[other]
+        return self
+
+    def mergeLTP(self, o: 'UniverseBuffer') -> 'UniverseBuffer':
+        '''Takes over every slot o touched.'''
+        own, other = self._align(o)
+        touched = o._touched[other]
+        self._data[own] = np.where(touched, o._data[other], self._data[own])
+        self._touched[own] |= touched
+        return self
+
+    def scale(self, factor: float) -> 'UniverseBuffer':
+        if factor != 1:
+            data = self.data
+            data[:] = (data * max(0.0, min(1.0, factor))).astype(np.uint8)
+        return self
+
+    @classmethod
+    def crossfade(cls, start: 'UniverseBuffer', end: 'UniverseBuffer', ti: float) -> 'UniverseBuffer':
+        '''Returns: UniverseBuffer - The linear interpolation between start (ti=0) and end (ti=1) for every universe of both.'''
+        new = start.copy()
+        own, other = new._align(end)
+        data = new.data
+        target = np.zeros_like(data)
+        target[own] = end._data[other]
+        ti = max(0.0, min(1.0, ti))
+        data[:] = (data * (1 - ti) + target * ti).astype(np.uint8)
+        new._touched[own] |= end._touched[other]
+        return new
+
+    def keys(self) -> 'List[int]':
+        return self.universes
+
+    def items(self) -> 'Iterator[Tuple[int, np.ndarray]]':
+        data = self.data
+        return ((num, data[row]) for num, row in self._rows.items())
+
+    def get(self, num: int, default: 'Optional[np.ndarray]' = None) -> 'Optional[np.ndarray]':
+        universe = self.getUniverse(num)
+        return default if universe is None else universe
+
+    def __getitem__(self, num: int) -> 'np.ndarray':
+        universe = self.getUniverse(num)
+        if universe is None:
+            raise KeyError(num)
+        return universe
+
+    def __contains__(self, num: object) -> bool:
+        return num in self._rows
+
+    def __iter__(self) -> 'Iterator[int]':
+        return iter(self._rows.keys())
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __bool__(self) -> bool:
+        return len(self._rows) > 0
+
+    def __eq__(self, o: object) -> bool:
+        if isinstance(o, dict):
+            return self.toDict() == o
+        if not isinstance(o, UniverseBuffer):
+            return NotImplemented
+        if self._rows.keys() != o._rows.keys():
+            return False
+        own, other = self._align(o)
+        return bool(np.array_equal(self._data[own], o._data[other]))
+
+    def __repr__(self) -> str:
+        return f"UniverseBuffer({self.universes})"
@@ -0,0 +1,68 @@
+from typing import Any
+import itertools
+
+_versions = itertools.count(1)
+_latest = 0
+
+
+def nextVersion() -> int:
+    '''Returns: int - A new version, greater than every version handed out before.'''
+    global _latest
+    _latest = next(_versions)
+    return _latest
+
+
+def latestVersion() -> int:
+    '''Returns: int - The last version handed out, while it is unchanged no versioned object has changed.'''
+    return _latest
+
+
+class VersionedDict(dict):
+    '''
+    A dict that takes a new version on every modification.
+    Versions come from one global counter, so the maximum over several objects changes whenever any of them changes.
+    '''
+    version: int
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = nextVersion()
+
+    def _touch(self) -> None:
+        self.version = nextVersion()
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._touch()
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        self._touch()
+
+    def __ior__(self, o: Any) -> 'VersionedDict':
+        super().__ior__(o)
+        self._touch()
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._touch()
+
+    def pop(self, *args: Any) -> Any:
+        value = super().pop(*args)
+        self._touch()
+        return value
+
+    def popitem(self) -> Any:
+        item = super().popitem()
+        self._touch()
+        return item
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        value = super().setdefault(key, default)
+        self._touch()
+        return value
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._touch()
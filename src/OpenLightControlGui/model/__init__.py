@@ -5,8 +5,10 @@ from .Effect import Effect
 from .Group import Group
 from .Lamp import Lamp
 from .LampState import LampState
+from .Patch import Patch
 from .Scene import Scene
 from .State import State
+from .UniverseBuffer import UniverseBuffer
 
 __all__ = [
     "Address",
@@ -16,6 +18,8 @@ __all__ = [
     "Group",
     "Lamp",
     "LampState",
+    "Patch",
     "Scene",
-    "State"
+    "State",
+    "UniverseBuffer"
 ]
@@ -0,0 +1,18 @@
+from OpenLightControlGui.model.UniverseBuffer import UniverseBuffer
+
+
+class AbstractSink():
+    '''Base class for everything the OutputEngine publishes DMX frames to.'''
+
+    def __str__(self) -> str:
+        return f"Sink <{self.__class__.__name__}>"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def send(self, frame: UniverseBuffer) -> None:
+        raise TypeError(
+            f"Class {self.__class__.__name__} must implement send")
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,53 @@
+from typing import Optional, Tuple
+import socket
+import struct
+
+from OpenLightControlGui.model.UniverseBuffer import UNIVERSE_SIZE
+from OpenLightControlGui.output.UdpSink import UdpSink
+
+ARTNET_ID = b"Art-Net\x00"
+OP_DMX = 0x5000
+PROTOCOL_VERSION = 14
+
+
+class ArtNetSink(UdpSink):
+    '''
+    Sends universes as Art-Net ArtDmx packets.
+    Universes are used as 15 bit port-addresses (net, sub-net and universe) after adding universeOffset.
+    Without a host the packets are broadcast, with a host they are unicast to it.
+    '''
+    DATA_OFFSET = 18
+    DEFAULT_PORT = 6454
+
+    _physical: int
+
+    def __init__(self, host: 'Optional[str]' = None, port: 'Optional[int]' = None, universeOffset: int = 0, physical: int = 0, keepAlive: float = 1.0, sock: 'Optional[socket.socket]' = None) -> None:
+        self._physical = physical
+        super().__init__(host, port, universeOffset, keepAlive, sock)
+
+    def _createSocket(self) -> socket.socket:
+        sock = super()._createSocket()
+        if self._host is None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        return sock
+
+    def _buildPacket(self, universe: int) -> bytearray:
+        if not 0 <= universe <= 0x7fff:
+            raise ValueError(f"Art-Net port-address {universe} is out of range 0-32767")
+        header = ARTNET_ID + struct.pack("<H", OP_DMX) + struct.pack(">HBBBBH", PROTOCOL_VERSION, 0, self._physical, universe & 0xff, universe >> 8, UNIVERSE_SIZE)
+        return bytearray(header) + bytearray(UNIVERSE_SIZE)
+
+    def _nextSequence(self, sequence: int) -> int:
+        # 0 disables sequencing in Art-Net, so the counter runs from 1 to 255
+        return sequence % 255 + 1
+
+    def _writeSequence(self, packet: bytearray, sequence: int) -> None:
+        packet[12] = sequence
+
+    @staticmethod
+    def parsePacket(packet: bytes) -> 'Tuple[int, int, bytes]':
+        '''Returns: (port-address, sequence, slot data) of an ArtDmx packet.'''
+        if packet[:8] != ARTNET_ID or struct.unpack("<H", packet[8:10])[0] != OP_DMX:
+            raise ValueError("not an ArtDmx packet")
+        sequence, _, subuni, net, length = struct.unpack(">BBBBH", packet[12:18])
+        return (net << 8 | subuni, sequence, bytes(packet[18:18 + length]))
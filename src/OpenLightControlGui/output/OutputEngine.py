@@ -0,0 +1,195 @@
+from typing import Iterable, List, Optional, Tuple, Union
+import threading
+import time
+
+from OpenLightControlGui.model.Cuelist import Cuelist
+from OpenLightControlGui.model.MergeEngine import MergeEngine
+from OpenLightControlGui.model.Scene import Scene
+from OpenLightControlGui.model.UniverseBuffer import UniverseBuffer
+from OpenLightControlGui.output.AbstractSink import AbstractSink
+
+_source = Union[Scene, Cuelist]
+
+
+class OutputEngine():
+    '''
+    Renders all sources at a fixed rate in its own thread and publishes every frame to all sinks.
+    Ticks are scheduled against absolute deadlines, so a slow GUI never shifts the output clock.
+    '''
+
+    class Statistics():
+        frames: int = 0
+        overruns: int = 0
+        sinkErrors: int = 0
+        lastJitter: float = 0.0
+        maxJitter: float = 0.0
+        _jitterSum: float = 0.0
+        lastTickDuration: float = 0.0
+        maxTickDuration: float = 0.0
+
+        @property
+        def meanJitter(self) -> float:
+            return self._jitterSum / self.frames if self.frames else 0.0
+
+        def _record(self, jitter: float, duration: float) -> None:
+            self.frames += 1
+            self.lastJitter = jitter
+            self.maxJitter = max(self.maxJitter, jitter)
+            self._jitterSum += jitter
+            self.lastTickDuration = duration
+            self.maxTickDuration = max(self.maxTickDuration, duration)
+
+        def copy(self) -> 'OutputEngine.Statistics':
+            new = OutputEngine.Statistics()
+            new.__dict__.update(self.__dict__)
+            return new
+
+        def __repr__(self) -> str:
+            return (f"Statistics(frames={self.frames}, overruns={self.overruns}, sinkErrors={self.sinkErrors}, "
+                    f"meanJitter={self.meanJitter * 1000:.3f}ms, maxJitter={self.maxJitter * 1000:.3f}ms, "
+                    f"maxTickDuration={self.maxTickDuration * 1000:.3f}ms)")
+
+    _sources: 'List[_source]'
+    _sinks: 'List[AbstractSink]'
+    _rate: float
+    _frame: UniverseBuffer
+    _mergeEngine: MergeEngine
+    _statistics: 'OutputEngine.Statistics'
+    _lock: threading.Lock
+    _stopEvent: threading.Event
+    _thread: 'Optional[threading.Thread]' = None
+    _lastError: 'Optional[Exception]' = None
+    _renderedVersions: 'Optional[Tuple[Tuple[int, int], ...]]' = None
+
+    def __init__(self, sources: 'Optional[Iterable[_source]]' = None, sinks: 'Optional[Iterable[AbstractSink]]' = None, rate: float = 44) -> None:
+        self._sources = list(sources) if sources else []
+        self._sinks = list(sinks) if sinks else []
+        self.rate = rate
+        self._frame = UniverseBuffer()
+        self._mergeEngine = MergeEngine()
+        self._statistics = OutputEngine.Statistics()
+        self._lock = threading.Lock()
+        self._stopEvent = threading.Event()
+
+    def addSource(self, source: '_source') -> None:
+        with self._lock:
+            self._sources = self._sources + [source]
+
+    def removeSource(self, source: '_source') -> None:
+        with self._lock:
+            self._sources = [s for s in self._sources if s is not source]
+
+    @property
+    def sources(self) -> 'List[_source]':
+        return list(self._sources)
+
+    def addSink(self, sink: AbstractSink) -> None:
+        with self._lock:
+            self._sinks = self._sinks + [sink]
+
+    def removeSink(self, sink: AbstractSink) -> None:
+        with self._lock:
+            self._sinks = [s for s in self._sinks if s is not sink]
+
+    @property
+    def sinks(self) -> 'List[AbstractSink]':
+        return list(self._sinks)
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be a positive number of frames per second")
+        self._rate = float(rate)
+
+    @property
+    def period(self) -> float:
+        return 1 / self._rate
+
+    @property
+    def frame(self) -> UniverseBuffer:
+        return self._frame
+
+    @property
+    def statistics(self) -> 'OutputEngine.Statistics':
+        return self._statistics.copy()
+
+    @property
+    def lastError(self) -> 'Optional[Exception]':
+        return self._lastError
+
+    def resetStatistics(self) -> None:
+        self._statistics = OutputEngine.Statistics()
+
+    def render(self) -> UniverseBuffer:
+        '''
+        Merges all sources by the precedence of their channels, LTP slots go to the most recently changed source.
+        Returns the previous frame as long as no source changed its version.
+        '''
+        sources = self._sources
+        versions = tuple((id(source), source.version) for source in sources)
+        if versions == self._renderedVersions:
+            return self._frame
+        active = [source for source in sources if not (isinstance(source, Cuelist) and not source.isRunning())]
+        self._mergeEngine.setLamps(lamp for source in active for lamp in source.lamps)
+        frame = self._mergeEngine.merge([source.getDmxBuffer() for source in active], [source.stamp for source in active])
+        self._renderedVersions = versions
+        return frame
+
+    def publish(self, frame: UniverseBuffer) -> None:
+        for sink in self._sinks:
+            try:
+                sink.send(frame)
+            except Exception as e:
+                self._statistics.sinkErrors += 1
+                self._lastError = e
+
+    def tick(self) -> UniverseBuffer:
+        '''Renders and publishes one frame right away, independent of the engine thread.'''
+        self._frame = self.render()
+        self.publish(self._frame)
+        return self._frame
+
+    def start(self) -> None:
+        if self.isRunning():
+            return
+        self._stopEvent.clear()
+        self._thread = threading.Thread(target=self._run, name="OutputEngine", daemon=True)
+        self._thread.start()
+
+    def stop(self, close_sinks: bool = False) -> None:
+        self._stopEvent.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if close_sinks:
+            for sink in self._sinks:
+                sink.close()
+
+    def isRunning(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        deadline = time.perf_counter()
+        while not self._stopEvent.is_set():
+            start = time.perf_counter()
+            try:
+                self.tick()
+            except Exception as e:
+                self._lastError = e
+            end = time.perf_counter()
+            self._statistics._record(start - deadline, end - start)
+
+            period = self.period
+            deadline += period
+            if end > deadline:
+                missed = int((end - deadline) / period) + 1
+                self._statistics.overruns += missed
+                deadline += missed * period
+            self._stopEvent.wait(deadline - time.perf_counter())
+
+    def __repr__(self) -> str:
+        return f"OutputEngine({self._rate:g}Hz, {len(self._sources)} sources, {len(self._sinks)} sinks)"
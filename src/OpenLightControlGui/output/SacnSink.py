@@ -0,0 +1,93 @@
+from typing import Optional, Tuple
+import socket
+import struct
+import uuid
+
+from OpenLightControlGui.model.UniverseBuffer import UNIVERSE_SIZE
+from OpenLightControlGui.output.UdpSink import UdpSink
+
+ACN_PACKET_IDENTIFIER = b"ASC-E1.17\x00\x00\x00"
+VECTOR_ROOT_E131_DATA = 0x00000004
+VECTOR_E131_DATA_PACKET = 0x00000002
+VECTOR_DMP_SET_PROPERTY = 0x02
+PACKET_SIZE = 126 + UNIVERSE_SIZE
+
+
+class SacnSink(UdpSink):
+    '''
+    Sends universes as sACN (ANSI E1.31) data packets.
+    Universes are used as sACN universes after adding universeOffset (1 by default, as sACN starts counting at 1).
+    Without a host every universe goes to its multicast group, with a host they are unicast to it.
+    '''
+    DATA_OFFSET = 126
+    DEFAULT_PORT = 5568
+
+    _cid: bytes
+    _sourceName: str
+    _priority: int
+
+    def __init__(self, host: 'Optional[str]' = None, port: 'Optional[int]' = None, universeOffset: int = 1, sourceName: str = "OpenLightControl", priority: int = 100, cid: 'Optional[bytes]' = None, keepAlive: float = 1.0, sock: 'Optional[socket.socket]' = None) -> None:
+        if not 0 <= priority <= 200:
+            raise ValueError("sACN priority must be between 0 and 200")
+        self._cid = cid if cid is not None else uuid.uuid4().bytes
+        if len(self._cid) != 16:
+            raise ValueError("sACN CID must be 16 bytes")
+        self._sourceName = sourceName
+        self._priority = priority
+        super().__init__(host, port, universeOffset, keepAlive, sock)
+
+    def _createSocket(self) -> socket.socket:
+        sock = super()._createSocket()
+        if self._host is None:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 8)
+        return sock
+
+    @property
+    def cid(self) -> bytes:
+        return self._cid
+
+    @property
+    def sourceName(self) -> str:
+        return self._sourceName
+
+    @property
+    def priority(self) -> int:
+        return self._priority
+
+    @staticmethod
+    def multicastAddress(universe: int) -> str:
+        return f"239.255.{universe >> 8}.{universe & 0xff}"
+
+    def _destination(self, universe: int) -> 'Tuple[str, int]':
+        return (self._host or self.multicastAddress(universe), self._port)
+
+    def _buildPacket(self, universe: int) -> bytearray:
+        if not 1 <= universe <= 63999:
+            raise ValueError(f"sACN universe {universe} is out of range 1-63999")
+        packet = bytearray(PACKET_SIZE)
+        # root layer
+        struct.pack_into(">HH12sHI16s", packet, 0, 0x0010, 0x0000, ACN_PACKET_IDENTIFIER,
+                         0x7000 | (PACKET_SIZE - 16), VECTOR_ROOT_E131_DATA, self._cid)
+        # framing layer, sequence number at 111 is filled per frame
+        struct.pack_into(">HI64sBHBBH", packet, 38, 0x7000 | (PACKET_SIZE - 38), VECTOR_E131_DATA_PACKET,
+                         self._sourceName.encode("utf-8")[:63], self._priority, 0, 0, 0, universe)
+        # DMP layer, start code 0 followed by the slot data
+        struct.pack_into(">HBBHHHB", packet, 115, 0x7000 | (PACKET_SIZE - 115), VECTOR_DMP_SET_PROPERTY,
+                         0xa1, 0x0000, 0x0001, UNIVERSE_SIZE + 1, 0)
+        return packet
+
+    def _nextSequence(self, sequence: int) -> int:
+        return (sequence + 1) % 256
+
+    def _writeSequence(self, packet: bytearray, sequence: int) -> None:
+        packet[111] = sequence
+
+    @staticmethod
+    def parsePacket(packet: bytes) -> 'Tuple[int, int, bytes]':
+        '''Returns: (universe, sequence, slot data) of an sACN data packet.'''
+        if packet[4:16] != ACN_PACKET_IDENTIFIER or struct.unpack(">I", packet[18:22])[0] != VECTOR_ROOT_E131_DATA:
+            raise ValueError("not an sACN data packet")
+        sequence = packet[111]
+        universe, = struct.unpack(">H", packet[113:115])
+        count, = struct.unpack(">H", packet[123:125])
+        return (universe, sequence, bytes(packet[126:125 + count]))
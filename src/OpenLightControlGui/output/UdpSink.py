@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional, Tuple
+import socket
+import time
+
+import numpy as np
+
+from OpenLightControlGui.model.UniverseBuffer import UniverseBuffer, UNIVERSE_SIZE
+from OpenLightControlGui.output.AbstractSink import AbstractSink
+
+
+class UdpSink(AbstractSink):
+    '''
+    Base class for sinks sending one UDP datagram per universe.
+    Each universe owns a preallocated packet; per frame only the slot data and the sequence number are rewritten in place.
+    Universes are only sent when their content changed or when keepAlive seconds passed since they were last sent.
+    A packet the socket can't take (e.g. a full non-blocking send buffer) is dropped for this frame: its sequence number
+    is not used up and its universe counts as unsent, so the next frame sends it again.
+    '''
+    DATA_OFFSET: int = 0
+    DEFAULT_PORT: int = 0
+
+    _host: 'Optional[str]'
+    _port: int
+    _universeOffset: int
+    _socket: socket.socket
+    _packets: 'Dict[int, bytearray]'
+    _sequences: 'Dict[int, int]'
+    _keepAlive: float
+    _sent: UniverseBuffer
+    _sentAt: 'Dict[int, float]'
+    packetsSent: int = 0
+
+    def __init__(self, host: 'Optional[str]' = None, port: 'Optional[int]' = None, universeOffset: int = 0, keepAlive: float = 1.0, sock: 'Optional[socket.socket]' = None) -> None:
+        self._host = host
+        self._port = port if port is not None else self.DEFAULT_PORT
+        self._universeOffset = universeOffset
+        self._keepAlive = keepAlive
+        self._packets = {}
+        self._sequences = {}
+        self._sent = UniverseBuffer()
+        self._sentAt = {}
+        self._socket = sock if sock is not None else self._createSocket()
+
+    def _createSocket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        return sock
+
+    @property
+    def host(self) -> 'Optional[str]':
+        return self._host
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    @property
+    def universeOffset(self) -> int:
+        return self._universeOffset
+
+    @property
+    def keepAlive(self) -> float:
+        return self._keepAlive
+
+    @keepAlive.setter
+    def keepAlive(self, seconds: float) -> None:
+        self._keepAlive = seconds
+
+    def _buildPacket(self, universe: int) -> bytearray:
+        raise TypeError(
+            f"Class {self.__class__.__name__} must implement _buildPacket")
+
+    def _nextSequence(self, sequence: int) -> int:
+        raise TypeError(
+            f"Class {self.__class__.__name__} must implement _nextSequence")
+
+    def _writeSequence(self, packet: bytearray, sequence: int) -> None:
+        raise TypeError(
+            f"Class {self.__class__.__name__} must implement _writeSequence")
+
+    def _destination(self, universe: int) -> 'Tuple[str, int]':
+        return (self._host or "255.255.255.255", self._port)
+
+    def _fill(self, universe: int, data) -> bytearray:
+        packet = self._packets.get(universe)
+        if packet is None:
+            packet = self._packets[universe] = self._buildPacket(universe + self._universeOffset)
+        memoryview(packet)[self.DATA_OFFSET:self.DATA_OFFSET + UNIVERSE_SIZE] = data
+        sequence = self._sequences[universe] = self._nextSequence(self._sequences.get(universe, 0))
+        self._writeSequence(packet, sequence)
+        return packet
+
+    def sendUniverses(self, frame: UniverseBuffer, universes: 'List[int]') -> None:
+        '''Serializes all given universes first and then sends them in one pass over the socket, recording only the packets that went out.'''
+        previous = [self._sequences.get(universe, 0) for universe in universes]
+        batch = [(self._fill(universe, frame[universe]), self._destination(universe + self._universeOffset)) for universe in universes]
+        sendto = self._socket.sendto
+        sent: 'List[int]' = []
+        for universe, sequence, (packet, destination) in zip(universes, previous, batch):
+            try:
+                sendto(packet, destination)
+            except OSError:
+                self._sequences[universe] = sequence
+                continue
+            sent.append(universe)
+        self.packetsSent += len(sent)
+        now = time.monotonic()
+        for universe in sent:
+            self._sent.addUniverse(universe)[:] = frame[universe]
+            self._sentAt[universe] = now
+
+    def changedUniverses(self, frame: UniverseBuffer) -> 'List[int]':
+        '''Returns: List[int] - The universes of frame that differ from what was sent last or are due for a keep-alive.'''
+        now = time.monotonic()
+        changed = []
+        for universe, data in frame.items():
+            last = self._sent.getUniverse(universe)
+            if last is None or now - self._sentAt[universe] >= self._keepAlive or not np.array_equal(last, data):
+                changed.append(universe)
+        return changed
+
+    def send(self, frame: UniverseBuffer) -> None:
+        universes = self.changedUniverses(frame)
+        if universes:
+            self.sendUniverses(frame, universes)
+
+    def close(self) -> None:
+        self._socket.close()
@@ -0,0 +1,13 @@
+from .AbstractSink import AbstractSink
+from .ArtNetSink import ArtNetSink
+from .OutputEngine import OutputEngine
+from .SacnSink import SacnSink
+from .UdpSink import UdpSink
+
+__all__ = [
+    "AbstractSink",
+    "ArtNetSink",
+    "OutputEngine",
+    "SacnSink",
+    "UdpSink"
+]
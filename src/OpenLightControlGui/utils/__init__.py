@@ -1,5 +1,7 @@
 from . import ofl
+from . import search
 
 __all__ = [
-    "ofl"
+    "ofl",
+    "search"
 ]
@@ -1,18 +1,206 @@
-from typing import Dict
-from OpenLightControlGui.fixture_model import Manufacturer, Fixture
-
-def get_fixtures(ofl: str) -> 'Dict[str, Dict[str, Fixture]]':
-    import os
-    import json
-    with open(ofl+"manufacturers.json") as f:
-        mans: 'Dict[str, Manufacturer]' = {key: Manufacturer(key, val) for key, val in json.load(f).items() if not "$" in key}
-    fixturesByManu: 'Dict[str, Dict[str, Fixture]]' = {}
-    for key, man in mans.items():
-        lis = os.listdir(ofl+key)
-        fixturesByManu[key] = {}
-        for fix in lis:
-            with open(ofl+key+"/"+fix) as f:
-                temp = Fixture(man, fix[:-5], json.load(f))
-            fixturesByManu[key][fix[:-5]] = temp
-    
-    return fixturesByManu
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+import hashlib
+import json
+import os
+
+from OpenLightControlGui.fixture_model import Manufacturer, Fixture, FixtureSummary
+
+INDEX_VERSION = 1
+# below this many changed files spawning worker processes costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+_summary = Dict[str, Any]
+
+
+class LazyFixtures(Mapping[str, Fixture]):
+    '''The fixtures of one manufacturer, each fixture file is only read and parsed on first access.'''
+    _manufacturer: Manufacturer
+    _directory: str
+    _keys: 'List[str]'
+    _fixtures: 'Dict[str, Fixture]'
+
+    def __init__(self, manufacturer: Manufacturer, directory: str, keys: 'List[str]') -> None:
+        self._manufacturer = manufacturer
+        self._directory = directory
+        self._keys = keys
+        self._fixtures = {}
+
+    @property
+    def manufacturer(self) -> Manufacturer:
+        return self._manufacturer
+
+    @property
+    def ofl(self) -> str:
+        '''The fixture library directory the manufacturer's directory is in.'''
+        return os.path.dirname(self._directory)
+
+    def isLoaded(self, key: str) -> bool:
+        return key in self._fixtures
+
+    def __getitem__(self, key: str) -> Fixture:
+        fixture = self._fixtures.get(key)
+        if fixture is None:
+            if not key in self._keys:
+                raise KeyError(key)
+            with open(os.path.join(self._directory, key + ".json")) as f:
+                fixture = self._fixtures[key] = Fixture(self._manufacturer, key, json.load(f))
+        return fixture
+
+    def __iter__(self) -> 'Iterator[str]':
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"LazyFixtures <{self._manufacturer.name}> [{len(self._fixtures)}/{len(self._keys)} loaded]"
+
+
+def _read_manufacturers(ofl: str) -> 'Dict[str, Any]':
+    with open(os.path.join(ofl, "manufacturers.json")) as f:
+        return {key: val for key, val in json.load(f).items() if not "$" in key}
+
+
+def _manufacturers_mtime(ofl: str) -> int:
+    return os.stat(os.path.join(ofl, "manufacturers.json")).st_mtime_ns
+
+
+def _list_fixture_files(ofl: str, man: str) -> 'Dict[str, int]':
+    '''Returns: Dict[str, int] - The mtime (ns) of every fixture file of a manufacturer by fixture key.'''
+    try:
+        with os.scandir(os.path.join(ofl, man)) as entries:
+            return {entry.name[:-5]: entry.stat().st_mtime_ns for entry in entries if entry.name.endswith(".json") and entry.is_file()}
+    except FileNotFoundError:
+        return {}
+
+
+def get_fixtures(ofl: str) -> 'Dict[str, LazyFixtures]':
+    '''
+    Lists all fixtures by manufacturer without parsing them.
+    Returns: Dict[str, LazyFixtures] - A read-only Mapping of fixture key to Fixture per manufacturer (no longer a dict
+    of parsed fixtures), each fixture file is parsed on first access, see LazyFixtures.
+    '''
+    mans = {key: Manufacturer(key, val) for key, val in _read_manufacturers(ofl).items()}
+    return {key: LazyFixtures(man, os.path.join(ofl, key), sorted(_list_fixture_files(ofl, key).keys())) for key, man in mans.items()}
+
+
+def _summarize_file(args: 'Tuple[str, str, Dict[str, Any], str]') -> 'Optional[_summary]':
+    path, man, manJson, key = args
+    try:
+        with open(path) as f:
+            return FixtureSummary.summarize(Fixture(Manufacturer(man, manJson), key, json.load(f)))
+    except Exception:
+        # a broken fixture file should not take the whole library down, it simply stays out of the index
+        return None
+
+
+def default_cache_path(ofl: str) -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    digest = hashlib.sha1(os.path.abspath(ofl).encode()).hexdigest()[:12]
+    return os.path.join(base, "OpenLightControlGui", f"ofl-index-{digest}.json")
+
+
+def get_fixture_summaries(ofl: str, cache: 'Optional[str]' = None, processes: 'Optional[int]' = None) -> 'Dict[str, Dict[str, FixtureSummary]]':
+    '''Returns the fixtures of load_index as FixtureSummary proxies, which load the full fixture only when it is needed.'''
+    index = load_index(ofl, cache, processes)
+    fixtures = get_fixtures(ofl)
+    return {man: _proxies(fixtures[man], summaries) for man, summaries in index.items()}
+
+
+def _proxies(fixtures: LazyFixtures, summaries: 'Dict[str, _summary]') -> 'Dict[str, FixtureSummary]':
+    return {key: FixtureSummary(fixtures.manufacturer, key, summary, lambda key=key: fixtures[key]) for key, summary in summaries.items()}
+
+
+def summarize_fixtures(fixtures: 'Mapping[str, Mapping[str, Union[Fixture, FixtureSummary]]]', cache: 'Optional[str]' = None) -> 'Dict[str, Dict[str, FixtureSummary]]':
+    '''
+    Returns: the given fixtures by manufacturer as FixtureSummary. LazyFixtures are summarized from the index of their
+    library (read once per library) without parsing any fixture file, loaded fixtures with FixtureSummary.fromFixture.
+    '''
+    indexes: 'Dict[str, Dict[str, Dict[str, _summary]]]' = {}
+    summaries: 'Dict[str, Dict[str, FixtureSummary]]' = {}
+    for man, fixs in fixtures.items():
+        if isinstance(fixs, LazyFixtures):
+            if not fixs.ofl in indexes:
+                indexes[fixs.ofl] = load_index(fixs.ofl, cache)
+            summaries[man] = _proxies(fixs, indexes[fixs.ofl].get(man, {}))
+        else:
+            summaries[man] = {key: fix if isinstance(fix, FixtureSummary) else FixtureSummary.fromFixture(fix) for key, fix in fixs.items()}
+    return summaries
+
+
+def _read_cache(cache: str) -> 'Dict[str, Any]':
+    try:
+        with open(cache) as f:
+            data = json.load(f)
+        if data.get("version") == INDEX_VERSION:
+            return data
+    except (OSError, ValueError):
+        pass
+    return {"version": INDEX_VERSION, "fixtures": {}}
+
+
+def _write_cache(cache: str, data: 'Dict[str, Any]') -> None:
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        tmp = f"{cache}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, cache)
+    except OSError:
+        # the index is only a cache, without a writable location it is rebuilt next time
+        pass
+
+
+def _summarize_all(jobs: 'List[Tuple[str, str, Dict[str, Any], str]]', processes: 'Optional[int]') -> 'List[Optional[_summary]]':
+    if processes != 1 and len(jobs) >= PARALLEL_THRESHOLD:
+        from concurrent.futures import ProcessPoolExecutor
+        workers = processes or os.cpu_count() or 1
+        try:
+            with ProcessPoolExecutor(workers) as pool:
+                return list(pool.map(_summarize_file, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+        except (OSError, NotImplementedError, RuntimeError):
+            pass
+    return [_summarize_file(job) for job in jobs]
+
+
+def load_index(ofl: str, cache: 'Optional[str]' = None, processes: 'Optional[int]' = None) -> 'Dict[str, Dict[str, _summary]]':
+    '''
+    Returns the index of all fixtures by manufacturer and fixture key.
+    Entries are reused from the on-disk cache as long as the mtime of their file and of manufacturers.json (which every
+    fixture is parsed with) are unchanged, everything else is parsed again (in a process pool for large numbers of
+    files) and written back to the cache.
+    '''
+    if cache is None:
+        cache = default_cache_path(ofl)
+    data = _read_cache(cache)
+    manufacturersMtime = _manufacturers_mtime(ofl)
+    cached: 'Dict[str, Any]' = data["fixtures"] if data.get("manufacturers") == manufacturersMtime else {}
+    manufacturers = _read_manufacturers(ofl)
+
+    index: 'Dict[str, Dict[str, _summary]]' = {}
+    fixtures: 'Dict[str, Any]' = {}
+    jobs: 'List[Tuple[str, str, Dict[str, Any], str]]' = []
+    mtimes: 'List[int]' = []
+    for man, manJson in manufacturers.items():
+        index[man] = {}
+        for key, mtime in sorted(_list_fixture_files(ofl, man).items()):
+            path = f"{man}/{key}"
+            entry = cached.get(path)
+            if entry is not None and entry["mtime"] == mtime:
+                fixtures[path] = entry
+                if entry["summary"] is not None:
+                    index[man][key] = entry["summary"]
+            else:
+                jobs.append((os.path.join(ofl, man, key + ".json"), man, manJson, key))
+                mtimes.append(mtime)
+
+    for (_, man, _, key), mtime, summary in zip(jobs, mtimes, _summarize_all(jobs, processes)):
+        fixtures[f"{man}/{key}"] = {"mtime": mtime, "summary": summary}
+        if summary is not None:
+            index[man][key] = summary
+    for man in index.keys():
+        index[man] = dict(sorted(index[man].items()))
+
+    if jobs or len(fixtures) != len(cached) or data.get("manufacturers") != manufacturersMtime:
+        _write_cache(cache, {"version": INDEX_VERSION, "manufacturers": manufacturersMtime, "fixtures": fixtures})
+    return index
@@ -0,0 +1,100 @@
+from typing import Dict, List, Mapping, NamedTuple, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from OpenLightControlGui.fixture_model import Fixture, FixtureSummary
+
+
+GRAM = 3
+
+
+def _grams(text: str, size: int = GRAM) -> 'Set[str]':
+    '''Returns: Set[str] - All n-grams of text up to size that do not span a word boundary.'''
+    return {word[i:i + n] for word in text.split() for n in range(1, size + 1) for i in range(len(word) - n + 1)}
+
+
+class FixtureSearchIndex():
+    '''
+    N-gram index (up to trigrams) over manufacturer, fixture and mode names and the categories of every fixture mode.
+    A query matches a mode when every whitespace separated token of it appears (case-insensitive) in those texts.
+    Tokens up to three characters are answered by their posting alone, longer ones are checked against the text.
+    While a query only grows, the next search narrows down the previous results instead of starting over.
+    '''
+
+    class Item(NamedTuple):
+        manufacturer: str
+        manufacturerName: str
+        key: str
+        fixtureName: str
+        mode: str
+        channels: int
+
+    _items: 'List[FixtureSearchIndex.Item]'
+    _texts: 'List[str]'
+    _lists: 'Dict[str, List[int]]'
+    _postings: 'Dict[str, np.ndarray]'
+    _last: 'Optional[Tuple[List[str], np.ndarray]]' = None
+
+    def __init__(self, fixtures: 'Optional[Mapping[str, Mapping[str, Union[Fixture, FixtureSummary]]]]' = None) -> None:
+        self._items = []
+        self._texts = []
+        self._lists = {}
+        self._postings = {}
+        if fixtures:
+            for man, fixs in fixtures.items():
+                for fixture in fixs.values():
+                    self.addFixture(man, fixture)
+
+    def addFixture(self, man: str, fixture: 'Union[Fixture, FixtureSummary]') -> None:
+        fixtureText = f"{fixture.manufacturer.name} {fixture.name} {' '.join(fixture.categories)}".lower()
+        fixtureGrams = _grams(fixtureText)
+        for mode in fixture.modes:
+            channels = mode.channelCount if isinstance(fixture, FixtureSummary) else len(mode.channelKeys)
+            num = len(self._items)
+            self._items.append(FixtureSearchIndex.Item(man, fixture.manufacturer.name, fixture.key, fixture.name, mode.name, channels))
+            modeText = mode.name.lower()
+            self._texts.append(f"{fixtureText} {modeText}")
+            for gram in fixtureGrams | _grams(modeText):
+                self._lists.setdefault(gram, []).append(num)
+        # postings are turned into arrays again on their next use
+        self._postings = {}
+        self._last = None
+
+    def _posting(self, gram: str) -> 'np.ndarray':
+        posting = self._postings.get(gram)
+        if posting is None:
+            posting = self._postings[gram] = np.asarray(self._lists.get(gram, []), dtype=np.int64)
+        return posting
+
+    def search(self, query: str) -> 'List[int]':
+        '''Returns: List[int] - The numbers of all matching items in the order they were added.'''
+        tokens = query.lower().split()
+        if not tokens:
+            self._last = None
+            return list(range(len(self._items)))
+
+        candidates: 'Optional[np.ndarray]' = None
+        if self._last is not None and all(any(old in token for token in tokens) for old in self._last[0]):
+            candidates = self._last[1]
+        for token in tokens:
+            grams = [token] if len(token) <= GRAM else [token[i:i + GRAM] for i in range(len(token) - GRAM + 1)]
+            for gram in grams:
+                posting = self._posting(gram)
+                candidates = posting if candidates is None else np.intersect1d(candidates, posting, assume_unique=True)
+
+        texts = self._texts
+        long = [token for token in tokens if len(token) > GRAM]
+        result = candidates
+        if long:
+            result = np.fromiter((num for num in candidates.tolist() if all(token in texts[num] for token in long)), dtype=np.int64)
+        self._last = (tokens, result)
+        return result.tolist()
+
+    def item(self, num: int) -> 'FixtureSearchIndex.Item':
+        return self._items[num]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f"FixtureSearchIndex({len(self._items)} modes, {len(self._lists)} n-grams)"
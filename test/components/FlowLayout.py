@@ -0,0 +1,61 @@
+import unittest
+
+from PyQt5.QtWidgets import QApplication, QLabel, QWidget
+
+from OpenLightControlGui.components.FlowLayout import FlowLayout
+
+app = QApplication.instance() or QApplication([])
+
+class CountingFlowLayout(FlowLayout):
+    '''Counts how often a size hint is computed instead of taken from the cache.'''
+    computed = 0
+
+    def _hint(self, index):
+        if self._hints[index] is None:
+            self.computed += 1
+        return super()._hint(index)
+
+class TestFlowLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.host = QWidget()
+        self.layout = CountingFlowLayout(self.host, margin=5)
+        self.host.resize(400, 300)
+        self.host.show()
+        self.layout.addWidgets([QLabel(str(i)) for i in range(200)])
+        app.processEvents()
+
+    def tearDown(self):
+        self.host.close()
+        self.host.deleteLater()
+
+    def test_append_computes_one_hint(self):
+        self.layout.computed = 0
+        self.layout.addWidget(QLabel("new"))
+        app.processEvents()
+        self.assertEqual(self.layout.computed, 1)
+
+    def test_insert_computes_one_hint(self):
+        self.layout.computed = 0
+        self.layout.insertWidget(0, QLabel("first"))
+        app.processEvents()
+        self.assertEqual(self.layout.computed, 1)
+        self.assertEqual(self.layout.itemAt(0).widget().text(), "first")
+
+    def test_changed_size_is_laid_out_again(self):
+        label = self.layout.itemAt(10).widget()
+        self.layout.computed = 0
+        label.setText("a much longer text than before")
+        app.processEvents()
+        self.assertEqual(self.layout.computed, 1)
+        self.assertEqual(label.geometry().size(), label.sizeHint())
+
+    def test_index_of(self):
+        widgets = [self.layout.itemAt(i).widget() for i in range(self.layout.count())]
+        self.layout.removeWidget(widgets[5])
+        self.assertEqual(self.layout.indexOf(widgets[5]), -1)
+        self.assertEqual(self.layout.indexOf(widgets[6]), 5)
+        self.assertEqual(self.layout.indexOf(widgets[-1]), len(widgets) - 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,6 @@
+import unittest
+
+from FlowLayout import TestFlowLayout
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,10 @@ class TestAddress(unittest.TestCase):
         addr1 = Address(10, 20)
         addr2 = Address(10, 20)
         self.assertEqual(addr1, addr2)
+
+    def test_hash(self):
+        self.assertEqual(len({Address(10, 20), Address(10, 20), Address(20, 10)}), 2)
+        self.assertEqual({Address(1, 2): "a"}[Address(1, 2)], "a")
     
     def test_gt_universe1(self):
         addr1 = Address(1, 30)
@@ -64,6 +64,51 @@ class TestBaseState(unittest.TestCase):
         st1 += st2
         self.assertEqual(st1.vals["abc"], Entity(21, "m"))
 
+    def test_sub(self):
+        st = LampState.BaseState(self.ent_vals) - LampState.BaseState({"abc": "x"})
+        self.assertDictEqual(st.vals, {"def": Entity(30, "ms")})
+        st = LampState.BaseState(self.ent_vals) - LampState.BaseState({"abc": Entity(4, "m")}, additive=True)
+        self.assertEqual(st["abc"], Entity(6, "m"))
+
+    def test_slots(self):
+        st = LampState.IntensityState({"Intensity": Entity(50, "%"), "Custom": "a"})
+        self.assertEqual(st.Intensity, Entity(50, "%"))
+        self.assertIsNone(st.Strobe)
+        self.assertEqual(st["Custom"], "a")
+        st.Strobe = Entity(5, "Hz")
+        self.assertDictEqual(st.vals, {"Intensity": Entity(50, "%"), "Strobe": Entity(5, "Hz"), "Custom": "a"})
+        with self.assertRaises(AttributeError):
+            st.other = 1 # type: ignore
+
+    def test_vals_write_through(self):
+        st = LampState.IntensityState({"Intensity": Entity(50, "%"), "Custom": "a"})
+        st.vals["Intensity"] = Entity(20, "%")
+        st.vals["Other"] = "b"
+        del st.vals["Custom"]
+        self.assertEqual(st.Intensity, Entity(20, "%"))
+        self.assertDictEqual(st.vals, {"Intensity": Entity(20, "%"), "Other": "b"})
+        st.vals.update({"Strobe": Entity(5, "Hz")})
+        self.assertEqual(st.vals.pop("Other"), "b")
+        self.assertDictEqual(st.vals, {"Intensity": Entity(20, "%"), "Strobe": Entity(5, "Hz")})
+        st.vals.clear()
+        self.assertFalse(st)
+
+    def test_copy_shares_values(self):
+        st = LampState.ColorState({"Red": Entity(1, "%")})
+        stc = st.copy()
+        self.assertIs(st.Red, stc.Red)
+        version = st.version
+        stc.Red = Entity(2, "%")
+        self.assertEqual(st.Red, Entity(1, "%"))
+        self.assertEqual(st.version, version)
+        self.assertNotEqual(stc.version, version)
+
+    def test_additive_does_not_modify_operands(self):
+        ent = Entity(10, "m")
+        st = LampState.BaseState({"abc": ent}) + LampState.BaseState({"abc": Entity(11, "m")}, additive=True)
+        self.assertEqual(st["abc"], Entity(21, "m"))
+        self.assertEqual(ent, Entity(10, "m"))
+
 
 if __name__ == "__main__":
     unittest.main()
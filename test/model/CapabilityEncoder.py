@@ -0,0 +1,86 @@
+import unittest
+
+from fixtures import desk, head, rgb, strobe
+from OpenLightControlGui.fixture_model import CapabilityEncoder, Entity
+
+class TestCapabilityEncoder(unittest.TestCase):
+
+    def setUp(self):
+        self.channels = {channel.key: channel for channel in head.modes[0].channels}
+
+    def test_interpolate(self):
+        pan = self.channels["Pan"]
+        self.assertEqual(pan.encode("Pan", Entity(0, "deg")), 0)
+        self.assertEqual(pan.encode("Pan", Entity(270, "deg")), 32768)
+        self.assertEqual(pan.encode("Pan", Entity(540, "deg")), 65535)
+        self.assertEqual(pan.encode("Pan", Entity(270, "deg"), 1), 128)
+        with self.assertRaises(ValueError):
+            pan.encode("Pan", Entity(270, "deg"), 3)
+
+    def test_capability_ranges(self):
+        shutter = self.channels["Shutter"]
+        self.assertEqual(shutter.encode("Strobe", Entity(1, "Hz")), 10)
+        self.assertEqual(shutter.encode("Strobe", Entity(20, "Hz")), 249)
+        # outside of all capabilities the closest bound is used
+        self.assertEqual(shutter.encode("Strobe", Entity(100, "Hz")), 249)
+        self.assertIsNone(shutter.encode("Strobe", Entity(50, "%")))
+        self.assertIsNone(shutter.encode("Pan", Entity(10, "deg")))
+
+    def test_steps(self):
+        wheel = self.channels["Gobo Wheel"]
+        self.assertEqual([wheel.encode("Gobo", slot) for slot in (1, 2, 3)], [0, 10, 20])
+        self.assertEqual(wheel.encode("GoboRot", Entity.createFromEntityString("fast CW")), 255)
+        self.assertEqual(len(wheel.getEncoder("Gobo")), 3)
+
+    def test_units(self):
+        self.assertEqual(desk.modes[0].channels[0].encode("Intensity", Entity(50, "%")), 128)
+        self.assertEqual(rgb.modes[0].channels[0].encode("Red", Entity(1, "col")), 255)
+        self.assertEqual(CapabilityEncoder.unitsOf(self.channels["Focus"], "Focus"), ["%"])
+
+    def test_encode_many(self):
+        tilt = self.channels["Tilt"].getEncoder("Tilt")
+        self.assertEqual(tilt.encodeMany([0, 135, 270, 400]).tolist(), [0, 32768, 65535, 65535])
+        self.assertEqual(tilt.encodeMany([-10, 135], 1).tolist(), [0, 128])
+        values = [0, 2.5, 17, 80]
+        self.assertEqual(self.channels["Shutter"].getEncoder("Strobe").encodeMany(values).tolist(),
+                         [self.channels["Shutter"].encode("Strobe", value) for value in values])
+
+    def test_encode_channels(self):
+        channels = [head.modes[0].channels[0], head.modes[1].channels[0], head.modes[0].channels[0]]
+        self.assertEqual(CapabilityEncoder.encodeChannels(channels, "Pan", Entity(540, "deg"), 1), [255, 255, 255])
+
+    def test_decode(self):
+        pan = self.channels["Pan"]
+        self.assertAlmostEqual(pan.decode("Pan", 32768).number, 270, 0)
+        self.assertEqual(pan.decode("Pan", 255, 1), Entity(540, "deg"))
+        shutter = self.channels["Shutter"]
+        self.assertIsNone(shutter.decode("Strobe", 0))
+        self.assertEqual(shutter.decode("Strobe", 10), Entity(1, "Hz"))
+        self.assertEqual(self.channels["Gobo Wheel"].decode("Gobo", 15), Entity(2, ""))
+
+    def test_decode_many(self):
+        shutter = self.channels["Shutter"]
+        self.assertEqual(shutter.decodeMany("Strobe", [0, 10, 249, 255]), [None, Entity(1, "Hz"), Entity(20, "Hz"), None])
+        values = [10, 57, 129, 200]
+        self.assertEqual(shutter.decodeMany("Strobe", values), [shutter.decode("Strobe", value) for value in values])
+        # encoding a decoded value gives back the DMX value
+        self.assertEqual([shutter.encode("Strobe", entity) for entity in shutter.decodeMany("Strobe", values)], values)
+
+    def test_overlapping_ranges(self):
+        shutter = strobe.modes[0].channels[0]
+        # 15Hz is beyond the random 5-8Hz strobe with the greater lower bound, but within the 1-20Hz one
+        self.assertEqual(shutter.encode("Strobe", Entity(15, "Hz")), 76)
+        self.assertEqual(shutter.encode("Strobe", Entity(6, "Hz")), 116)
+        values = [0.5, 4, 6, 15, 25]
+        self.assertEqual(shutter.getEncoder("Strobe").encodeMany(values).tolist(),
+                         [shutter.encode("Strobe", value) for value in values])
+
+    def test_strobe_effect_only(self):
+        shutter = strobe.modes[0].channels[0]
+        # the pulse effect reaches 30Hz, but is no strobe
+        self.assertEqual(shutter.encode("Strobe", Entity(30, "Hz")), 99)
+        self.assertIsNone(shutter.decode("Strobe", 170))
+        self.assertEqual(len(shutter.getEncoder("Strobe")), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from fixtures import desk, dim16, head
+from OpenLightControlGui.model import Address, Lamp, UniverseBuffer
+from OpenLightControlGui.model.Crossfade import Crossfade
+
+class TestCrossfade(unittest.TestCase):
+
+    def setUp(self):
+        self.head = Lamp(1, head.modes[0], Address(0, 0))
+        self.dim16 = Lamp(2, dim16.modes[0], Address(1, 0))
+        self.desk = Lamp(3, desk.modes[0], Address(1, 10))
+
+    def test_only_changed_channels(self):
+        fade = Crossfade(UniverseBuffer({1: [0, 0, 0, 0, 10]}), UniverseBuffer({1: [0, 0, 0, 0, 10, 0, 0, 0, 0, 0, 100]}), [self.desk])
+        self.assertEqual(len(fade), 1)
+        self.assertEqual(fade.at(0.5)[1][10], 50)
+
+    def test_linear(self):
+        fade = Crossfade(UniverseBuffer({1: [0] * 11}), UniverseBuffer({1: [0] * 10 + [200]}), [self.desk])
+        self.assertListEqual([fade.at(ti)[1][10] for ti in (0, 0.25, 0.5, 1)], [0, 50, 100, 200])
+
+    def test_scurve(self):
+        fade = Crossfade(UniverseBuffer({1: [0] * 11}), UniverseBuffer({1: [0] * 10 + [200]}), [self.desk], "scurve")
+        self.assertListEqual([fade.at(ti)[1][10] for ti in (0, 0.25, 0.5, 1)], [0, 31, 100, 200])
+
+    def test_unknown_curve(self):
+        with self.assertRaises(ValueError):
+            Crossfade(UniverseBuffer(), UniverseBuffer(), curve="cubic")
+
+    def test_16bit(self):
+        fade = Crossfade(UniverseBuffer({1: [0, 255]}), UniverseBuffer({1: [255, 0]}), [self.dim16])
+        self.assertEqual(len(fade), 1)
+        self.assertListEqual(fade.at(0.5)[1][:2].tolist(), [128, 0])
+        self.assertListEqual(fade.at(1)[1][:2].tolist(), [255, 0])
+
+    def test_16bit_without_patch(self):
+        fade = Crossfade(UniverseBuffer({1: [0, 255]}), UniverseBuffer({1: [255, 0]}))
+        self.assertListEqual(fade.at(0.5)[1][:2].tolist(), [128, 128])
+
+    def test_snap(self):
+        # the gobo wheel cannot crossfade, the dimmer can
+        fade = Crossfade(UniverseBuffer({0: [0] * 9}), UniverseBuffer({0: [0, 0, 0, 0, 200, 0, 20, 0, 0]}), [self.head])
+        self.assertListEqual(fade.at(0)[0][[4, 6]].tolist(), [0, 0])
+        self.assertListEqual(fade.at(0.1)[0][[4, 6]].tolist(), [20, 20])
+
+    def test_new_universe(self):
+        fade = Crossfade(UniverseBuffer({0: [10]}), UniverseBuffer({1: [100]}))
+        self.assertListEqual(fade.at(0.5).universes, [0, 1])
+        self.assertEqual(fade.at(0.5)[0][0], 5)
+        self.assertEqual(fade.at(0.5)[1][0], 50)
+
+if __name__ == "__main__":
+    unittest.main()
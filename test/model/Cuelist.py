@@ -0,0 +1,37 @@
+import unittest
+
+from PyQt5.QtCore import QCoreApplication
+
+from fixtures import desk
+from OpenLightControlGui.model import Address, Cue, Cuelist, Lamp, LampState, State
+from OpenLightControlGui.fixture_model import Entity
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+class TestCuelist(unittest.TestCase):
+
+    def setUp(self):
+        self.lamp = Lamp(1, desk.modes[0], Address(0, 0))
+        self.cues = [Cue(State(self.lamp, LampState(Intensity=LampState.IntensityState({"Intensity": Entity(value, "%")}))))
+                     for value in (0, 100, 20)]
+        self.cuelist = Cuelist(self.cues)
+        self.cuelist.standardFade = 10000
+
+    def test_fade(self):
+        self.cuelist.go()
+        self.assertTrue(self.cuelist.isFading())
+        self.assertLess(self.cuelist.getDmxBuffer()[0][0], 255)
+
+    def test_snap_during_fade(self):
+        self.cuelist.go()
+        self.assertTrue(self.cuelist.isFading())
+        self.cues[2].fade = 0
+        self.cuelist.goto(2)
+        self.assertFalse(self.cuelist.isFading())
+        # the output engine reads through version and getDmxBuffer, which must not step the old fade any more
+        version = self.cuelist.version
+        self.assertEqual(self.cuelist.getDmxBuffer()[0][0], 51)
+        self.assertEqual(self.cuelist.version, version)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from fixtures import desk, head, rgb
+from OpenLightControlGui.model import Address, Lamp, LampState, Patch, State, UniverseBuffer
+from OpenLightControlGui.model.DmxDecoder import DmxDecoder
+from OpenLightControlGui.fixture_model import Entity
+
+class TestDmxDecoder(unittest.TestCase):
+
+    def setUp(self):
+        self.dimmers = [Lamp(i + 1, desk.modes[0], Address(0, i)) for i in range(4)]
+        self.rgb = Lamp(10, rgb.modes[0], Address(1, 0))
+        self.patch = Patch(self.dimmers + [self.rgb])
+        self.decoder = DmxDecoder(self.patch)
+
+    def test_decode(self):
+        buffer = UniverseBuffer({0: [0, 255, 128], 1: [255, 0, 51]})
+        states = self.decoder.decode(buffer)
+        self.assertEqual(states[self.dimmers[0]].Intensity.Intensity, Entity(0, "%"))
+        self.assertEqual(states[self.dimmers[1]].Intensity.Intensity, Entity(100, "%"))
+        self.assertAlmostEqual(states[self.dimmers[2]].Intensity.Intensity.number, 50.2, 1)
+        # slots not in the frame are not decoded
+        self.assertNotIn(self.dimmers[3], states)
+        self.assertEqual(states[self.rgb].Color.Red, Entity(100, "%"))
+        self.assertEqual(states[self.rgb].Color.Blue, Entity(20, "%"))
+
+    def test_round_trip(self):
+        state = State(self.dimmers + [self.rgb], LampState(
+            Intensity=LampState.IntensityState({"Intensity": Entity(40, "%")}),
+            Color=LampState.ColorState({"Green": Entity(1, "col")})))
+        states = self.decoder.decode(state.getDmxBuffer())
+        self.assertAlmostEqual(states[self.dimmers[3]].Intensity.Intensity.number, 40, 0)
+        self.assertEqual(states[self.rgb].Color.Green, Entity(100, "%"))
+
+    def test_16_bit(self):
+        lamp = Lamp(20, head.modes[0], Address(2, 0))
+        self.patch.addLamp(lamp)
+        buffer = UniverseBuffer({2: [128, 0, 0, 0, 255]})
+        state = self.decoder.decode(buffer)[lamp]
+        self.assertIsNotNone(state.Intensity)
+        self.assertEqual(state.Intensity.Intensity, Entity(100, "%"))
+
+    def test_patch_changes(self):
+        buffer = UniverseBuffer({0: [10] * 8})
+        self.assertEqual(len(self.decoder.decode(buffer)), 4)
+        self.patch.addLamp(Lamp(5, desk.modes[0], Address(0, 7)))
+        self.assertEqual(len(self.decoder.decode(buffer)), 5)
+
+    def test_record(self):
+        cue = self.decoder.record(UniverseBuffer({1: [255, 255, 255]}), "Recorded", 3)
+        self.assertEqual(cue.name, "Recorded")
+        self.assertEqual(len(cue.states), 1)
+        self.assertEqual(cue.states[0].group.getLamps(), [self.rgb])
+        self.assertEqual(cue.getDmxBuffer()[1][:3].tolist(), [255, 255, 255])
+
+    def test_beam_round_trip(self):
+        lamp = Lamp(20, head.modes[0], Address(2, 0))
+        self.patch.addLamp(lamp)
+        state = State(lamp, LampState(Beam=LampState.BeamState({"Gobo": "Star", "Prism": "on", "Focus": Entity(50, "%")})))
+        buffer = state.getDmxBuffer()
+        decoded = self.decoder.decode(buffer)[lamp]
+        self.assertEqual(decoded.Beam.Gobo, "Star")
+        self.assertEqual(decoded.Beam.Prism, "on")
+        cue = self.decoder.record(buffer)
+        self.assertEqual(cue.getDmxBuffer()[2].tolist(), buffer[2].tolist())
+        self.assertEqual(buffer[2][6:8].tolist(), [10, 128])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from OpenLightControlGui.fixture_model import Entity
+
+class TestEntity(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(Entity.createFromEntityString("50%"), Entity(50, "%"))
+        self.assertEqual(Entity.createFromEntityString("-1.5deg"), Entity(-1.5, "deg"))
+        self.assertEqual(Entity.createFromEntityString("fast"), Entity(100, "%", "fast"))
+        with self.assertRaises(ValueError):
+            Entity.createFromEntityString("1.2.3Hz")
+        with self.assertRaises(ValueError):
+            Entity.createFromEntityString("Hz")
+
+    def test_shared(self):
+        self.assertIs(Entity.createFromEntityString("100%"), Entity.createFromEntityString("100%"))
+        self.assertIs(Entity.createFromEntityString("slow"), Entity.createFromEntityString("slow"))
+
+    def test_frozen(self):
+        ent = Entity.createFromEntityString("10ms")
+        self.assertTrue(ent.frozen)
+        with self.assertRaises(TypeError):
+            ent.number = 20
+        ent2 = ent
+        ent2 += Entity(5, "ms")
+        self.assertEqual(ent2, Entity(15, "ms"))
+        self.assertEqual(Entity.createFromEntityString("10ms"), Entity(10, "ms"))
+        self.assertTrue(ent.getBaseUnitEntity().frozen)
+
+    def test_copy_is_mutable(self):
+        ent = Entity.createFromEntityString("10ms").copy()
+        self.assertFalse(ent.frozen)
+        ent += Entity(5, "ms")
+        self.assertEqual(ent.number, 15)
+        self.assertEqual(ent.getBaseUnitEntity(), Entity(0.015, "s"))
+
+if __name__ == "__main__":
+    unittest.main()
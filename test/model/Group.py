@@ -1,5 +1,6 @@
 import unittest
 
+from fixtures import desk
 from Lamp import TestLamp
 from OpenLightControlGui.model import Address, Lamp, Group
 from OpenLightControlGui.fixture_model import Mode, Fixture
@@ -88,6 +89,15 @@ class TestGroup(unittest.TestCase):
         grp -= self.lamp2
         self.assertListEqual(grp.lamps, [self.lamp1])
     
+    def test_contains(self):
+        grp = Group([self.lamp1, Group([self.lamp2])])
+        self.assertIn(self.lamp2, grp)
+        self.assertNotIn(self.lamp3, grp)
+        grp -= self.lamp2
+        self.assertNotIn(self.lamp2, grp)
+        grp += self.lamp2
+        self.assertIn(self.lamp2, grp)
+
     def test_str(self):
         grp = Group([self.lamp1, self.lamp2])
         self.assertEqual(str(grp), "Group <1-Desk Channel, 2-Pan/Tilt Fader> [2]")
@@ -100,5 +110,33 @@ class TestGroup(unittest.TestCase):
         grp = Group([self.lamp1, self.lamp2])
         self.assertEqual(repr(grp), "Group([Lamp(1, <...Desk Channel[8 bit]...>, [Address(universe=1, address=10)]) ,Lamp(2, <...Pan/Tilt Fader[8 bit]...>, [Address(universe=1, address=2)])])")
 
+class TestNestedGroup(unittest.TestCase):
+
+    def setUp(self):
+        self.lamps = [Lamp(i + 1, desk.modes[0], Address(0, i)) for i in range(3)]
+
+    def test_readd_removed_lamp(self):
+        grp = Group([self.lamps[0], Group(self.lamps[1:])])
+        grp -= self.lamps[1]
+        self.assertListEqual(grp.lamps, [self.lamps[0], self.lamps[2]])
+        # no longer excluded from the nested group, and a direct item as well
+        grp += self.lamps[1]
+        self.assertListEqual(grp.lamps, [self.lamps[0], self.lamps[1], self.lamps[2], self.lamps[1]])
+
+    def test_nested_version(self):
+        inner = Group(self.lamps[1])
+        middle = Group(inner)
+        outer = Group([self.lamps[0], middle])
+        version = outer.version
+        inner += self.lamps[2]
+        self.assertGreater(middle.version, version)
+        self.assertGreater(outer.version, version)
+        self.assertIn(self.lamps[2], outer)
+        outer -= middle
+        version = outer.version
+        inner -= self.lamps[2]
+        self.assertEqual(outer.version, version)
+        self.assertListEqual(outer.lamps, [self.lamps[0]])
+
 if __name__ == "__main__":
     unittest.main()
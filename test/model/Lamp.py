@@ -1,7 +1,8 @@
 import unittest
 import os
+from typing import Dict
 
-from OpenLightControlGui.utils.ofl import get_fixtures
+from OpenLightControlGui.utils.ofl import LazyFixtures, get_fixtures
 from OpenLightControlGui.model import Address, Lamp
 
 class TestLamp(unittest.TestCase):
@@ -9,7 +10,7 @@ class TestLamp(unittest.TestCase):
     def setUp(self):
         basepath = os.path.dirname(__file__)
         ofl = os.path.join(basepath, "../../../open-fixture-library/fixtures/")
-        fixturesByManu = get_fixtures(ofl)
+        fixturesByManu: 'Dict[str, LazyFixtures]' = get_fixtures(ofl)
         self.desk_channel = fixturesByManu["generic"]["desk-channel"].modes[0]
         self.pan_tilt = fixturesByManu["generic"]["pan-tilt"].modes[0]
         self.rgb = fixturesByManu["generic"]["rgb-fader"].modes[0]
@@ -121,7 +122,7 @@ class TestLamp(unittest.TestCase):
     def test_capabilities_pan_tilt(self):
         cap = {
             "Intensity": None,
-            "Position": None,
+            "Position": {"Pan": 0, "Tilt": 1},
             "Color": None,
             "Beam": None,
             "Maintenance": None
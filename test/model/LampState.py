@@ -1,9 +1,70 @@
 import unittest
 
 from BaseState import TestBaseState
+from OpenLightControlGui.model import LampState
+from OpenLightControlGui.fixture_model import Entity
 
 class TestLampState(unittest.TestCase):
-    pass
 
-if __name__ == "__name__":
+    def setUp(self):
+        self.red = LampState(Intensity=LampState.IntensityState({"Intensity": Entity(50, "%")}), Color=LampState.ColorState({"Red": Entity(1, "col")}))
+        self.blue = LampState(Color=LampState.ColorState({"Blue": Entity(1, "col")}))
+
+    def test_layers_merge(self):
+        st = LampState(layers=[self.red, self.blue])
+        self.assertEqual(st.Intensity.Intensity, Entity(50, "%"))
+        self.assertEqual(st.Color.vals, {"Red": Entity(1, "col"), "Blue": Entity(1, "col")})
+        self.assertIsNone(st.Beam)
+
+    def test_layer_changes_propagate(self):
+        st = LampState(layers=[self.red])
+        version = st.version
+        self.red.Intensity.Intensity = Entity(20, "%")
+        self.assertGreater(st.version, version)
+        self.assertEqual(st.Intensity.Intensity, Entity(20, "%"))
+
+    def test_copy_on_write(self):
+        st = LampState(layers=[self.red])
+        st.Color.Green = Entity(1, "col")
+        self.assertIsNone(self.red.Color.Green)
+        self.assertEqual(st.Color.Green, Entity(1, "col"))
+        # only the changed category is copied, the others still follow the layer
+        self.red.Intensity.Intensity = Entity(20, "%")
+        self.assertEqual(st.Intensity.Intensity, Entity(20, "%"))
+
+    def test_own_values_win(self):
+        st = LampState(Color=LampState.ColorState({"Red": Entity(0, "col")}), layers=[self.red, self.blue])
+        self.assertEqual(st.Color.Red, Entity(0, "col"))
+        self.assertEqual(st.Color.Blue, Entity(1, "col"))
+
+    def test_remove_layer(self):
+        st = LampState(layers=[self.red, self.blue])
+        st.removeLayer(self.red)
+        self.assertIsNone(st.Intensity)
+        self.assertEqual(st.layers, (self.blue,))
+
+    def test_cycle(self):
+        st = LampState(layers=[self.red])
+        with self.assertRaises(ValueError):
+            self.red.addLayer(st)
+
+    def test_iadd_keeps_layers_shared(self):
+        st = LampState(layers=[self.red])
+        st += LampState(Color=LampState.ColorState({"Green": Entity(1, "col")}), Intensity=LampState.IntensityState({"Intensity2": Entity(10, "%")}))
+        self.assertEqual(st.Color.vals, {"Red": Entity(1, "col"), "Green": Entity(1, "col")})
+        self.assertEqual(st.Intensity.Intensity, Entity(50, "%"))
+        self.red.Color.Red = Entity(0, "col")
+        self.red.Intensity.Intensity = Entity(20, "%")
+        self.assertEqual(st.Color.Red, Entity(0, "col"))
+        self.assertEqual(st.Intensity.Intensity, Entity(20, "%"))
+        self.assertEqual(st.Intensity.Intensity2, Entity(10, "%"))
+        self.assertIsNone(self.red.Color.Green)
+
+    def test_sub(self):
+        st = self.red - LampState(Color=LampState.ColorState({"Red": Entity(1, "col")}))
+        self.assertFalse(st.Color)
+        self.assertTrue(st.Intensity)
+        self.assertEqual(self.red.Color.Red, Entity(1, "col"))
+
+if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from fixtures import head
+from OpenLightControlGui.model import Address, Lamp, UniverseBuffer
+from OpenLightControlGui.model.MergeEngine import MergeEngine
+
+class TestMergeEngine(unittest.TestCase):
+
+    def setUp(self):
+        # channel 4 of the moving head is an HTP dimmer, everything else is LTP
+        self.head = Lamp(1, head.modes[0], Address(0, 0))
+        self.engine = MergeEngine([self.head])
+
+    def test_htp_mask(self):
+        self.assertListEqual(self.engine.htpMask(0).nonzero()[0].tolist(), [4])
+        self.assertFalse(self.engine.htpMask(1).any())
+
+    def test_htp_and_ltp(self):
+        first = UniverseBuffer({0: [10, 0, 0, 0, 200]})
+        second = UniverseBuffer({0: [20, 0, 0, 0, 100]})
+        merged = self.engine.merge([first, second])
+        self.assertListEqual(merged[0][[0, 4]].tolist(), [20, 200])
+
+    def test_timestamps(self):
+        first = UniverseBuffer({0: [10]})
+        second = UniverseBuffer({0: [20]})
+        self.assertEqual(self.engine.merge([first, second], [5, 3])[0][0], 10)
+        self.assertEqual(self.engine.merge([first, second], [3, 3])[0][0], 20)
+
+    def test_untouched_slots_keep_older_values(self):
+        first = UniverseBuffer({0: [10, 10]})
+        second = UniverseBuffer()
+        second.scatter([0], [1], [30])
+        merged = self.engine.merge([first, second])
+        self.assertListEqual(merged[0][:2].tolist(), [10, 30])
+        self.assertListEqual(merged.touched[0][:3].tolist(), [True, True, False])
+
+    def test_many_sources(self):
+        sources = [UniverseBuffer({0: [i, 0, 0, 0, i], i % 3 + 1: [i]}) for i in range(20)]
+        merged = self.engine.merge(sources, list(range(20, 0, -1)))
+        self.assertListEqual(merged.universes, [0, 1, 2, 3])
+        self.assertListEqual(merged[0][[0, 4]].tolist(), [0, 19])
+        self.assertEqual(merged[1][0], 0)
+
+    def test_repatch(self):
+        self.head.address = Address(1, 0)
+        self.engine.setLamps([self.head])
+        self.assertFalse(self.engine.htpMask(0).any())
+        self.assertTrue(self.engine.htpMask(1)[4])
+
+    def test_empty(self):
+        self.assertFalse(self.engine.merge([]))
+        with self.assertRaises(ValueError):
+            self.engine.merge([UniverseBuffer()], [1, 2])
+
+if __name__ == "__main__":
+    unittest.main()
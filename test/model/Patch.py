@@ -0,0 +1,137 @@
+import unittest
+
+from fixtures import desk, rgb
+from OpenLightControlGui.model import Address, Lamp, Patch
+from OpenLightControlGui.fixture_model import Fixture
+
+class TestPatch(unittest.TestCase):
+
+    def setUp(self):
+        self.dimmer = Lamp(1, desk.modes[0], Address(0, 0))
+        self.rgb = Lamp(2, rgb.modes[0], [Address(0, 4), Address(1, 4)])
+        self.patch = Patch([self.dimmer, self.rgb])
+
+    def test_lookup(self):
+        self.assertIs(self.patch.getLamp(2), self.rgb)
+        self.assertIsNone(self.patch.getLamp(3))
+        self.assertIs(self.patch.lampAt(0, 0), self.dimmer)
+        self.assertIs(self.patch.lampAt(1, 6), self.rgb)
+        self.assertIsNone(self.patch.lampAt(0, 7))
+        self.assertIn(self.rgb, self.patch)
+        self.assertEqual(len(self.patch), 2)
+
+    def test_conflicts(self):
+        self.assertListEqual(self.patch.conflicts(Address(0, 3), 3), [self.rgb])
+        self.assertListEqual(self.patch.conflicts(Address(0, 3), 3, ignore=self.rgb), [])
+        self.assertTrue(self.patch.isFree([Address(0, 1), Address(1, 0)], 3))
+        with self.assertRaises(ValueError):
+            self.patch.addLamp(Lamp(3, desk.modes[0], Address(1, 5)))
+        with self.assertRaises(ValueError):
+            self.patch.addLamp(Lamp(1, desk.modes[0], Address(2, 0)))
+        self.assertEqual(len(self.patch), 2)
+
+    def test_repatch(self):
+        self.rgb.address = Address(2, 0)
+        self.assertIsNone(self.patch.lampAt(0, 4))
+        self.assertIs(self.patch.lampAt(2, 2), self.rgb)
+        self.rgb.number = 10
+        self.assertIsNone(self.patch.getLamp(2))
+        self.assertIs(self.patch.getLamp(10), self.rgb)
+        self.rgb.mode = desk.modes[0]
+        self.assertIsNone(self.patch.lampAt(2, 1))
+
+    def test_rejected_change_is_not_applied(self):
+        with self.assertRaises(ValueError):
+            self.rgb.address = Address(0, 0)
+        self.assertListEqual(self.rgb.address, [Address(0, 4), Address(1, 4)])
+        with self.assertRaises(ValueError):
+            self.dimmer.number = 2
+        self.assertEqual(self.dimmer.number, 1)
+        self.dimmer.address = Address(0, 2)
+        with self.assertRaises(ValueError):
+            self.dimmer.mode = rgb.modes[0]
+        self.assertIs(self.dimmer.mode, desk.modes[0])
+
+    def test_remove(self):
+        self.patch.removeLamp(self.rgb)
+        self.assertIsNone(self.patch.lampAt(0, 4))
+        self.rgb.address = Address(0, 0)
+        other = Patch([self.rgb])
+        self.assertIs(other.getLamp(2), self.rgb)
+        with self.assertRaises(ValueError):
+            other.addLamp(self.dimmer)
+
+    def test_ranges(self):
+        # rgb has 3 channels, a lamp in the middle of its range is found as well
+        self.assertIs(self.patch.lampAt(0, 6), self.rgb)
+        self.assertIsNone(self.patch.lampAt(0, 7))
+        self.assertFalse(self.patch.isFree(Address(0, 6), 4))
+        self.assertTrue(self.patch.isFree(Address(0, 7), 100))
+        with self.assertRaises(ValueError):
+            self.patch.isFree(Address(0, 510), 3)
+        with self.assertRaises(ValueError):
+            self.patch.addLamp(Lamp(3, rgb.modes[0], [Address(2, 0), Address(2, 1)]))
+
+    def test_next_free(self):
+        self.assertEqual(self.patch.nextFree(3), Address(0, 1))
+        self.assertEqual(self.patch.nextFree(4), Address(0, 7))
+        self.assertEqual(self.patch.nextFree(3, Address(0, 5)), Address(0, 7))
+        self.assertEqual(self.patch.nextFree(10, Address(0, 505)), Address(1, 7))
+        with self.assertRaises(ValueError):
+            self.patch.nextFree(513)
+
+    def test_auto_patch(self):
+        lamps = [Lamp(10 + i, rgb.modes[0]) for i in range(200)]
+        self.patch.autoPatch(lamps, Address(0, 500))
+        self.assertEqual(lamps[0].address[0], Address(0, 500))
+        self.assertEqual(lamps[3].address[0], Address(0, 509))
+        # universe 1 is occupied by self.rgb at 4 to 6
+        self.assertEqual(lamps[4].address[0], Address(1, 0))
+        self.assertEqual(lamps[5].address[0], Address(1, 7))
+        self.assertEqual(len(self.patch), 202)
+        for lamp in lamps:
+            self.assertEqual(self.patch.conflicts(lamp.address, lamp.dmxRange, ignore=lamp), [])
+
+        # lamps already in the patch are moved, in the given order
+        self.patch.autoPatch([self.rgb, self.dimmer], Address(5, 0))
+        self.assertEqual(self.rgb.address, [Address(5, 0)])
+        self.assertEqual(self.dimmer.address, [Address(5, 3)])
+        self.assertIsNone(self.patch.lampAt(0, 0))
+
+    def test_auto_patch_number_conflict(self):
+        lamps = [Lamp(2, desk.modes[0]), Lamp(3, desk.modes[0])]
+        with self.assertRaises(ValueError):
+            self.patch.autoPatch(lamps)
+        self.assertFalse(any(lamp in self.patch for lamp in lamps))
+
+    def test_auto_patch_unfit_lamp(self):
+        empty = Fixture(desk.manufacturer, "empty", {"name": "Empty", "availableChannels": {}, "modes": [{"name": "None", "channels": []}]})
+        lamp = Lamp(3, empty.modes[0])
+        with self.assertRaises(ValueError):
+            self.patch.autoPatch([self.rgb, self.dimmer, lamp], Address(5, 0))
+        self.assertNotIn(lamp, self.patch)
+        self.assertEqual(self.rgb.address, [Address(0, 4), Address(1, 4)])
+        self.assertIs(self.patch.lampAt(0, 0), self.dimmer)
+        self.assertIs(self.patch.lampAt(1, 6), self.rgb)
+        self.assertEqual(self.patch.conflicts(Address(0, 5), 1), [self.rgb])
+
+    def test_next_gap(self):
+        universe = Patch.Universe()
+        lamps = [Lamp(100 + i, desk.modes[0]) for i in range(3)]
+        universe.add(0, 10, lamps[0])
+        universe.add(12, 20, lamps[1])
+        universe.add(25, 512, lamps[2])
+        self.assertEqual(universe.nextGap(2), 10)
+        self.assertEqual(universe.nextGap(3), 20)
+        self.assertEqual(universe.nextGap(1, 11), 11)
+        self.assertEqual(universe.nextGap(2, 11), 20)
+        self.assertIsNone(universe.nextGap(6))
+        universe.remove(12, lamps[1])
+        self.assertEqual(universe.nextGap(15), 10)
+
+    def test_lamps_hashable(self):
+        self.assertEqual(len({self.dimmer, self.rgb, self.dimmer}), 2)
+        self.assertNotEqual(self.dimmer, Lamp(1, desk.modes[0], Address(0, 0)))
+
+if __name__ == "__main__":
+    unittest.main()
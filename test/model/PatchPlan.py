@@ -0,0 +1,106 @@
+import unittest
+
+from fixtures import desk, dim16, head, rgb
+from OpenLightControlGui.model import Address, Lamp, LampState, State, Group, UniverseBuffer
+from OpenLightControlGui.model.PatchPlan import PatchPlan
+from OpenLightControlGui.fixture_model import Entity
+
+class TestPatchPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.desk_channel = desk.modes[0]
+        self.dim16 = dim16.modes[0]
+        self.rgb = rgb.modes[0]
+
+    def test_targets_8bit(self):
+        lamp = Lamp(1, self.desk_channel, Address(1, 10))
+        target = lamp.patchPlan.getTarget("Intensity", "Intensity")
+        self.assertListEqual(target.universes.tolist(), [1])
+        self.assertListEqual(target.slots.tolist(), [10])
+    
+    def test_targets_16bit_multiple_addresses(self):
+        lamp = Lamp(1, self.dim16, [Address(1, 10), Address(2, 20)])
+        target = lamp.patchPlan.getTarget("Intensity", "Intensity")
+        self.assertListEqual(target.universes.tolist(), [1, 1, 2, 2])
+        self.assertListEqual(target.slots.tolist(), [10, 11, 20, 21])
+        self.assertListEqual(target.encode(0.5).tolist(), [127, 255, 127, 255])
+    
+    def test_color_targets(self):
+        lamp = Lamp(1, self.rgb, Address(0, 4))
+        self.assertSetEqual(set(lamp.patchPlan.targets.keys()), {("Color", "Red"), ("Color", "Green"), ("Color", "Blue")})
+        self.assertListEqual(lamp.patchPlan.getTarget("Color", "Blue").slots.tolist(), [6])
+    
+    def test_cached(self):
+        lamp = Lamp(1, self.rgb, Address(0, 4))
+        self.assertIs(lamp.patchPlan, lamp.patchPlan)
+    
+    def test_invalidate_address(self):
+        lamp = Lamp(1, self.rgb, Address(0, 4))
+        plan = lamp.patchPlan
+        lamp.address = Address(0, 10)
+        self.assertIsNot(plan, lamp.patchPlan)
+        self.assertListEqual(lamp.patchPlan.getTarget("Color", "Red").slots.tolist(), [10])
+    
+    def test_invalidate_add_address(self):
+        lamp = Lamp(1, self.rgb, Address(0, 4))
+        plan = lamp.patchPlan
+        lamp.add_address(Address(1, 4))
+        self.assertIsNot(plan, lamp.patchPlan)
+        self.assertListEqual(lamp.patchPlan.universes, [0, 1])
+    
+    def test_invalidate_mode(self):
+        lamp = Lamp(1, self.rgb, Address(0, 4))
+        plan = lamp.patchPlan
+        lamp.mode = self.desk_channel
+        self.assertIsNot(plan, lamp.patchPlan)
+        self.assertListEqual(list(lamp.patchPlan.targets.keys()), [("Intensity", "Intensity")])
+    
+    def test_fraction(self):
+        self.assertEqual(Lamp(1, self.rgb).patchPlan.fraction(Entity(50, "%")), 0.5)
+        self.assertEqual(Lamp(1, self.rgb).patchPlan.fraction(Entity(0.25, "col")), 0.25)
+        self.assertEqual(Lamp(1, self.rgb).patchPlan.fraction(Entity(255, "")), 1)
+    
+    def test_state_render(self):
+        lamps = [Lamp(1, self.desk_channel, Address(0, 0)), Lamp(2, self.dim16, Address(0, 1)), Lamp(3, self.rgb, Address(1, 0))]
+        st = LampState(LampState.IntensityState({"Intensity": Entity(100, "%")}), Color=LampState.ColorState({"Red": Entity(1, "col"), "Green": Entity(0.5, "col")}))
+        dmx = State(Group(lamps), st).getDmxState(0.5)
+        self.assertListEqual(dmx[0][:3], [127, 127, 255])
+        self.assertListEqual(dmx[1][:3], [255, 127, 0])
+
+    def test_position_targets(self):
+        lamp = Lamp(1, head.modes[0], Address(0, 10))
+        target = lamp.patchPlan.getTarget("Position", "Pan")
+        self.assertListEqual(target.slots.tolist(), [10, 11])
+        self.assertListEqual(target.shifts.tolist(), [8, 0])
+        encoder, resolution = lamp.patchPlan.getEncoder("Position", "Tilt")
+        self.assertEqual(resolution, 2)
+        self.assertIs(encoder, Lamp(2, head.modes[0]).patchPlan.getEncoder("Position", "Tilt")[0])
+        self.assertIsNone(lamp.patchPlan.getEncoder("Intensity", "Intensity"))
+
+    def test_render_encoded(self):
+        lamps = [Lamp(1, head.modes[0], Address(0, 0)), Lamp(2, head.modes[1], Address(0, 20)), Lamp(3, self.rgb, Address(0, 30))]
+        buffer = UniverseBuffer()
+        PatchPlan.renderEncoded(buffer, [lamp.patchPlan for lamp in lamps], ("Position", "Pan"), Entity(270, "deg"))
+        self.assertListEqual(buffer[0][[0, 1, 20]].tolist(), [128, 0, 128])
+        self.assertFalse(buffer.touched[0][30:33].any())
+        buffer = UniverseBuffer()
+        PatchPlan.renderEncoded(buffer, [lamps[0].patchPlan, lamps[1].patchPlan], ("Position", "Tilt"), [270, 0])
+        self.assertListEqual(buffer[0][[2, 3, 21]].tolist(), [255, 255, 0])
+
+    def test_render_beam(self):
+        lamps = [Lamp(1, head.modes[0], Address(0, 0)), Lamp(2, head.modes[1], Address(0, 20))]
+        self.assertIsNotNone(lamps[0].patchPlan.getSlotTable("Beam", "Gobo"))
+        self.assertIsNone(lamps[0].patchPlan.getSlotTable("Beam", "Focus"))
+        plans = [lamp.patchPlan for lamp in lamps]
+        buffer = UniverseBuffer()
+        PatchPlan.renderEncoded(buffer, plans, ("Beam", "Gobo"), "Star")
+        PatchPlan.renderEncoded(buffer, plans, ("Beam", "Prism"), Entity(1, ""))
+        PatchPlan.renderEncoded(buffer, plans, ("Beam", "Focus"), Entity(50, "%"))
+        self.assertListEqual(buffer[0][6:9].tolist(), [10, 128, 126])
+        self.assertFalse(buffer.touched[0][20:].any())
+        buffer = UniverseBuffer()
+        PatchPlan.renderEncoded(buffer, plans, ("Beam", "Gobo"), "Flower")
+        self.assertFalse(buffer.touched.any())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from fixtures import head
+from OpenLightControlGui.fixture_model import Entity, SlotTable
+
+class TestSlotTable(unittest.TestCase):
+
+    def setUp(self):
+        self.channels = {channel.name: channel for channel in head.modes[0].channels}
+
+    def test_slot_keys(self):
+        table = self.channels["Gobo Wheel"].getSlotTable("Gobo")
+        self.assertIsInstance(table, SlotTable)
+        self.assertEqual(table.get(1), 0)
+        self.assertEqual(table.get(Entity(2, "")), 10)
+        self.assertEqual(table.get("Star"), 10)
+        self.assertEqual(table.get("gobo dots"), 20)
+        self.assertEqual(table.get("gobos/dots"), 20)
+        self.assertEqual(table.get("open"), 0)
+        self.assertIsNone(table.get("Flower"))
+        self.assertIsNone(table.get(4))
+
+    def test_raw_name(self):
+        slots = self.channels["Gobo Wheel"].capabilities[0].wheels[0].slots
+        self.assertListEqual([slot.rawName for slot in slots], [None, "Star", "Dots"])
+        self.assertListEqual([slot.name for slot in slots], ["Open", "Gobo Star", "Gobo Dots"])
+
+    def test_prism(self):
+        table = self.channels["Prism"].getSlotTable("Prism")
+        self.assertEqual(table.get("on"), 128)
+        self.assertEqual(table.get(Entity(1, "")), 128)
+        self.assertEqual(table.get(0), 0)
+        self.assertEqual(table.get("OFF"), 0)
+
+    def test_resolution(self):
+        table = self.channels["Gobo Wheel"].getSlotTable("Gobo")
+        self.assertEqual(table.get(3, 1), 20)
+        with self.assertRaises(ValueError):
+            table.get(3, 2)
+
+    def test_decode(self):
+        table = self.channels["Gobo Wheel"].getSlotTable("Gobo")
+        self.assertEqual(table.decode(15), "Star")
+        self.assertEqual(table.decodeMany([0, 20, 29, 30]), ["Open", "Dots", "Dots", None])
+        self.assertEqual(table.get(table.decode(12)), 10)
+        prism = self.channels["Prism"].getSlotTable("Prism")
+        self.assertEqual(prism.decodeMany([0, 127, 128, 255]), ["off", "off", "on", "on"])
+
+    def test_cached(self):
+        channel = self.channels["Gobo Wheel"]
+        self.assertIs(channel.getSlotTable("Gobo"), channel.getSlotTable("Gobo"))
+        self.assertIsNone(channel.getSlotTable("Focus"))
+        self.assertIsNone(self.channels["Dimmer"].getSlotTable("Gobo"))
+
+if __name__ == "__main__":
+    unittest.main()
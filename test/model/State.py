@@ -0,0 +1,109 @@
+import unittest
+
+from fixtures import desk, head, rgb
+from OpenLightControlGui.model import Address, Cue, Group, Lamp, LampState, Scene, State
+from OpenLightControlGui.fixture_model import Entity
+
+class TestState(unittest.TestCase):
+
+    def setUp(self):
+        self.dimmer = Lamp(1, desk.modes[0], Address(0, 0))
+        self.rgb = Lamp(2, rgb.modes[0], Address(0, 4))
+        self.state = State(Group([self.dimmer, self.rgb]), LampState(
+            Intensity=LampState.IntensityState({"Intensity": Entity(100, "%")}),
+            Color=LampState.ColorState({"Red": Entity(1, "col")})))
+
+    def test_base_state_version(self):
+        st = LampState.BaseState({"a": "b"})
+        version = st.version
+        st["a"] = "c"
+        self.assertGreater(st.version, version)
+        version = st.version
+        st.vals = {"a": "d"}
+        self.assertGreater(st.version, version)
+
+    def test_lamp_state_version(self):
+        version = self.state.state.version
+        self.state.state.Color.Blue = Entity(1, "col")
+        self.assertGreater(self.state.state.version, version)
+        version = self.state.state.version
+        self.state.state.Beam = LampState.BeamState()
+        self.assertGreater(self.state.state.version, version)
+
+    def test_render_cached(self):
+        buffer = self.state.getDmxBuffer()
+        self.assertIs(self.state.getDmxBuffer(), buffer)
+        self.assertIsNot(self.state.getDmxBuffer(0.5), buffer)
+
+    def test_render_after_value_change(self):
+        self.assertEqual(self.state.getDmxBuffer()[0][6], 0)
+        self.state.state.Color.Blue = Entity(1, "col")
+        self.assertEqual(self.state.getDmxBuffer()[0][6], 255)
+
+    def test_render_after_group_change(self):
+        self.state.group -= self.dimmer
+        self.assertEqual(self.state.getDmxBuffer()[0][0], 0)
+
+    def test_render_after_repatch(self):
+        self.state.getDmxBuffer()
+        self.rgb.address = Address(1, 0)
+        buffer = self.state.getDmxBuffer()
+        self.assertEqual(buffer[1][0], 255)
+        self.assertEqual(buffer[0][4], 0)
+
+    def test_palettes_are_shared(self):
+        red = LampState(Color=LampState.ColorState({"Red": Entity(1, "col")}))
+        blue = LampState(Color=LampState.ColorState({"Blue": Entity(1, "col")}))
+        states = [State(self.rgb, [red, blue]) for _ in range(3)]
+        self.assertEqual(states[0].getDmxBuffer()[0][4:7].tolist(), [255, 0, 255])
+        self.assertIsNone(red.Color.Blue)
+        red.Color.Red = Entity(0, "col")
+        for state in states:
+            self.assertEqual(state.getDmxBuffer()[0][4:7].tolist(), [0, 0, 255])
+        states[0].removeState(blue)
+        self.assertEqual(states[0].getDmxBuffer()[0][4:7].tolist(), [0, 0, 0])
+
+    def test_render_position(self):
+        heads = [Lamp(3, head.modes[0], Address(1, 0)), Lamp(4, head.modes[1], Address(1, 20))]
+        state = State(heads, LampState(Position=LampState.PositionState({"Pan": Entity(135, "deg"), "Tilt": Entity(50, "%")})))
+        buffer = state.getDmxBuffer()
+        self.assertEqual(buffer[1][0:4].tolist(), [64, 0, 127, 255])
+        self.assertEqual(buffer[1][20:22].tolist(), [64, 127])
+        state.state.Position.Pan = Entity(540, "deg")
+        self.assertEqual(state.getDmxBuffer()[1][[0, 1, 20]].tolist(), [255, 255, 255])
+
+    def test_render_beam(self):
+        moving = Lamp(3, head.modes[0], Address(1, 0))
+        state = State(moving, LampState(Beam=LampState.BeamState({"Gobo": "Dots", "Prism": "on", "Focus": Entity(100, "%")})))
+        self.assertEqual(state.getDmxBuffer()[1][6:9].tolist(), [20, 128, 255])
+        state.state.Beam.Gobo = Entity(1, "")
+        self.assertEqual(state.getDmxBuffer()[1][6], 0)
+
+    def test_ltp_survives_patch_changes(self):
+        first = State(self.rgb, LampState(Color=LampState.ColorState({"Red": Entity(0.2, "col")})))
+        second = State(self.rgb, LampState(Color=LampState.ColorState({"Red": Entity(0.2, "col")})))
+        cue, scene = Cue([first, second]), Scene([first, second])
+        second.state.Color.Red = Entity(0.4, "col")
+        first.state.Color.Red = Entity(1, "col")
+        stamps = (first.stamp, second.stamp)
+        Lamp(99, desk.modes[0], Address(5, 0))
+        self.assertEqual((first.stamp, second.stamp), stamps)
+        self.assertEqual(cue.getDmxBuffer()[0][4], 255)
+        self.assertEqual(scene.getDmxBuffer()[0][4], 255)
+        second.state.Color.Red = Entity(0.4, "col")
+        self.assertEqual(cue.getDmxBuffer()[0][4], 102)
+
+    def test_scene_version(self):
+        cue = Cue(self.state)
+        scene = Scene(self.state)
+        version, cue_version = scene.version, cue.version
+        self.state.state.Intensity.Intensity = Entity(50, "%")
+        self.assertGreater(scene.version, version)
+        self.assertGreater(cue.version, cue_version)
+        version = scene.version
+        scene.removeState("0")
+        self.assertGreater(scene.version, version)
+        self.assertFalse(scene.getDmxBuffer())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+from OpenLightControlGui.model import UniverseBuffer
+
+class TestUniverseBuffer(unittest.TestCase):
+
+    def test_empty(self):
+        buf = UniverseBuffer()
+        self.assertFalse(buf)
+        self.assertDictEqual(buf.toDict(), {})
+    
+    def test_add_universe(self):
+        buf = UniverseBuffer()
+        buf.addUniverse(3)[10] = 255
+        self.assertListEqual(buf.universes, [3])
+        self.assertEqual(buf[3][10], 255)
+        self.assertEqual(len(buf[3]), 512)
+    
+    def test_from_dict(self):
+        buf = UniverseBuffer.fromDict({1: [1, 2, 3]})
+        self.assertListEqual(buf.toDict()[1][:4], [1, 2, 3, 0])
+    
+    def test_to_dict_types(self):
+        buf = UniverseBuffer({0: [10]})
+        val = buf.toDict()[0][0]
+        self.assertIs(type(val), int)
+    
+    def test_grow_keeps_data(self):
+        buf = UniverseBuffer()
+        for i in range(20):
+            buf.addUniverse(i)[i] = i
+        for i in range(20):
+            self.assertEqual(buf[i][i], i)
+    
+    def test_scatter(self):
+        buf = UniverseBuffer()
+        buf.scatter([1, 2, 1], [0, 5, 7], [10, 20, 300])
+        self.assertEqual(buf[1][0], 10)
+        self.assertEqual(buf[2][5], 20)
+        self.assertEqual(buf[1][7], 255)
+    
+    def test_merge_htp(self):
+        buf1 = UniverseBuffer({1: [10, 200]})
+        buf2 = UniverseBuffer({1: [100, 20], 2: [5]})
+        buf1.mergeHTP(buf2)
+        self.assertListEqual(buf1[1][:2].tolist(), [100, 200])
+        self.assertListEqual(buf1[2][:1].tolist(), [5])
+    
+    def test_merge_ltp(self):
+        buf1 = UniverseBuffer({1: [10, 200], 3: [1]})
+        buf2 = UniverseBuffer({1: [100, 20]})
+        buf1.mergeLTP(buf2)
+        self.assertListEqual(buf1[1][:2].tolist(), [100, 20])
+        self.assertListEqual(buf1[3][:1].tolist(), [1])
+    
+    def test_merge_ltp_touched_only(self):
+        buf1 = UniverseBuffer({1: [10, 200]})
+        buf2 = UniverseBuffer()
+        buf2.scatter([1], [1], [20])
+        buf1.mergeLTP(buf2)
+        self.assertListEqual(buf1[1][:2].tolist(), [10, 20])
+
+    def test_touched(self):
+        buf = UniverseBuffer({1: [10, 0]})
+        self.assertListEqual(buf.touched[0][:3].tolist(), [True, True, False])
+        buf.touch(1, [5])
+        self.assertTrue(buf.touched[0][5])
+        buf.touch(2)
+        self.assertTrue(buf.touched[1].all())
+
+    def test_scale(self):
+        buf = UniverseBuffer({1: [255, 100]})
+        buf.scale(0.5)
+        self.assertListEqual(buf[1][:2].tolist(), [127, 50])
+    
+    def test_crossfade(self):
+        start = UniverseBuffer({1: [0, 200]})
+        end = UniverseBuffer({1: [100, 0], 2: [50]})
+        half = UniverseBuffer.crossfade(start, end, 0.5)
+        self.assertListEqual(half[1][:2].tolist(), [50, 100])
+        self.assertListEqual(half[2][:1].tolist(), [25])
+        self.assertEqual(UniverseBuffer.crossfade(start, end, 1), end)
+    
+    def test_copy(self):
+        buf = UniverseBuffer({1: [10]})
+        cop = buf.copy()
+        cop[1][0] = 20
+        self.assertEqual(buf[1][0], 10)
+        self.assertNotEqual(buf, cop)
+    
+    def test_equal_dict(self):
+        buf = UniverseBuffer({1: [10]})
+        self.assertEqual(buf, {1: [10] + [0]*511})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+from OpenLightControlGui.fixture_model import Fixture, Manufacturer
+
+# small fixtures following the open fixture library format, so the model can be tested without a library checkout
+man = Manufacturer("generic", {"name": "Generic"})
+desk = Fixture(man, "desk-channel", {"name": "Desk Channel", "categories": ["Dimmer"],
+  "availableChannels": {"Intensity": {"capability": {"type": "Intensity"}}},
+  "modes": [{"name": "8 bit", "channels": ["Intensity"]}]})
+dim16 = Fixture(man, "dim16", {"name": "Dimmer 16", "availableChannels": {"Dimmer": {"fineChannelAliases": ["Dimmer fine"], "capability": {"type": "Intensity"}}},
+  "modes": [{"name": "16 bit", "channels": ["Dimmer", "Dimmer fine"]}]})
+rgb = Fixture(man, "rgb-fader", {"name": "RGB Fader", "categories": ["Color Changer"], "availableChannels": {
+  "Red": {"capability": {"type": "ColorIntensity", "color": "Red"}},
+  "Green": {"capability": {"type": "ColorIntensity", "color": "Green"}},
+  "Blue": {"capability": {"type": "ColorIntensity", "color": "Blue"}}},
+  "modes": [{"name": "8 bit", "channels": ["Red", "Green", "Blue"]}]})
+head = Fixture(man, "head", {"name": "Moving Head", "categories": ["Moving Head"],
+ "wheels": {"Gobo Wheel": {"slots": [{"type": "Open"}, {"type": "Gobo", "name": "Star"}, {"type": "Gobo", "name": "Dots", "resource": "gobos/dots"}]}},
+ "availableChannels": {
+  "Pan": {"fineChannelAliases": ["Pan fine"], "capability": {"type": "Pan", "angleStart": "0deg", "angleEnd": "540deg"}},
+  "Tilt": {"fineChannelAliases": ["Tilt fine"], "capability": {"type": "Tilt", "angleStart": "0deg", "angleEnd": "270deg"}},
+  "Dimmer": {"precedence": "HTP", "capability": {"type": "Intensity"}},
+  "Shutter": {"capabilities": [
+     {"dmxRange": [0, 9], "type": "ShutterStrobe", "shutterEffect": "Closed"},
+     {"dmxRange": [10, 249], "type": "ShutterStrobe", "shutterEffect": "Strobe", "speedStart": "1Hz", "speedEnd": "20Hz"},
+     {"dmxRange": [250, 255], "type": "ShutterStrobe", "shutterEffect": "Open"}]},
+  "Gobo Wheel": {"capabilities": [
+     {"dmxRange": [0, 9], "type": "WheelSlot", "slotNumber": 1},
+     {"dmxRange": [10, 19], "type": "WheelSlot", "slotNumber": 2},
+     {"dmxRange": [20, 29], "type": "WheelSlot", "slotNumber": 3},
+     {"dmxRange": [30, 255], "type": "WheelRotation", "speedStart": "slow CW", "speedEnd": "fast CW"}]},
+  "Prism": {"capabilities": [
+     {"dmxRange": [0, 127], "type": "NoFunction"},
+     {"dmxRange": [128, 255], "type": "Prism", "prismFacets": 3}]},
+  "Focus": {"capability": {"type": "Focus", "distanceStart": "near", "distanceEnd": "far"}}},
+ "modes": [{"name": "Extended", "channels": ["Pan", "Pan fine", "Tilt", "Tilt fine", "Dimmer", "Shutter", "Gobo Wheel", "Prism", "Focus"]},
+           {"name": "Basic", "channels": ["Pan", "Tilt", "Dimmer"]}]})
+strobe = Fixture(man, "strobe", {"name": "Strobe", "categories": ["Strobe"], "availableChannels": {
+  "Shutter": {"capabilities": [
+     {"dmxRange": [0, 9], "type": "ShutterStrobe", "shutterEffect": "Closed"},
+     {"dmxRange": [10, 99], "type": "ShutterStrobe", "shutterEffect": "Strobe", "speedStart": "1Hz", "speedEnd": "20Hz"},
+     {"dmxRange": [100, 149], "type": "ShutterStrobe", "shutterEffect": "Strobe", "speedStart": "5Hz", "speedEnd": "8Hz", "randomTiming": True},
+     {"dmxRange": [150, 199], "type": "ShutterStrobe", "shutterEffect": "Pulse", "speedStart": "1Hz", "speedEnd": "30Hz"},
+     {"dmxRange": [200, 255], "type": "ShutterStrobe", "shutterEffect": "Open"}]}},
+  "modes": [{"name": "1 channel", "channels": ["Shutter"]}]})
@@ -2,8 +2,19 @@ import unittest
 
 from Address import TestAddress
 from Lamp import TestLamp
-from Group import TestGroup
+from Group import TestGroup, TestNestedGroup
 from LampState import TestLampState, TestBaseState
+from UniverseBuffer import TestUniverseBuffer
+from PatchPlan import TestPatchPlan
+from State import TestState
+from Crossfade import TestCrossfade
+from Cuelist import TestCuelist
+from MergeEngine import TestMergeEngine
+from Patch import TestPatch
+from Entity import TestEntity
+from CapabilityEncoder import TestCapabilityEncoder
+from SlotTable import TestSlotTable
+from DmxDecoder import TestDmxDecoder
 
 if __name__ == '__main__':
     unittest.main()
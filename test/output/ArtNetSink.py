@@ -0,0 +1,121 @@
+import unittest
+import socket
+import time
+
+from OpenLightControlGui.model import UniverseBuffer
+from OpenLightControlGui.output import ArtNetSink
+
+class FullSocket():
+    '''A socket whose send buffer is full for the given number of sendto calls after the first one.'''
+
+    def __init__(self, full: int) -> None:
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._calls = 0
+        self._full = full
+
+    def sendto(self, data, address):
+        self._calls += 1
+        if 1 < self._calls <= 1 + self._full:
+            raise BlockingIOError()
+        return self._socket.sendto(data, address)
+
+    def close(self):
+        self._socket.close()
+
+class TestArtNetSink(unittest.TestCase):
+
+    def setUp(self):
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.bind(("127.0.0.1", 0))
+        self.receiver.settimeout(1)
+        self.sink = ArtNetSink("127.0.0.1", self.receiver.getsockname()[1], keepAlive=0)
+
+    def tearDown(self):
+        self.sink.close()
+        self.receiver.close()
+
+    def receive(self):
+        return ArtNetSink.parsePacket(self.receiver.recv(1024))
+
+    def test_packet_layout(self):
+        self.sink.send(UniverseBuffer({0: [1, 2, 3]}))
+        packet = self.receiver.recv(1024)
+        self.assertEqual(len(packet), 18 + 512)
+        self.assertEqual(packet[:8], b"Art-Net\x00")
+        self.assertEqual(packet[8:10], b"\x00\x50")
+        self.assertEqual(packet[10:12], b"\x00\x0e")
+        self.assertEqual(packet[16:18], b"\x02\x00")
+        self.assertEqual(packet[18:21], b"\x01\x02\x03")
+
+    def test_all_universes(self):
+        self.sink.send(UniverseBuffer({0: [10], 1: [20], 0x123: [30]}))
+        received = {universe: data[0] for universe, _, data in (self.receive() for _ in range(3))}
+        self.assertDictEqual(received, {0: 10, 1: 20, 0x123: 30})
+        self.assertEqual(self.sink.packetsSent, 3)
+
+    def test_sequence(self):
+        frame = UniverseBuffer({0: [0], 1: [0]})
+        for _ in range(2):
+            self.sink.send(frame)
+        sequences = [self.receive()[:2] for _ in range(4)]
+        self.assertListEqual(sequences, [(0, 1), (1, 1), (0, 2), (1, 2)])
+
+    def test_sequence_skips_zero(self):
+        frame = UniverseBuffer({0: [0]})
+        sequences = []
+        for _ in range(256):
+            self.sink.send(frame)
+            sequences.append(self.receive()[1])
+        self.assertEqual(sequences[254], 255)
+        self.assertEqual(sequences[255], 1)
+
+    def test_blocked_packet(self):
+        sink = ArtNetSink("127.0.0.1", self.receiver.getsockname()[1], keepAlive=60, sock=FullSocket(1)) # type: ignore
+        frame = UniverseBuffer({0: [1], 1: [2], 2: [3]})
+        sink.send(frame)
+        self.assertEqual(sink.packetsSent, 2)
+        self.assertListEqual([self.receive()[:2] for _ in range(2)], [(0, 1), (2, 1)])
+        # only the dropped universe is sent again, with the sequence number it did not use
+        self.assertListEqual(sink.changedUniverses(frame), [1])
+        sink.send(frame)
+        self.assertEqual(self.receive()[:2], (1, 1))
+        sink.close()
+
+    def test_universe_offset(self):
+        sink = ArtNetSink("127.0.0.1", self.receiver.getsockname()[1], universeOffset=16)
+        sink.send(UniverseBuffer({1: [99]}))
+        sink.close()
+        universe, _, data = self.receive()
+        self.assertEqual(universe, 17)
+        self.assertEqual(data[0], 99)
+
+    def test_only_changed_universes(self):
+        sink = ArtNetSink("127.0.0.1", self.receiver.getsockname()[1], keepAlive=60)
+        frame = UniverseBuffer({0: [1], 1: [2]})
+        sink.send(frame)
+        frame[1][0] = 3
+        sink.send(frame)
+        sink.send(frame)
+        sink.close()
+        received = [self.receive()[0] for _ in range(3)]
+        self.assertListEqual(received, [0, 1, 1])
+        self.assertEqual(sink.packetsSent, 3)
+
+    def test_keep_alive(self):
+        sink = ArtNetSink("127.0.0.1", self.receiver.getsockname()[1], keepAlive=0.05)
+        frame = UniverseBuffer({0: [1]})
+        sink.send(frame)
+        sink.send(frame)
+        self.assertEqual(sink.packetsSent, 1)
+        time.sleep(0.06)
+        sink.send(frame)
+        sink.close()
+        self.assertEqual(sink.packetsSent, 2)
+
+    def test_invalid_universe(self):
+        with self.assertRaises(ValueError):
+            self.sink.send(UniverseBuffer({0x8000: [0]}))
+
+    def test_parse_invalid(self):
+        with self.assertRaises(ValueError):
+            ArtNetSink.parsePacket(b"\x00" * 530)
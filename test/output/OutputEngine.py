@@ -0,0 +1,108 @@
+import unittest
+import time
+
+from OpenLightControlGui.model import UniverseBuffer
+from OpenLightControlGui.output import AbstractSink, OutputEngine
+
+class StaticSource():
+    version = 0
+    stamp = 0
+    lamps = []
+
+    def __init__(self, universes):
+        self.buffer = UniverseBuffer(universes)
+
+    def getDmxBuffer(self):
+        return self.buffer
+
+class RecordingSink(AbstractSink):
+    def __init__(self):
+        self.frames = []
+
+    def send(self, frame):
+        self.frames.append(frame)
+
+class FailingSink(AbstractSink):
+    def send(self, frame):
+        raise OSError("unreachable")
+
+class TestOutputEngine(unittest.TestCase):
+
+    def test_rate(self):
+        engine = OutputEngine(rate=40)
+        self.assertEqual(engine.rate, 40)
+        self.assertAlmostEqual(engine.period, 0.025)
+    
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            OutputEngine(rate=0)
+    
+    def test_tick_merges_sources(self):
+        engine = OutputEngine([StaticSource({1: [10, 20]}), StaticSource({1: [30], 2: [5]})])
+        frame = engine.tick()
+        self.assertListEqual(frame[1][:2].tolist(), [30, 20])
+        self.assertListEqual(frame[2][:1].tolist(), [5])
+        self.assertIs(engine.frame, frame)
+    
+    def test_render_reuses_unchanged_frame(self):
+        source = StaticSource({1: [10]})
+        engine = OutputEngine([source])
+        frame = engine.tick()
+        self.assertIs(engine.tick(), frame)
+        source.version = 1
+        source.buffer = UniverseBuffer({1: [20]})
+        frame = engine.tick()
+        self.assertEqual(frame[1][0], 20)
+
+    def test_tick_publishes(self):
+        sink = RecordingSink()
+        engine = OutputEngine([StaticSource({1: [10]})], [sink])
+        engine.tick()
+        self.assertEqual(len(sink.frames), 1)
+    
+    def test_add_remove(self):
+        source = StaticSource({1: [10]})
+        sink = RecordingSink()
+        engine = OutputEngine()
+        engine.addSource(source)
+        engine.addSink(sink)
+        self.assertListEqual(engine.sources, [source])
+        self.assertListEqual(engine.sinks, [sink])
+        engine.removeSource(source)
+        engine.removeSink(sink)
+        self.assertListEqual(engine.sources, [])
+        self.assertListEqual(engine.sinks, [])
+    
+    def test_sink_error(self):
+        sink = RecordingSink()
+        engine = OutputEngine([StaticSource({1: [10]})], [FailingSink(), sink])
+        engine.tick()
+        self.assertEqual(engine.statistics.sinkErrors, 1)
+        self.assertIsInstance(engine.lastError, OSError)
+        self.assertEqual(len(sink.frames), 1)
+    
+    def test_thread(self):
+        sink = RecordingSink()
+        engine = OutputEngine([StaticSource({1: [10]})], [sink], rate=100)
+        engine.start()
+        self.assertTrue(engine.isRunning())
+        time.sleep(0.2)
+        engine.stop()
+        self.assertFalse(engine.isRunning())
+        stats = engine.statistics
+        self.assertGreater(stats.frames, 5)
+        self.assertEqual(len(sink.frames), stats.frames)
+        self.assertGreaterEqual(stats.maxJitter, stats.meanJitter)
+    
+    def test_overrun(self):
+        class SlowSink(AbstractSink):
+            def send(self, frame):
+                time.sleep(0.03)
+        engine = OutputEngine([StaticSource({1: [10]})], [SlowSink()], rate=100)
+        engine.start()
+        time.sleep(0.15)
+        engine.stop()
+        self.assertGreater(engine.statistics.overruns, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import socket
+
+from OpenLightControlGui.model import UniverseBuffer
+from OpenLightControlGui.output import SacnSink
+
+class TestSacnSink(unittest.TestCase):
+
+    def setUp(self):
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.bind(("127.0.0.1", 0))
+        self.receiver.settimeout(1)
+        self.cid = bytes(range(16))
+        self.sink = SacnSink("127.0.0.1", self.receiver.getsockname()[1], sourceName="test", priority=150, cid=self.cid, keepAlive=0)
+
+    def tearDown(self):
+        self.sink.close()
+        self.receiver.close()
+
+    def receive(self):
+        return SacnSink.parsePacket(self.receiver.recv(1024))
+
+    def test_packet_layout(self):
+        self.sink.send(UniverseBuffer({0: [1, 2, 3]}))
+        packet = self.receiver.recv(1024)
+        self.assertEqual(len(packet), 638)
+        self.assertEqual(packet[:4], b"\x00\x10\x00\x00")
+        self.assertEqual(packet[4:16], b"ASC-E1.17\x00\x00\x00")
+        self.assertEqual(packet[16:18], b"\x72\x6e")
+        self.assertEqual(packet[22:38], self.cid)
+        self.assertEqual(packet[44:49], b"test\x00")
+        self.assertEqual(packet[108], 150)
+        self.assertEqual(packet[113:115], b"\x00\x01")
+        self.assertEqual(packet[123:126], b"\x02\x01\x00")
+        self.assertEqual(packet[126:129], b"\x01\x02\x03")
+
+    def test_all_universes(self):
+        self.sink.send(UniverseBuffer({0: [10], 1: [20], 300: [30]}))
+        received = {universe: data[0] for universe, _, data in (self.receive() for _ in range(3))}
+        self.assertDictEqual(received, {1: 10, 2: 20, 301: 30})
+
+    def test_sequence_wraps(self):
+        frame = UniverseBuffer({0: [0]})
+        sequences = []
+        for _ in range(257):
+            self.sink.send(frame)
+            sequences.append(self.receive()[1])
+        self.assertListEqual(sequences[:2], [1, 2])
+        self.assertListEqual(sequences[-2:], [0, 1])
+
+    def test_multicast_address(self):
+        self.assertEqual(SacnSink.multicastAddress(1), "239.255.0.1")
+        self.assertEqual(SacnSink.multicastAddress(0x1234), "239.255.18.52")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            SacnSink("127.0.0.1", priority=201)
+        with self.assertRaises(ValueError):
+            SacnSink("127.0.0.1", cid=b"short")
+        with self.assertRaises(ValueError):
+            self.sink.send(UniverseBuffer({64000: [0]}))
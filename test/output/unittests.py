@@ -0,0 +1,8 @@
+import unittest
+
+from ArtNetSink import TestArtNetSink
+from OutputEngine import TestOutputEngine
+from SacnSink import TestSacnSink
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import json
+import os
+import tempfile
+import time
+
+from OpenLightControlGui.fixture_model import Fixture, FixtureSummary
+from OpenLightControlGui.utils import ofl
+
+DIMMER = {"name": "Dimmer", "categories": ["Dimmer"], "availableChannels": {"Intensity": {"capability": {"type": "Intensity"}}},
+          "modes": [{"name": "1ch", "channels": ["Intensity"]}]}
+RGB = {"name": "RGB Par", "categories": ["Color Changer"], "availableChannels": {
+        "Red": {"capability": {"type": "ColorIntensity", "color": "Red"}},
+        "Green": {"capability": {"type": "ColorIntensity", "color": "Green"}},
+        "Blue": {"capability": {"type": "ColorIntensity", "color": "Blue"}}},
+       "modes": [{"name": "3ch", "shortName": "3", "channels": ["Red", "Green", "Blue"]}, {"name": "1ch", "channels": ["Red"]}]}
+
+class TestOfl(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ofl = os.path.join(self.tmp.name, "fixtures")
+        self.cache = os.path.join(self.tmp.name, "cache", "index.json")
+        os.makedirs(os.path.join(self.ofl, "generic"))
+        os.makedirs(os.path.join(self.ofl, "acme"))
+        self.write("manufacturers.json", {"$schema": "x", "generic": {"name": "Generic"}, "acme": {"name": "Acme"}})
+        self.write("generic/dimmer.json", DIMMER)
+        self.write("generic/rgb-par.json", RGB)
+        self.write("acme/broken.json", "{")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, content):
+        with open(os.path.join(self.ofl, path), "w") as f:
+            f.write(content if isinstance(content, str) else json.dumps(content))
+
+    def test_get_fixtures_lazy(self):
+        fixtures = ofl.get_fixtures(self.ofl)
+        self.assertListEqual(sorted(fixtures.keys()), ["acme", "generic"])
+        generic = fixtures["generic"]
+        self.assertListEqual(list(generic), ["dimmer", "rgb-par"])
+        self.assertFalse(generic.isLoaded("dimmer"))
+        self.assertIsInstance(generic["dimmer"], Fixture)
+        self.assertTrue(generic.isLoaded("dimmer"))
+        self.assertIs(generic["dimmer"], generic["dimmer"])
+        self.assertEqual(generic["rgb-par"].manufacturer.name, "Generic")
+        with self.assertRaises(KeyError):
+            generic["missing"]
+
+    def test_index(self):
+        index = ofl.load_index(self.ofl, self.cache)
+        self.assertDictEqual(index["acme"], {})
+        self.assertListEqual(list(index["generic"].keys()), ["dimmer", "rgb-par"])
+        rgb = index["generic"]["rgb-par"]
+        self.assertEqual(rgb["name"], "RGB Par")
+        self.assertListEqual(rgb["categories"], ["Color Changer"])
+        self.assertListEqual(rgb["modes"], [{"name": "3ch", "shortName": "3", "channels": 3}, {"name": "1ch", "shortName": "1ch", "channels": 1}])
+        self.assertTrue(os.path.exists(self.cache))
+
+    def test_index_cache_reused(self):
+        ofl.load_index(self.ofl, self.cache)
+        mtime = os.stat(self.cache).st_mtime_ns
+        time.sleep(0.01)
+        self.assertListEqual(list(ofl.load_index(self.ofl, self.cache)["generic"].keys()), ["dimmer", "rgb-par"])
+        self.assertEqual(os.stat(self.cache).st_mtime_ns, mtime)
+
+    def test_index_changed_file(self):
+        ofl.load_index(self.ofl, self.cache)
+        self.write("generic/dimmer.json", dict(DIMMER, name="Better Dimmer"))
+        path = os.path.join(self.ofl, "generic/dimmer.json")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        self.assertEqual(ofl.load_index(self.ofl, self.cache)["generic"]["dimmer"]["name"], "Better Dimmer")
+
+    def test_index_removed_file(self):
+        ofl.load_index(self.ofl, self.cache)
+        os.remove(os.path.join(self.ofl, "generic/rgb-par.json"))
+        self.assertListEqual(list(ofl.load_index(self.ofl, self.cache)["generic"].keys()), ["dimmer"])
+
+    def test_index_changed_manufacturers(self):
+        ofl.load_index(self.ofl, self.cache)
+        mtime = os.stat(self.cache).st_mtime_ns
+        time.sleep(0.01)
+        self.write("manufacturers.json", {"generic": {"name": "Generic"}, "acme": {"name": "Acme Corp"}})
+        path = os.path.join(self.ofl, "manufacturers.json")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        calls = []
+        summarize = ofl._summarize_all
+        ofl._summarize_all = lambda jobs, processes: calls.append(len(jobs)) or summarize(jobs, processes)
+        try:
+            self.assertListEqual(list(ofl.load_index(self.ofl, self.cache)["generic"].keys()), ["dimmer", "rgb-par"])
+        finally:
+            ofl._summarize_all = summarize
+        # every fixture is parsed again with the new manufacturers
+        self.assertListEqual(calls, [3])
+        self.assertNotEqual(os.stat(self.cache).st_mtime_ns, mtime)
+
+    def test_summaries(self):
+        summaries = ofl.get_fixture_summaries(self.ofl, self.cache)
+        rgb = summaries["generic"]["rgb-par"]
+        self.assertIsInstance(rgb, FixtureSummary)
+        self.assertEqual(rgb.name, "RGB Par")
+        self.assertEqual(rgb.manufacturer.name, "Generic")
+        self.assertListEqual([(mode.name, mode.channelCount) for mode in rgb.modes], [("3ch", 3), ("1ch", 1)])
+        self.assertFalse(rgb.isLoaded)
+        self.assertIsNone(rgb.getModeByName("5ch"))
+        mode = rgb.getModeByName("1ch").mode
+        self.assertTrue(rgb.isLoaded)
+        self.assertIsInstance(rgb.fixture, Fixture)
+        self.assertListEqual(mode.channelKeys, ["Red"])
+
+    def test_summary_from_fixture(self):
+        fixture = ofl.get_fixtures(self.ofl)["generic"]["rgb-par"]
+        summary = FixtureSummary.fromFixture(fixture)
+        self.assertTrue(summary.isLoaded)
+        self.assertIs(summary.fixture, fixture)
+        self.assertEqual(summary.modes[0].shortName, "3")
+
+    def test_summarize_lazy_fixtures(self):
+        fixtures = ofl.get_fixtures(self.ofl)
+        summaries = ofl.summarize_fixtures(fixtures, self.cache)
+        self.assertListEqual(list(summaries["generic"].keys()), ["dimmer", "rgb-par"])
+        self.assertDictEqual(summaries["acme"], {})
+        self.assertEqual(summaries["generic"]["rgb-par"].modes[0].channelCount, 3)
+        self.assertFalse(any(fixtures["generic"].isLoaded(key) for key in fixtures["generic"]))
+        self.assertIs(summaries["generic"]["dimmer"].fixture, fixtures["generic"]["dimmer"])
+        loaded = ofl.summarize_fixtures({"generic": {"dimmer": fixtures["generic"]["dimmer"]}})
+        self.assertTrue(loaded["generic"]["dimmer"].isLoaded)
+
+    def test_index_process_pool(self):
+        for i in range(8):
+            self.write(f"acme/dimmer-{i}.json", DIMMER)
+        threshold = ofl.PARALLEL_THRESHOLD
+        ofl.PARALLEL_THRESHOLD = 4
+        try:
+            index = ofl.load_index(self.ofl, self.cache, processes=2)
+        finally:
+            ofl.PARALLEL_THRESHOLD = threshold
+        self.assertEqual(len(index["acme"]), 8)
+        self.assertEqual(index["acme"]["dimmer-3"]["modes"][0]["channels"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
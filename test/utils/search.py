@@ -0,0 +1,54 @@
+import unittest
+
+from OpenLightControlGui.fixture_model import FixtureSummary, Manufacturer
+from OpenLightControlGui.utils.search import FixtureSearchIndex
+
+def summary(man, key, name, categories, modes):
+    return FixtureSummary(man, key, {"name": name, "categories": categories,
+                                     "modes": [{"name": mode, "channels": channels} for mode, channels in modes]}, lambda: None)
+
+class TestFixtureSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        generic = Manufacturer("generic", {"name": "Generic"})
+        acme = Manufacturer("acme", {"name": "Acme Lighting"})
+        self.index = FixtureSearchIndex({
+            "generic": {"dimmer": summary(generic, "dimmer", "Dimmer", ["Dimmer"], [("8 bit", 1), ("16 bit", 2)])},
+            "acme": {"spot": summary(acme, "spot", "Spot 575", ["Moving Head"], [("Standard", 16)]),
+                     "par": summary(acme, "par", "RGB Par", ["Color Changer"], [("3ch", 3)])}})
+
+    def names(self, query):
+        return [f"{self.index.item(num).fixtureName} {self.index.item(num).mode}" for num in self.index.search(query)]
+
+    def test_empty_query(self):
+        self.assertEqual(len(self.index.search("")), 4)
+        self.assertEqual(len(self.index), 4)
+
+    def test_short_token(self):
+        self.assertListEqual(self.names("16"), ["Dimmer 16 bit"])
+        self.assertListEqual(self.names("5"), ["Spot 575 Standard"])
+
+    def test_case_insensitive(self):
+        self.assertListEqual(self.names("rgb"), ["RGB Par 3ch"])
+
+    def test_tokens(self):
+        self.assertListEqual(self.names("dimmer 8"), ["Dimmer 8 bit"])
+        self.assertListEqual(self.names("acme moving"), ["Spot 575 Standard"])
+        self.assertListEqual(self.names("generic rgb"), [])
+
+    def test_incremental(self):
+        self.assertListEqual(self.names("di"), ["Dimmer 8 bit", "Dimmer 16 bit"])
+        self.assertListEqual(self.names("dim"), ["Dimmer 8 bit", "Dimmer 16 bit"])
+        self.assertListEqual(self.names("dimmer 16"), ["Dimmer 16 bit"])
+        # a query that is no refinement of the last one searches everything again
+        self.assertListEqual(self.names("par"), ["RGB Par 3ch"])
+
+    def test_add_fixture(self):
+        self.index.search("wash")
+        self.index.addFixture("acme", summary(Manufacturer("acme", {"name": "Acme Lighting"}), "wash", "Wash", ["Moving Head"], [("Basic", 8)]))
+        self.assertListEqual(self.names("wash"), ["Wash Basic"])
+        item = self.index.item(self.index.search("wash")[0])
+        self.assertEqual((item.manufacturer, item.key, item.channels), ("acme", "wash", 8))
+
+if __name__ == "__main__":
+    unittest.main()
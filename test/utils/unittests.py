@@ -0,0 +1,7 @@
+import unittest
+
+from ofl import TestOfl
+from search import TestFixtureSearchIndex
+
+if __name__ == '__main__':
+    unittest.main()